@@ -1,6 +1,7 @@
 import streamlit as st
 import sys
 import os
+from contextlib import nullcontext
 
 # -----------------------------------------------------------
 # 1️⃣ Page Configuration (ONLY ONCE and AT THE TOP)
@@ -28,57 +29,99 @@ MODULES_DIR = os.path.join(BASE_DIR, "modules")
 if MODULES_DIR not in sys.path:
     sys.path.insert(0, MODULES_DIR)
 
+from import_profile import IMPORT_TIMES, cold_start_summary, timed_import
+from filter_context import EMPTY_CONTEXT, filter_options, is_active, make_context
+from aggregate_cube import load_cube
+from dataset_registry import query_plan
+from result_store import dataset_fingerprint
+from query_engine import ENGINE_ENV, configured_engine
+from instrumentation import log_frame, log_json, page_run, phase, profile_run
+
+PREPROCESSED_PATH = "data/US_Accidents_preprocessed.csv"
+# Page timings are recorded when the sidebar toggle is on or ROADSAFE_INSTRUMENT=1
+INSTRUMENT_ENV = "ROADSAFE_INSTRUMENT"
+PERF_LOG_LIMIT = 5000
+
 # -----------------------------------------------------------
 # 4️⃣ Sidebar Navigation
 # -----------------------------------------------------------
 st.sidebar.title("🚦Navigation")
 st.sidebar.markdown("---")
 
+# Page label -> module in modules/ providing run()
+PAGES = {
+    "🏠 Home Dashboard": "Home",
+    "🔍 Data Exploration": "Data_Exploration",
+    "🧹 Preprocessing": "Preprocessing",
+    "📊 Univariate Analysis": "Univariate_Analysis",
+    "📈 Comparative Analysis": "Comparative_Analysis",
+    "🗺️ Geospatial Analysis": "Geospatial_Analysis",
+    "💡 Insights & Hypothesis": "Insights_and_Hypothesis",
+    "✅ Key Findings": "Key_Findings"
+}
+
 section = st.sidebar.radio(
     "📍 Go to Section",
-    [
-        "🏠 Home Dashboard",
-        "🧹 Preprocessing",
-        "📊 Univariate Analysis",
-        "📈 Comparative Analysis",
-        "🗺️ Geospatial Analysis",
-        "💡 Insights & Hypothesis",
-        "✅ Key Findings"
-    ],
+    list(PAGES),
     index=0
 )
 
 # -----------------------------------------------------------
-# 5️⃣ Load Modules Based on Selection (With Error Handling)
+# 5️⃣ Global Filters (shared by every page)
 # -----------------------------------------------------------
-try:
-    if section == "🏠 Home Dashboard":
-        from Home import run
-        run()
+@st.cache_data(show_spinner=False)
+def load_filter_options(path, fingerprint):
+    return filter_options(load_cube(path))
+
+
+def sidebar_filters():
+    """Global filter widgets; returns the filter context passed to the selected page."""
+    if not os.path.exists(PREPROCESSED_PATH):
+        return EMPTY_CONTEXT
 
-    elif section == "🧹 Preprocessing":
-        from Preprocessing import run
-        run()
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("🎛️ Global Filters")
+    options = load_filter_options(PREPROCESSED_PATH, dataset_fingerprint(PREPROCESSED_PATH))
 
-    elif section == "📊 Univariate Analysis":
-        from Univariate_Analysis import run
-        run()
+    period = None
+    if len(options["periods"]) > 1:
+        start, end = st.sidebar.select_slider(
+            "Date range", options=options["periods"],
+            value=(options["periods"][0], options["periods"][-1]),
+            format_func=lambda p: f"{p[0]}-{p[1]:02d}")
+        if (start, end) != (options["periods"][0], options["periods"][-1]):
+            period = (start, end)
+    states = st.sidebar.multiselect("States", options["states"], placeholder="All states")
+    severity = st.sidebar.multiselect("Severity", options["severity"], placeholder="All levels")
+    weather = st.sidebar.multiselect("Weather", options["weather"], placeholder="All conditions")
+    ctx = make_context(period, states, severity, weather)
 
-    elif section == "📈 Comparative Analysis":
-        from Comparative_Analysis import run
-        run()
+    if is_active(ctx):
+        groups, total = query_plan(PREPROCESSED_PATH, ctx)
+        st.sidebar.caption(f"Row groups to scan: {groups} of {total}")
+    return ctx
 
-    elif section == "🗺️ Geospatial Analysis":
-        from Geospatial_Analysis import run
-        run()
 
-    elif section == "💡 Insights & Hypothesis":
-        from Insights_and_Hypothesis import run
-        run()
+ctx = sidebar_filters()
 
-    elif section == "✅ Key Findings":
-        from Key_Findings import run
-        run()
+st.sidebar.markdown("---")
+instrument = st.sidebar.toggle("🩺 Record page timings", value=os.environ.get(INSTRUMENT_ENV) == "1",
+                               help="Peak memory tracking slows allocation-heavy pages while this is on")
+# One-shot: the rerun triggered by the click re-executes the selected page under the profilers
+profile_now = st.sidebar.button("🐞 Profile next page run",
+                                help="Capture a cProfile call profile and a tracemalloc snapshot of one run")
+
+# -----------------------------------------------------------
+# 6️⃣ Load Modules Based on Selection (With Error Handling)
+# -----------------------------------------------------------
+perf = capture = None
+profiling = profile_run(PAGES[section]) if profile_now else nullcontext()
+try:
+    # Pages are imported on first visit; heavy libraries load inside the code paths that use them
+    with page_run(PAGES[section], instrument) as perf, profiling as capture:
+        with phase("import"):
+            page = timed_import(PAGES[section])
+        page.run(ctx)
 
 except ImportError as e:
     st.error(f"❌ Module Import Error: {str(e)}")
@@ -90,7 +133,71 @@ except Exception as e:
     st.exception(e)
 
 # -----------------------------------------------------------
-# 6️⃣ Footer
+# 7️⃣ Page Performance Diagnostics
+# -----------------------------------------------------------
+if perf is not None:
+    # Per-session log of phase records, newest run last
+    perf_log = st.session_state.setdefault("perf_log", [])
+    perf_log.extend(perf["records"])
+    del perf_log[:-PERF_LOG_LIMIT]
+
+if instrument:
+    with st.expander("🩺 Performance Diagnostics"):
+        perf_log = st.session_state.get("perf_log", [])
+        if perf is not None:
+            latest = log_frame(perf["records"])
+            latest["phase"] = ["  " * d + p for d, p in zip(latest["depth"], latest["phase"])]
+            st.caption(f"Latest run of {perf['page']} "
+                       "(wall and CPU in ms; peak traced memory of the whole server process during "
+                       "each phase in MB, blank when another instrumented run was active)")
+            st.dataframe(latest.drop(columns=["run_id", "started", "page", "depth"]), hide_index=True)
+        if perf_log:
+            log = log_frame(perf_log)
+            st.caption(f"Median over {log['run_id'].nunique()} recorded runs this session")
+            st.dataframe(log.groupby(["page", "phase"], sort=False)[["wall_ms", "cpu_ms", "process_peak_mb", "rows"]]
+                         .median().round(1))
+            col1, col2, col3 = st.columns(3)
+            col1.download_button("Download JSON", log_json(perf_log), "page_timings.json", "application/json")
+            col2.download_button("Download CSV", log.to_csv(index=False), "page_timings.csv", "text/csv")
+            if col3.button("Clear log"):
+                perf_log.clear()
+
+if profile_now:
+    st.session_state["profile_capture"] = capture
+
+capture = st.session_state.get("profile_capture")
+if capture is not None:
+    with st.expander(f"🐞 Profile of {capture['page']} ({capture['started']})", expanded=profile_now):
+        st.caption("Top functions by cumulative time (main script thread only)")
+        st.dataframe(capture["functions"], hide_index=True)
+        st.caption("Top allocation sites by memory still held at the end of the run")
+        st.dataframe(capture["allocations"], hide_index=True)
+        col1, col2, col3 = st.columns(3)
+        col1.download_button("Download .prof", capture["prof"], f"{capture['page']}.prof",
+                             help="Open with pstats.Stats or snakeviz")
+        col2.download_button("Download snapshot", capture["snapshot"], f"{capture['page']}.tracemalloc",
+                             help="Open with tracemalloc.Snapshot.load")
+        if col3.button("Discard profile"):
+            del st.session_state["profile_capture"]
+
+# -----------------------------------------------------------
+# 8️⃣ Startup Diagnostics
+# -----------------------------------------------------------
+@st.cache_data(show_spinner="Measuring cold imports...")
+def load_cold_start_summary(pages):
+    return cold_start_summary(list(pages), MODULES_DIR)
+
+
+with st.sidebar.expander("⏱️ Startup Diagnostics"):
+    st.caption(f"Aggregation engine: {configured_engine()} (set {ENGINE_ENV}=pandas|duckdb)")
+    st.caption("First import time of each page in this server process")
+    st.dataframe({name: f"{seconds * 1000:.0f} ms" for name, seconds in IMPORT_TIMES.items()})
+    if st.button("Profile cold imports"):
+        st.caption("Cumulative import cost per page in a fresh interpreter")
+        st.dataframe(load_cold_start_summary(tuple(PAGES.values())).round(1))
+
+# -----------------------------------------------------------
+# 9️⃣ Footer
 # -----------------------------------------------------------
 st.markdown("---")
 st.markdown("""
@@ -0,0 +1,69 @@
+"""Compare the pandas and DuckDB aggregation engines on the preprocessed dataset.
+
+Run from the Project directory:
+
+    python benchmarks/bench_engines.py --repeat 5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "modules"))
+
+import pandas as pd
+from filter_context import make_context
+from query_engine import ENGINES, crosstab, duckdb_available, duckdb_database, insight_stats, value_counts
+from dataset_registry import load_dataset, _shared_query
+
+FILTERED = make_context(severity=[3, 4], states=["CA", "TX", "FL"])
+
+# Benchmark name -> function(path, ctx, engine)
+BENCHMARKS = {
+    "insight statistics": lambda path, ctx, engine: insight_stats(path, ctx, engine),
+    "value_counts State": lambda path, ctx, engine: value_counts(path, "State", ctx, engine),
+    "value_counts City": lambda path, ctx, engine: value_counts(path, "City", ctx, engine),
+    "crosstab Weather x Severity": lambda path, ctx, engine: crosstab(path, "Weather_Condition", "Severity",
+                                                                      ctx, engine),
+}
+
+
+def time_call(func, repeat):
+    """Best wall time of `repeat` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        # Filtered frames are cached across sessions; time the pushdown query itself
+        _shared_query.clear()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="data/US_Accidents_preprocessed.csv", help="Preprocessed CSV")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark (best time is reported)")
+    args = parser.parse_args()
+
+    engines = [e for e in ENGINES if e != "duckdb" or duckdb_available()]
+    if "duckdb" not in engines:
+        print("duckdb is not installed; only the pandas engine is benchmarked.")
+
+    # Build the on-disk stores once so the timings only cover the aggregations
+    load_dataset(args.data)
+    if "duckdb" in engines:
+        duckdb_database(args.data)
+
+    rows = []
+    for name, bench in BENCHMARKS.items():
+        for label, ctx in [("all rows", None), ("filtered", FILTERED)]:
+            row = {"benchmark": name, "rows": label}
+            for engine in engines:
+                row[f"{engine} ms"] = round(time_call(lambda: bench(args.data, ctx, engine), args.repeat), 1)
+            rows.append(row)
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
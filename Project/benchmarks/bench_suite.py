@@ -0,0 +1,227 @@
+"""Benchmark every page's compute path and the preprocessing pipeline on synthetic data.
+
+Run from the Project directory:
+
+    python benchmarks/bench_suite.py --scales 10000 100000 --save-baseline
+    python benchmarks/bench_suite.py --scales 10000 100000 --baseline benchmarks/results/baseline.json
+
+Each scale gets its own synthetic raw dataset under benchmarks/.data/<rows>/ (generated
+once, see synthetic_accidents.py), which is preprocessed the same way as the app does.
+Wall time is the best of --repeat runs; peak memory is the tracemalloc peak of one
+extra run. Results are written as JSON; with --baseline, benchmarks slower or larger
+than the baseline by more than --threshold are flagged and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "modules"))
+
+import numpy as np
+import pandas as pd
+from synthetic_accidents import generate
+from preprocessing_steps import TRANSFORM_STEPS
+from dataset_registry import _shared_dataset, _shared_query, write_column_store
+from column_profile import build_profiles
+from fast_kde import kde_from_grid
+from hypothesis_stats import compute_insight_stats
+from aggregate_cube import build_cube
+from heavy_hitters import update_sketches
+from analytics import (PANELS, SPLOM_FEATURES, cramers_v_matrix, hotspot_clusters, insight_results,
+                       pairwise_histograms)
+
+RAW_PATH = "data/US_Accidents_March23.csv"
+PREPROCESSED_PATH = "data/US_Accidents_preprocessed.csv"
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+# Differences below these are treated as noise when comparing against a baseline
+MIN_SECONDS_DIFF = 0.005
+MIN_MB_DIFF = 1.0
+
+
+def measure(run, setup=None, repeat=3):
+    """Best wall time of `repeat` calls of `run(*setup())` and the traced peak memory (MB) of one more."""
+    best = float("inf")
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        run(*args)
+        best = min(best, time.perf_counter() - start)
+
+    args = setup() if setup else ()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        run(*args)
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return best, max(peak, 0) / 2 ** 20
+
+
+def prepare_scale(rows, seed):
+    """Switch to the scale's working directory, generating its raw dataset if needed."""
+    workdir = os.path.join(DATA_DIR, str(rows))
+    os.makedirs(os.path.join(workdir, "data"), exist_ok=True)
+    os.chdir(workdir)
+    if not os.path.exists(RAW_PATH):
+        print(f"Generating {rows:,} synthetic rows...")
+        generate(RAW_PATH, rows, seed=seed)
+
+
+# -----------------------------------------------------------
+# Benchmarks: (group, name, setup, run); setup builds fresh inputs outside the timing
+# -----------------------------------------------------------
+def preprocessing_benchmarks():
+    raw = pd.read_csv(RAW_PATH)
+    # Input of every step, from one untimed pass through the pipeline
+    inputs, df = {}, raw
+    for step, (_, transform) in TRANSFORM_STEPS.items():
+        inputs[step] = df
+        df, _ = transform(df.copy())
+    preprocessed = df
+    preprocessed.to_csv(PREPROCESSED_PATH, index=False)
+
+    yield "preprocessing", "01 load", None, lambda: pd.read_csv(RAW_PATH)
+    for step, (_, transform) in TRANSFORM_STEPS.items():
+        yield ("preprocessing", f"{step:02d} {transform.__name__}",
+               lambda step=step: (inputs[step].copy(),), transform)
+    yield "preprocessing", "15 save", None, lambda: preprocessed.to_csv("data/bench_save.csv", index=False)
+    yield "preprocessing", "column store", None, lambda: write_column_store(PREPROCESSED_PATH, preprocessed)
+
+
+def page_benchmarks():
+    df = pd.read_csv(PREPROCESSED_PATH)
+    write_column_store(PREPROCESSED_PATH, df)
+
+    def fresh_query():
+        # Row-level frames are shared across sessions (filtered queries and whole-dataset loads);
+        # time the reads they need
+        _shared_query.clear()
+        _shared_dataset.clear()
+        return ()
+
+    # Geospatial: hotspots for the busiest state at the most common severity, as on the page
+    state, severity = df["State"].mode()[0], df["Severity"].mode()[0]
+    points = (df.loc[(df["State"] == state) & (df["Severity"] == severity), ["Latitude", "Longitude"]]
+              .rename(columns={"Latitude": "latitude", "Longitude": "longitude"}))
+    yield "geospatial", f"DBSCAN hotspots ({state}, severity {severity})", None, lambda: hotspot_clusters(points)
+
+    # Comparative: categorical association matrix and scatter-matrix histograms
+    categorical = df.select_dtypes(include=["object", "string", "bool"]).columns.tolist() + ["Severity"]
+    yield ("comparative", "Cramer's V matrix", fresh_query,
+           lambda: cramers_v_matrix(PREPROCESSED_PATH, categorical))
+    splom = [f for f in SPLOM_FEATURES if f in df.columns]
+    yield ("comparative", "scatter matrix histograms", fresh_query,
+           lambda: pairwise_histograms(PREPROCESSED_PATH, splom))
+
+    # Univariate: column profiles (histograms, quantiles, KDE grids) and KDE evaluation
+    yield "univariate", "column profiles", None, lambda: build_profiles(df)
+    profiles = build_profiles(df)
+    grids = [p for p in profiles.values() if "kde_grid" in p]
+
+    def evaluate_kdes():
+        for p in grids:
+            grid = p["kde_grid"]
+            kde_from_grid(grid["counts"], grid["lo"], grid["dx"], grid["bandwidth"],
+                          np.linspace(p["min"], p["max"], 200))
+    yield "univariate", f"KDE evaluation ({len(grids)} columns)", None, evaluate_kdes
+
+    # Insights: sufficient statistics over the file, then the tests on them
+    yield "insights", "insight statistics", None, lambda: compute_insight_stats(PREPROCESSED_PATH)
+    stats = compute_insight_stats(PREPROCESSED_PATH)
+
+    yield "insights", "insight tests", None, lambda: insight_results(stats)
+
+    # Key Findings: aggregate cube, heavy-hitter sketches and the dashboard panels
+    yield "key findings", "aggregate cube", None, lambda: build_cube(df)
+    yield "key findings", "heavy-hitter sketches", None, lambda: update_sketches({}, df)
+    cube, sketches = build_cube(df), update_sketches({}, df)
+    yield ("key findings", "dashboard panels", None,
+           lambda: [compute(cube, sketches, *args) for _, compute, args in PANELS])
+
+
+def run_scale(rows, seed, repeat, only=None):
+    prepare_scale(rows, seed)
+    results = []
+    for benchmarks in (preprocessing_benchmarks, page_benchmarks):
+        for group, name, setup, run in benchmarks():
+            if only and not any(o.lower() in f"{group} {name}".lower() for o in only):
+                continue
+            seconds, peak_mb = measure(run, setup, repeat)
+            results.append({"group": group, "benchmark": name, "rows": rows,
+                            "seconds": round(seconds, 6), "peak_mb": round(peak_mb, 3)})
+            print(f"{rows:>10,}  {group:<14} {name:<40} {seconds * 1000:>10.1f} ms {peak_mb:>9.1f} MB")
+    return results
+
+
+# -----------------------------------------------------------
+# Baseline comparison
+# -----------------------------------------------------------
+def compare(results, baseline, threshold):
+    """Join `results` with the baseline run; flags time or memory growth beyond `threshold`."""
+    current = pd.DataFrame(results)
+    base = pd.DataFrame(baseline["results"])[["group", "benchmark", "rows", "seconds", "peak_mb"]]
+    table = current.merge(base, on=["group", "benchmark", "rows"], how="left", suffixes=("", "_baseline"))
+    table["time_ratio"] = (table["seconds"] / table["seconds_baseline"]).round(2)
+    table["memory_ratio"] = (table["peak_mb"] / table["peak_mb_baseline"]).round(2)
+    slower = ((table["seconds"] > table["seconds_baseline"] * (1 + threshold))
+              & (table["seconds"] - table["seconds_baseline"] > MIN_SECONDS_DIFF))
+    larger = ((table["peak_mb"] > table["peak_mb_baseline"] * (1 + threshold))
+              & (table["peak_mb"] - table["peak_mb_baseline"] > MIN_MB_DIFF))
+    table["regression"] = np.select([slower & larger, slower, larger], ["time+memory", "time", "memory"], "")
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[10_000, 100_000], help="Raw dataset sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (best time is kept)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic datasets")
+    parser.add_argument("--only", nargs="+", help="Only run benchmarks whose group or name contains one of these")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/bench-<timestamp>.json)")
+    parser.add_argument("--baseline", help="Baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Also save the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    start_dir = os.getcwd()
+    results = []
+    for rows in args.scales:
+        results += run_scale(rows, args.seed, args.repeat, args.only)
+    os.chdir(start_dir)
+
+    run = {"created": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+           "pandas": pd.__version__, "numpy": np.__version__, "platform": platform.platform(),
+           "cpu_count": os.cpu_count(), "repeat": args.repeat, "seed": args.seed, "results": results}
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    targets = [output] + ([args.baseline or os.path.join(RESULTS_DIR, "baseline.json")] if args.save_baseline else [])
+    for target in targets:
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        with open(target, "w") as f:
+            json.dump(run, f, indent=2)
+    print(f"Results written to {', '.join(targets)}")
+
+    if args.baseline and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        table = compare(results, baseline, args.threshold)
+        columns = ["rows", "group", "benchmark", "seconds", "seconds_baseline", "time_ratio",
+                   "peak_mb", "peak_mb_baseline", "memory_ratio", "regression"]
+        print(table[columns].to_string(index=False))
+        regressions = table[table["regression"] != ""]
+        if len(regressions):
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.baseline}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""Load-test the Streamlit app with concurrent simulated sessions.
+
+Run from the Project directory, with the preprocessed dataset in data/ (for offline runs,
+generate a raw file with synthetic_accidents.py and run the Preprocessing page once):
+
+    python benchmarks/load_test.py --sessions 1 4 8 16 --duration 60
+
+Each session count gets a fresh `streamlit run app.py` server. Every simulated session
+opens its own websocket to it, as a browser tab does, and replays SCENARIO in a loop with
+random think time between steps. The scenario is warmed up once first so cached results
+are built before measuring. Latency is the time from sending a rerun to its
+script_finished message. Server memory is the resident set size of the server process,
+sampled during the run. Needs the `websockets` package.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BENCH_DIR, "..", "app.py")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+PREPROCESSED_PATH = "data/US_Accidents_preprocessed.csv"
+SERVER_START_TIMEOUT = 60
+
+SECTION = "📍 Go to Section"
+# Scenario steps: (name, {widget label: value}). A value can also be a function of the
+# widget's options, for options that depend on the dataset.
+SCENARIO = [
+    ("home", {SECTION: "🏠 Home Dashboard"}),
+    ("univariate: open", {SECTION: "📊 Univariate Analysis"}),
+    ("univariate: temperature", {"Select Column": "Temperature(F)"}),
+    ("univariate: add KDE", {"Include KDE plot in histogram": True}),
+    ("univariate: humidity", {"Select Column": "Humidity(%)"}),
+    ("geospatial: open", {SECTION: "🗺️ Geospatial Analysis"}),
+    ("geospatial: hotspot density", {"Select visualization type": "Hotspot Density"}),
+    ("geospatial: severity 2", {"Select Severity Level": "2"}),
+    ("geospatial: severity 3", {"Select Severity Level": "3"}),
+    ("geospatial: state level", {"Select geography level": "State"}),
+    ("geospatial: pick state", {"Select State": lambda options: options[1]}),
+    ("comparative: open", {SECTION: "📈 Comparative Analysis"}),
+    ("comparative: scatter matrix", {"Select chart type": "Scatter Matrix"}),
+    ("filters: top severity", {"Severity": lambda options: options[-1:]}),
+    ("key findings: open", {SECTION: "✅ Key Findings"}),
+    ("filters: clear", {"Severity": []}),
+    ("insights: open", {SECTION: "💡 Insights & Hypothesis"}),
+]
+
+
+# -----------------------------------------------------------
+# Simulated browser session
+# -----------------------------------------------------------
+def widget_state(kind, proto, value):
+    """WidgetState a browser would send for `value`, in the encoding of each widget type."""
+    state = WidgetState(id=proto.id)
+    options = list(getattr(proto, "options", []))
+    if callable(value):
+        value = value(options)
+    if kind in ("radio", "selectbox"):
+        if value not in options:
+            raise KeyError(f"{proto.label!r} has no option {value!r}")
+        state.string_value = value
+    elif kind == "multiselect":
+        missing = [v for v in value if v not in options]
+        if missing:
+            raise KeyError(f"{proto.label!r} has no options {missing!r}")
+        state.string_array_value.data[:] = value
+    elif kind == "checkbox":
+        state.bool_value = bool(value)
+    else:
+        raise KeyError(f"{proto.label!r}: {kind} widgets are not supported")
+    return state
+
+
+class Session:
+    """One websocket session with the widget values it has set, like a browser tab."""
+
+    def __init__(self, url, timeout):
+        self.url, self.timeout = url, timeout
+        self.connection = ExitStack()
+
+    def connect(self):
+        from websockets.sync.client import connect
+        self.close()
+        self.ws = self.connection.enter_context(
+            connect(self.url, subprotocols=["streamlit"], max_size=None, open_timeout=self.timeout))
+        self.widgets = {}  # label -> (widget type, proto) rendered by the last run
+        self.states = {}  # widget id -> WidgetState sent with every rerun
+
+    def close(self):
+        self.connection.close()
+
+    def set(self, label, value):
+        if label not in self.widgets:
+            raise KeyError(f"no widget {label!r} on the page")
+        kind, proto = self.widgets[label]
+        self.states[proto.id] = widget_state(kind, proto, value)
+
+    def rerun(self):
+        """Rerun the script with the current widget values; returns (seconds, error messages)."""
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        start = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+
+        widgets, errors = {}, []
+        while True:
+            remaining = self.timeout - (time.perf_counter() - start)
+            forward = ForwardMsg()
+            forward.ParseFromString(self.ws.recv(timeout=max(remaining, 0)))
+            kind = forward.WhichOneof("type")
+            if kind == "script_finished":
+                break
+            if kind != "delta" or forward.delta.WhichOneof("type") != "new_element":
+                continue
+            element = forward.delta.new_element
+            element_type = element.WhichOneof("type")
+            proto = getattr(element, element_type)
+            if element_type == "exception":
+                errors.append(proto.message)
+            elif element_type == "alert" and proto.format == proto.ERROR:
+                errors.append(proto.body)
+            elif getattr(proto, "id", "") and getattr(proto, "label", ""):
+                widgets[proto.label] = (element_type, proto)
+        seconds = time.perf_counter() - start
+
+        # Like the frontend, forget the values of widgets that are no longer rendered
+        ids = {proto.id for _, proto in widgets.values()}
+        self.states = {i: s for i, s in self.states.items() if i in ids}
+        self.widgets = widgets
+        return seconds, errors
+
+
+def run_session(index, url, deadline, think, timeout, seed, passes=None):
+    """Replay SCENARIO until `deadline` (or for `passes` passes); returns one record per step."""
+    rng = random.Random(seed * 1_000_003 + index)
+    session = Session(url, timeout)
+    records, completed, connected = [], 0, False
+    try:
+        while time.perf_counter() < deadline and (passes is None or completed < passes):
+            for step, changes in SCENARIO:
+                if time.perf_counter() >= deadline:
+                    break
+                record = {"session": index, "step": step, "seconds": np.nan, "timeout": False, "error": ""}
+                try:
+                    if not connected:
+                        session.connect()
+                        session.rerun()  # initial page load, as when the tab opens
+                        connected = True
+                    for label, value in changes.items():
+                        session.set(label, value)
+                    record["seconds"], errors = session.rerun()
+                    record["error"] = errors[0] if errors else ""
+                except KeyError as e:
+                    record["error"] = str(e.args[0])
+                except TimeoutError:
+                    # The session is out of step with the server; start over in a new tab
+                    record["timeout"] = True
+                    records.append(record)
+                    connected = False
+                    break
+                records.append(record)
+                if think:
+                    time.sleep(rng.uniform(0, 2 * think))
+            completed += 1
+    finally:
+        session.close()
+    return records
+
+
+# -----------------------------------------------------------
+# Server process
+# -----------------------------------------------------------
+@contextmanager
+def streamlit_server(port, workdir, log_path):
+    """Run `streamlit run app.py` in `workdir` until the block exits."""
+    command = [sys.executable, "-m", "streamlit", "run", os.path.abspath(APP_PATH),
+               "--server.headless=true", f"--server.port={port}", "--server.fileWatcherType=none",
+               "--browser.gatherUsageStats=false"]
+    with open(log_path, "w") as log:
+        server = subprocess.Popen(command, cwd=workdir, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            start = time.perf_counter()
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"Streamlit server exited with code {server.returncode}, see {log_path}")
+                try:
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+                    break
+                except OSError:
+                    if time.perf_counter() - start > SERVER_START_TIMEOUT:
+                        raise RuntimeError(f"Streamlit server did not start in {SERVER_START_TIMEOUT} s")
+                    time.sleep(0.2)
+            yield server
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+
+def server_rss_mb(pid):
+    """Resident set size of process `pid` in MB (psutil if installed, else /proc)."""
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return np.nan
+
+
+def sample_rss(pid, stop, samples, interval=0.25):
+    while not stop.wait(interval):
+        samples.append(server_rss_mb(pid))
+
+
+# -----------------------------------------------------------
+# Load runs
+# -----------------------------------------------------------
+def run_load(sessions, args):
+    """Run `sessions` concurrent sessions against a fresh server; returns (summary, step records)."""
+    url = f"ws://127.0.0.1:{args.port}/_stcore/stream"
+    log_path = os.path.join(RESULTS_DIR, "load-server.log")
+    with streamlit_server(args.port, args.workdir, log_path) as server:
+        if not args.no_warmup:
+            run_session(-1, url, float("inf"), 0, args.timeout, args.seed, passes=1)
+        idle_mb = server_rss_mb(server.pid)
+
+        stop, samples = threading.Event(), [idle_mb]
+        monitor = threading.Thread(target=sample_rss, args=(server.pid, stop, samples), daemon=True)
+        monitor.start()
+        start = time.perf_counter()
+        deadline = start + args.duration
+
+        def delayed_session(index):
+            # Sessions join evenly over the ramp-up period
+            time.sleep(args.ramp * index / sessions)
+            return run_session(index, url, deadline, args.think, args.timeout, args.seed)
+
+        with ThreadPoolExecutor(sessions) as pool:
+            records = [r for result in pool.map(delayed_session, range(sessions)) for r in result]
+        elapsed = time.perf_counter() - start
+        stop.set()
+        monitor.join()
+
+    steps = pd.DataFrame(records, columns=["session", "step", "seconds", "timeout", "error"])
+    latency_ms = steps["seconds"].dropna() * 1000
+    percentiles = (np.percentile(latency_ms, [50, 90, 95, 99]) if len(latency_ms)
+                   else [np.nan] * 4)
+    rss = np.array(samples, dtype=float)
+    summary = {
+        "sessions": sessions,
+        "reruns": int(len(latency_ms)),
+        "errors": int((steps["error"] != "").sum()),
+        "timeouts": int(steps["timeout"].sum()),
+        "p50_ms": percentiles[0], "p90_ms": percentiles[1], "p95_ms": percentiles[2], "p99_ms": percentiles[3],
+        "max_ms": latency_ms.max() if len(latency_ms) else np.nan,
+        "reruns_per_s": len(latency_ms) / elapsed,
+        "rss_idle_mb": idle_mb,
+        "rss_mean_mb": np.nanmean(rss),
+        "rss_peak_mb": np.nanmax(rss),
+        "mb_per_session": (np.nanmax(rss) - idle_mb) / sessions,
+    }
+    summary = {k: round(float(v), 1) if isinstance(v, float) else v for k, v in summary.items()}
+    return summary, steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="Concurrent session counts")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds per session count")
+    parser.add_argument("--think", type=float, default=1.0, help="Mean think time between steps in seconds")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which the sessions join")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds before a rerun counts as timed out")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the think times")
+    parser.add_argument("--port", type=int, default=8599, help="Port of the server under test")
+    parser.add_argument("--workdir", default=".", help="Directory the app runs in (holding data/)")
+    parser.add_argument("--no-warmup", action="store_true", help="Measure from a cold server")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/load-<timestamp>.json)")
+    args = parser.parse_args()
+
+    try:
+        import websockets  # noqa: F401
+    except ImportError:
+        parser.error("the load test needs the websockets package (pip install websockets)")
+    if not os.path.exists(os.path.join(args.workdir, PREPROCESSED_PATH)):
+        parser.error(f"{PREPROCESSED_PATH} not found in {os.path.abspath(args.workdir)}; run the Preprocessing page first")
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    summaries, by_step = [], []
+    for sessions in args.sessions:
+        summary, steps = run_load(sessions, args)
+        summaries.append(summary)
+        print(f"{sessions:>4} sessions: {summary['reruns']} reruns, p50 {summary['p50_ms']:.0f} ms, "
+              f"p95 {summary['p95_ms']:.0f} ms, {summary['reruns_per_s']:.2f} reruns/s, "
+              f"{summary['timeouts']} timeouts, peak RSS {summary['rss_peak_mb']:.0f} MB")
+        steps["sessions"] = sessions
+        by_step.append(steps)
+
+    table = pd.DataFrame(summaries)
+    print()
+    print(table.to_string(index=False))
+
+    steps = pd.concat(by_step, ignore_index=True)
+    step_p95 = (steps.groupby(["step", "sessions"], sort=False)["seconds"].quantile(0.95)
+                .mul(1000).round(0).unstack("sessions"))
+    print("\np95 latency per step (ms) by session count")
+    print(step_p95.to_string())
+    errors = steps.loc[steps["error"] != "", ["sessions", "step", "error"]]
+    if len(errors):
+        print("\nErrors shown by the app")
+        print(errors.groupby(["step", "error"], sort=False).size().rename("count").to_string())
+
+    run = {"created": datetime.now().isoformat(timespec="seconds"), "duration": args.duration,
+           "think": args.think, "ramp": args.ramp, "timeout": args.timeout, "seed": args.seed,
+           "cpu_count": os.cpu_count(), "scenario": [step for step, _ in SCENARIO], "summary": summaries,
+           "steps": json.loads(steps.to_json(orient="records"))}
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(output, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"\nResults written to {output}")
+    return 1 if table["timeouts"].sum() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
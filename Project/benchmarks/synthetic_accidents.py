@@ -0,0 +1,289 @@
+"""Generate a synthetic raw US Accidents CSV with the schema of US_Accidents_March23.csv.
+
+Run from the Project directory:
+
+    python benchmarks/synthetic_accidents.py --rows 1000000 --output data/US_Accidents_March23.csv
+
+Rows are generated in independent chunks (each seeded from --seed and its chunk number),
+so the output is reproducible for a given seed and chunk size regardless of --jobs.
+Coordinates cluster around major cities, missingness follows the rates of the real
+export, and a small share of rows carry duplicate IDs and malformed timestamps.
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Raw columns in export order
+COLUMNS = [
+    "ID", "Source", "Severity", "Start_Time", "End_Time", "Start_Lat", "Start_Lng", "End_Lat", "End_Lng",
+    "Distance(mi)", "Description", "Street", "City", "County", "State", "Zipcode", "Country", "Timezone",
+    "Airport_Code", "Weather_Timestamp", "Temperature(F)", "Wind_Chill(F)", "Humidity(%)", "Pressure(in)",
+    "Visibility(mi)", "Wind_Direction", "Wind_Speed(mph)", "Precipitation(in)", "Weather_Condition",
+    "Amenity", "Bump", "Crossing", "Give_Way", "Junction", "No_Exit", "Railway", "Roundabout", "Station",
+    "Stop", "Traffic_Calming", "Traffic_Signal", "Turning_Loop", "Sunrise_Sunset", "Civil_Twilight",
+    "Nautical_Twilight", "Astronomical_Twilight",
+]
+
+# Share of missing values per column, close to the real export
+MISSING_RATES = {
+    "End_Lat": 0.44, "End_Lng": 0.44, "Description": 0.000001, "Street": 0.0014, "City": 0.00003,
+    "Zipcode": 0.0002, "Timezone": 0.001, "Airport_Code": 0.0029, "Weather_Timestamp": 0.0156,
+    "Temperature(F)": 0.021, "Wind_Chill(F)": 0.259, "Humidity(%)": 0.0225, "Pressure(in)": 0.0182,
+    "Visibility(mi)": 0.0229, "Wind_Direction": 0.0227, "Wind_Speed(mph)": 0.074,
+    "Precipitation(in)": 0.285, "Weather_Condition": 0.0222, "Sunrise_Sunset": 0.003,
+    "Civil_Twilight": 0.003, "Nautical_Twilight": 0.003, "Astronomical_Twilight": 0.003,
+}
+
+# City clusters: name, county, state, latitude, longitude, timezone, airport, zip prefix, weight
+CITIES = [
+    ("Miami", "Miami-Dade", "FL", 25.76, -80.19, "US/Eastern", "KMIA", "331", 8),
+    ("Orlando", "Orange", "FL", 28.54, -81.38, "US/Eastern", "KORL", "328", 5),
+    ("Jacksonville", "Duval", "FL", 30.33, -81.66, "US/Eastern", "KJAX", "322", 3),
+    ("Houston", "Harris", "TX", 29.76, -95.37, "US/Central", "KHOU", "770", 8),
+    ("Dallas", "Dallas", "TX", 32.78, -96.80, "US/Central", "KDAL", "752", 6),
+    ("Austin", "Travis", "TX", 30.27, -97.74, "US/Central", "KAUS", "787", 4),
+    ("San Antonio", "Bexar", "TX", 29.42, -98.49, "US/Central", "KSAT", "782", 3),
+    ("Los Angeles", "Los Angeles", "CA", 34.05, -118.24, "US/Pacific", "KCQT", "900", 12),
+    ("Sacramento", "Sacramento", "CA", 38.58, -121.49, "US/Pacific", "KSAC", "958", 4),
+    ("San Diego", "San Diego", "CA", 32.72, -117.16, "US/Pacific", "KSAN", "921", 4),
+    ("San Jose", "Santa Clara", "CA", 37.34, -121.89, "US/Pacific", "KSJC", "951", 3),
+    ("San Francisco", "San Francisco", "CA", 37.77, -122.42, "US/Pacific", "KSFO", "941", 3),
+    ("Charlotte", "Mecklenburg", "NC", 35.23, -80.84, "US/Eastern", "KCLT", "282", 5),
+    ("Raleigh", "Wake", "NC", 35.78, -78.64, "US/Eastern", "KRDU", "276", 4),
+    ("Atlanta", "Fulton", "GA", 33.75, -84.39, "US/Eastern", "KATL", "303", 4),
+    ("Nashville", "Davidson", "TN", 36.16, -86.78, "US/Central", "KBNA", "372", 3),
+    ("Columbia", "Richland", "SC", 34.00, -81.03, "US/Eastern", "KCAE", "292", 3),
+    ("New York", "New York", "NY", 40.71, -74.01, "US/Eastern", "KNYC", "100", 4),
+    ("Philadelphia", "Philadelphia", "PA", 39.95, -75.17, "US/Eastern", "KPHL", "191", 3),
+    ("Richmond", "Richmond City", "VA", 37.54, -77.44, "US/Eastern", "KRIC", "232", 3),
+    ("Baltimore", "Baltimore City", "MD", 39.29, -76.61, "US/Eastern", "KBWI", "212", 2),
+    ("Chicago", "Cook", "IL", 41.88, -87.63, "US/Central", "KMDW", "606", 3),
+    ("Minneapolis", "Hennepin", "MN", 44.98, -93.27, "US/Central", "KMSP", "554", 3),
+    ("Detroit", "Wayne", "MI", 42.33, -83.05, "US/Eastern", "KDET", "482", 2),
+    ("Columbus", "Franklin", "OH", 39.96, -83.00, "US/Eastern", "KCMH", "432", 2),
+    ("Portland", "Multnomah", "OR", 45.52, -122.68, "US/Pacific", "KPDX", "972", 3),
+    ("Seattle", "King", "WA", 47.61, -122.33, "US/Pacific", "KSEA", "981", 2),
+    ("Phoenix", "Maricopa", "AZ", 33.45, -112.07, "US/Mountain", "KPHX", "850", 3),
+    ("Salt Lake City", "Salt Lake", "UT", 40.76, -111.89, "US/Mountain", "KSLC", "841", 2),
+    ("Denver", "Denver", "CO", 39.74, -104.99, "US/Mountain", "KDEN", "802", 2),
+    ("Oklahoma City", "Oklahoma", "OK", 35.47, -97.52, "US/Central", "KOKC", "731", 2),
+    ("Baton Rouge", "East Baton Rouge", "LA", 30.45, -91.19, "US/Central", "KBTR", "708", 2),
+    ("Boston", "Suffolk", "MA", 42.36, -71.06, "US/Eastern", "KBOS", "021", 1),
+    ("Newark", "Essex", "NJ", 40.74, -74.17, "US/Eastern", "KEWR", "071", 1),
+    ("Hartford", "Hartford", "CT", 41.76, -72.67, "US/Eastern", "KHFD", "061", 1),
+    ("Birmingham", "Jefferson", "AL", 33.52, -86.80, "US/Central", "KBHM", "352", 1),
+    ("Kansas City", "Jackson", "MO", 39.10, -94.58, "US/Central", "KMCI", "641", 1),
+    ("Las Vegas", "Clark", "NV", 36.17, -115.14, "US/Pacific", "KLAS", "891", 1),
+    ("Omaha", "Douglas", "NE", 41.26, -95.93, "US/Central", "KOMA", "681", 1),
+    ("Boise", "Ada", "ID", 43.62, -116.20, "US/Mountain", "KBOI", "837", 1),
+]
+CITY_TABLE = pd.DataFrame(CITIES, columns=["city", "county", "state", "lat", "lng", "timezone",
+                                           "airport", "zip", "weight"])
+
+SOURCES = (["Source1", "Source2", "Source3"], [0.55, 0.43, 0.02])
+SEVERITIES = ([1, 2, 3, 4], [0.009, 0.797, 0.168, 0.026])
+WEATHER = (["Fair", "Mostly Cloudy", "Cloudy", "Clear", "Partly Cloudy", "Overcast", "Light Rain",
+            "Scattered Clouds", "Light Snow", "Fog", "Rain", "Haze", "Fair / Windy", "Heavy Rain",
+            "Light Drizzle", "Thunder in the Vicinity", "T-Storm", "Snow", "Smoke", "Thunderstorm"],
+           [0.335, 0.133, 0.107, 0.106, 0.092, 0.051, 0.046, 0.021, 0.017, 0.010, 0.013, 0.012, 0.010,
+            0.008, 0.006, 0.006, 0.007, 0.006, 0.007, 0.007])
+WIND_DIRECTIONS = ["CALM", "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE", "S", "SSW", "SW", "WSW",
+                   "W", "WNW", "NW", "NNW", "VAR", "North", "South", "East", "West", "Variable"]
+STREET_NAMES = ["Main St", "Broadway", "Oak Ave", "Maple Dr", "Park Ave", "Washington Blvd", "Lake Rd",
+                "Hill St", "Pine St", "Cedar Ln", "Elm St", "Sunset Blvd", "Highland Ave", "River Rd",
+                "Market St", "Church St", "Center St", "Mill Rd", "Jackson St", "Lincoln Ave"]
+HIGHWAYS = ["I-95 N", "I-95 S", "I-5 N", "I-5 S", "I-10 E", "I-10 W", "I-75 N", "I-75 S", "I-35 N",
+            "I-35 S", "I-405 N", "I-405 S", "US-101 N", "US-101 S", "I-80 E", "I-80 W", "I-85 N", "I-85 S"]
+# Road feature flag -> share of accidents where it is present
+ROAD_FEATURE_RATES = {
+    "Amenity": 0.012, "Bump": 0.0005, "Crossing": 0.113, "Give_Way": 0.0047, "Junction": 0.074,
+    "No_Exit": 0.0025, "Railway": 0.0087, "Roundabout": 0.00003, "Station": 0.026, "Stop": 0.028,
+    "Traffic_Calming": 0.001, "Traffic_Signal": 0.148, "Turning_Loop": 0.0,
+}
+# Twilight column -> hours before sunrise / after sunset that still count as "Day"
+TWILIGHT_OFFSETS = {"Sunrise_Sunset": 0.0, "Civil_Twilight": 0.5, "Nautical_Twilight": 1.0,
+                    "Astronomical_Twilight": 1.5}
+# Accidents per hour of day (rush-hour peaks), normalised below
+HOUR_WEIGHTS = np.array([2, 1.5, 1.3, 1.2, 2, 4, 6, 9, 9, 6, 5, 5, 5.5, 6, 7, 8.5, 9.5, 9, 6, 4.5, 3.5, 3, 2.7, 2.3])
+
+START = np.datetime64("2016-01-14T00:00:00", "s")
+END = np.datetime64("2023-03-31T23:59:59", "s")
+MALFORMED_TIMESTAMPS = np.array(["", "N/A", "2019-13-45 25:61:00", "0000-00-00 00:00:00", "31/12/2021 08:15"],
+                                dtype=object)
+
+
+def _choice(rng, spec, n):
+    values, weights = spec
+    weights = np.asarray(weights, dtype=float)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), n, p=weights / weights.sum())]
+
+
+def _format_times(times):
+    """`YYYY-MM-DD HH:MM:SS` strings for a datetime64[s] array, without per-element Python calls."""
+    text = np.datetime_as_string(times, unit="s").astype("S19")
+    text.view(np.uint8).reshape(-1, 19)[:, 10] = ord(" ")
+    return text.astype(str).astype(object)
+
+
+def _with_missing(rng, values, rate):
+    if not rate:
+        return values
+    values = np.asarray(values, dtype=object if np.asarray(values).dtype.kind in "OUSb" else float)
+    values[rng.random(len(values)) < rate] = None if values.dtype == object else np.nan
+    return values
+
+
+def generate_chunk(chunk, rows, seed=0, first_id=0, duplicate_rate=0.002, malformed_rate=0.001,
+                   fractional_rate=0.01):
+    """One chunk of synthetic raw accidents as a DataFrame with the export's columns.
+
+    `duplicate_rate` of rows reuse an earlier ID, `malformed_rate` of Start_Time/End_Time
+    values are unparseable, and `fractional_rate` carry a nanosecond suffix like part of
+    the real export.
+    """
+    rng = np.random.default_rng([seed, chunk])
+    n = rows
+    data = {}
+
+    ids = np.arange(first_id, first_id + n)
+    dup = rng.random(n) < duplicate_rate
+    ids[dup] = np.maximum(ids[dup] - rng.integers(1, 10_000, dup.sum()), 0)
+    data["ID"] = "A-" + pd.Series(ids).astype(str)
+    data["Source"] = _choice(rng, SOURCES, n)
+    data["Severity"] = _choice(rng, SEVERITIES, n).astype(np.int64)
+
+    # Times: uniform day, rush-hour shaped hour of day
+    days = rng.integers(0, (END - START).astype(int) // 86_400 + 1, n)
+    hours = rng.choice(24, n, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    seconds = days * 86_400 + hours * 3_600 + rng.integers(0, 3_600, n)
+    start = START + seconds.astype("timedelta64[s]")
+    duration = np.clip(rng.lognormal(np.log(75 * 60), 1.0, n), 60, 14 * 86_400).astype("timedelta64[s]")
+    start_text, end_text = _format_times(start), _format_times(start + duration)
+    for text in (start_text, end_text):
+        frac = rng.random(n) < fractional_rate
+        text[frac] = text[frac] + ".000000000"
+        bad = rng.random(n) < malformed_rate
+        text[bad] = MALFORMED_TIMESTAMPS[rng.integers(0, len(MALFORMED_TIMESTAMPS), bad.sum())]
+    data["Start_Time"], data["End_Time"] = start_text, end_text
+
+    # Places: tight clusters around cities plus a wider regional spread
+    weights = CITY_TABLE["weight"].to_numpy(float)
+    city = CITY_TABLE.iloc[rng.choice(len(CITY_TABLE), n, p=weights / weights.sum())]
+    spread = np.where(rng.random(n) < 0.8, 0.12, 1.2)
+    # Six decimals like the export; shorter numbers also make writing the CSV noticeably faster
+    lat = np.round(city["lat"].to_numpy() + rng.normal(0, 1, n) * spread, 6)
+    lng = np.round(city["lng"].to_numpy() + rng.normal(0, 1, n) * spread * 1.2, 6)
+    data["Start_Lat"], data["Start_Lng"] = lat, lng
+    data["End_Lat"] = _with_missing(rng, np.round(lat + rng.normal(0, 0.005, n), 6), MISSING_RATES["End_Lat"])
+    data["End_Lng"] = np.where(np.isnan(data["End_Lat"]), np.nan, np.round(lng + rng.normal(0, 0.005, n), 6))
+    data["Distance(mi)"] = np.round(rng.exponential(0.56, n), 3)
+
+    highway = rng.random(n) < 0.35
+    street = np.where(highway, np.asarray(HIGHWAYS, dtype=object)[rng.integers(0, len(HIGHWAYS), n)],
+                      np.asarray(STREET_NAMES, dtype=object)[rng.integers(0, len(STREET_NAMES), n)])
+    cross = np.asarray(STREET_NAMES, dtype=object)[rng.integers(0, len(STREET_NAMES), n)]
+    exits = rng.integers(1, 200, n).astype(str)
+    data["Description"] = np.where(highway, "Accident on " + street + " near Exit " + exits,
+                                   "Accident on " + street + " at " + cross + ".")
+    data["Street"] = street
+    data["City"] = city["city"].to_numpy()
+    data["County"] = city["county"].to_numpy()
+    data["State"] = city["state"].to_numpy()
+    data["Zipcode"] = city["zip"].to_numpy() + pd.Series(rng.integers(0, 100, n)).map("{:02d}".format).to_numpy()
+    data["Country"] = np.full(n, "US", dtype=object)
+    data["Timezone"] = city["timezone"].to_numpy()
+    data["Airport_Code"] = city["airport"].to_numpy()
+    weather_time = start.astype("datetime64[h]") - rng.integers(0, 10, n).astype("timedelta64[m]")
+    data["Weather_Timestamp"] = _format_times(weather_time.astype("datetime64[s]"))
+
+    # Weather: seasonal temperature by latitude, condition-dependent visibility and precipitation
+    month = (start.astype("datetime64[M]").astype(int) % 12) + 1
+    seasonal = -np.cos((month - 1) / 12 * 2 * np.pi)
+    temp = 95 - 1.1 * lat + 18 * seasonal + rng.normal(0, 9, n)
+    wind = np.round(rng.gamma(2.0, 3.9, n), 1)
+    condition = _choice(rng, WEATHER, n)
+    condition_text = pd.Series(condition, dtype=object)
+    wet = condition_text.str.contains("Rain|Drizzle|Storm|Snow|Thunder", regex=True).to_numpy()
+    data["Temperature(F)"] = np.round(temp, 1)
+    data["Wind_Chill(F)"] = np.round(np.where(temp < 50, temp - 0.7 * wind, temp), 1)
+    data["Humidity(%)"] = np.clip(np.round(rng.normal(np.where(wet, 88, 62), 16, n)), 1, 100)
+    data["Pressure(in)"] = np.round(np.clip(rng.normal(29.6, 0.8, n), 20, 31.5), 2)
+    data["Visibility(mi)"] = np.where(wet | (condition == "Fog"), np.round(rng.uniform(0.1, 7, n), 1), 10.0)
+    data["Wind_Direction"] = np.asarray(WIND_DIRECTIONS, dtype=object)[rng.integers(0, len(WIND_DIRECTIONS), n)]
+    data["Wind_Speed(mph)"] = wind
+    data["Precipitation(in)"] = np.where(wet, np.round(rng.exponential(0.08, n), 2), 0.0)
+    data["Weather_Condition"] = condition
+
+    # Bad weather shifts some accidents from severity 2 to 3
+    bump = wet & (data["Severity"] == 2) & (rng.random(n) < 0.15)
+    data["Severity"][bump] = 3
+
+    for flag, rate in ROAD_FEATURE_RATES.items():
+        data[flag] = rng.random(n) < rate
+
+    hour_of_day = hours + rng.random(n)
+    sunrise = 6.5 - 1.2 * seasonal
+    sunset = 18.5 + 1.5 * seasonal
+    for column, offset in TWILIGHT_OFFSETS.items():
+        day = (hour_of_day >= sunrise - offset) & (hour_of_day < sunset + offset)
+        data[column] = np.where(day, "Day", "Night").astype(object)
+
+    for column, rate in MISSING_RATES.items():
+        if column not in ("End_Lat", "End_Lng"):
+            data[column] = _with_missing(rng, data[column], rate)
+    return pd.DataFrame(data, columns=COLUMNS)
+
+
+def _chunk_csv(chunk, rows, seed, first_id, options):
+    return generate_chunk(chunk, rows, seed, first_id, **options).to_csv(index=False, header=chunk == 0)
+
+
+def generate(path, rows, seed=0, chunk_rows=250_000, n_jobs=None, **options):
+    """Write `rows` synthetic accidents to `path` as CSV, generating chunks on `n_jobs` processes."""
+    chunks = [(i, min(chunk_rows, rows - start), start) for i, start in enumerate(range(0, rows, chunk_rows))]
+    n_jobs = n_jobs or os.cpu_count() or 1
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", newline="") as out:
+        if n_jobs == 1 or len(chunks) == 1:
+            for chunk, n, first_id in chunks:
+                out.write(_chunk_csv(chunk, n, seed, first_id, options))
+        else:
+            # Keep a bounded window of chunks in flight and write them back in order
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                pending, todo = deque(), iter(chunks)
+                for chunk, n, first_id in todo:
+                    pending.append(pool.submit(_chunk_csv, chunk, n, seed, first_id, options))
+                    if len(pending) >= 2 * n_jobs:
+                        out.write(pending.popleft().result())
+                while pending:
+                    out.write(pending.popleft().result())
+    os.replace(tmp_path, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of rows to generate")
+    parser.add_argument("--output", default="data/US_Accidents_March23.csv", help="CSV file to write")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--chunk-rows", type=int, default=250_000, help="Rows generated per chunk")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--duplicate-rate", type=float, default=0.002, help="Share of rows with a reused ID")
+    parser.add_argument("--malformed-rate", type=float, default=0.001, help="Share of unparseable timestamps")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    generate(args.output, args.rows, args.seed, args.chunk_rows, args.jobs,
+             duplicate_rate=args.duplicate_rate, malformed_rate=args.malformed_rate)
+    size = os.path.getsize(args.output) / 2 ** 20
+    print(f"Wrote {args.rows:,} rows ({size:,.0f} MB) to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
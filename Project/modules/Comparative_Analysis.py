@@ -1,37 +1,64 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.express as px
-import plotly.figure_factory as ff
-from scipy.stats import chi2_contingency
-
-
-def cramers_v(x, y):
-    """Calculate Cramér's V statistic for categorical-categorical association."""
-    confusion_matrix = pd.crosstab(x, y)
-    chi2 = chi2_contingency(confusion_matrix)[0]
-    n = confusion_matrix.sum().sum()
-    phi2 = chi2 / n
-    r, k = confusion_matrix.shape
-    phi2corr = max(0, phi2 - ((k - 1)*(r - 1)) / (n - 1))
-    rcorr = r - ((r - 1)**2) / (n - 1)
-    kcorr = k - ((k - 1)**2) / (n - 1)
-    if rcorr == 0 or kcorr == 0:
-        return np.nan
-    return np.sqrt(phi2corr / min((kcorr -1), (rcorr -1)))
-
-
-def run():
+import plotly.graph_objects as go
+from analytics import SPLOM_FEATURES, cramers_v_matrix, pairwise_histograms as compute_pairwise_histograms
+from dataset_registry import query_dataset
+from filter_context import describe, is_active
+from instrumentation import phase, record_rows
+
+PREPROCESSED_PATH = "data/US_Accidents_preprocessed.csv"
+
+
+# Scatter-matrix binning is cached across sessions; the headless computation lives in analytics
+pairwise_histograms = st.cache_data(show_spinner="Binning scatter matrix...")(compute_pairwise_histograms)
+
+
+def scatter_matrix_figure(result):
+    """Build a scatter matrix figure from `pairwise_histograms` output (density heatmaps off the diagonal)."""
+    features = result["features"]
+    k = len(features)
+    centers = [(e[:-1] + e[1:]) / 2 for e in result["edges"]]
+
+    from plotly.subplots import make_subplots
+    fig = make_subplots(rows=k, cols=k, shared_xaxes="columns",
+                        horizontal_spacing=0.01, vertical_spacing=0.01)
+    for i in range(k):
+        for j in range(k):
+            if i == j:
+                trace = go.Bar(x=centers[j], y=result["hist1d"][j],
+                               marker_color="#636EFA", showlegend=False)
+            else:
+                # Rows of hist2d[i, j] follow feature i (y axis), columns follow feature j (x axis)
+                trace = go.Heatmap(x=centers[j], y=centers[i],
+                                   z=np.log1p(result["hist2d"][i, j]),
+                                   colorscale="Viridis", showscale=False,
+                                   hovertemplate="x=%{x}<br>y=%{y}<br>log(1+count)=%{z:.2f}<extra></extra>")
+            fig.add_trace(trace, row=i + 1, col=j + 1)
+        fig.update_yaxes(title_text=features[i], row=i + 1, col=1)
+        fig.update_xaxes(title_text=features[i], row=k, col=i + 1)
+
+    fig.update_layout(height=180 * k + 100, title="Scatter Matrix (binned density, log scale)",
+                      template="plotly_white", bargap=0)
+    return fig
+
+
+def run(ctx=None):
     st.header("Comparative Analysis")
 
-    df = pd.read_csv("data/US_Accidents_preprocessed.csv")
+    # Shared read-only frame; filters below create new frames instead of modifying it
+    with phase("load"):
+        df = query_dataset(PREPROCESSED_PATH, ctx)
+        record_rows(len(df))
+    if is_active(ctx):
+        st.caption(f"{describe(ctx)} ({len(df):,} accidents)")
 
     # Separate numerical and categorical features + adjust for Severity
-    num_features = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
+    num_features = df.select_dtypes(include='number').columns.tolist()
     cat_features = df.select_dtypes(include=['object', 'category', 'bool']).columns.tolist()
 
     # Chart type selection
-    chart_type = st.selectbox("Select chart type", options=["Scatterplot", "Box Plot", "Heatmap"])
+    chart_type = st.selectbox("Select chart type", options=["Scatterplot", "Scatter Matrix", "Box Plot", "Heatmap"])
 
     if chart_type == "Scatterplot":
         # Scatterplot: only numerical features for X and Y
@@ -42,16 +69,37 @@ def run():
             st.info("Please select both numeric X-axis and Y-axis features.")
             return
 
-        fig = px.scatter(
-            df,
-            x=feature_x,
-            y=feature_y,
-            color="Severity",
-            title=f"Scatterplot of {feature_x} vs {feature_y}",
-            labels={feature_x: feature_x, feature_y: feature_y},
-            template="plotly_white"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        with phase("figure build"):
+            fig = px.scatter(
+                df,
+                x=feature_x,
+                y=feature_y,
+                color="Severity",
+                title=f"Scatterplot of {feature_x} vs {feature_y}",
+                labels={feature_x: feature_x, feature_y: feature_y},
+                template="plotly_white"
+            )
+            record_rows(len(df))
+        with phase("render"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    elif chart_type == "Scatter Matrix":
+        # Scatter matrix: binned pairwise densities over several numerical features at once
+        available = [f for f in SPLOM_FEATURES if f in num_features]
+        selected = st.multiselect("Features", options=available, default=available)
+        bins = st.slider("Bins per feature", min_value=10, max_value=100, value=40, step=5)
+
+        if len(selected) < 2:
+            st.info("Please select at least two numerical features.")
+            return
+
+        with phase("compute"):
+            result = pairwise_histograms(PREPROCESSED_PATH, tuple(selected), ctx, bins)
+        with phase("figure build"):
+            fig = scatter_matrix_figure(result)
+        with phase("render"):
+            st.plotly_chart(fig, use_container_width=True)
+        st.caption("Each cell is a 2D histogram; bins are shared by every pair involving the same feature.")
 
     elif chart_type == "Box Plot":
         # Box Plot: single numerical feature to visualize distribution grouped by Severity
@@ -61,15 +109,18 @@ def run():
             st.info("Please select a numerical feature to display box plot.")
             return
 
-        fig = px.box(
-            df,
-            y=feature_y,
-            color="Severity",
-            title=f"Box Plot of {feature_y} grouped by Severity",
-            labels={feature_y: feature_y, "Severity": "Severity"},
-            template="plotly_white"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        with phase("figure build"):
+            fig = px.box(
+                df,
+                y=feature_y,
+                color="Severity",
+                title=f"Box Plot of {feature_y} grouped by Severity",
+                labels={feature_y: feature_y, "Severity": "Severity"},
+                template="plotly_white"
+            )
+            record_rows(len(df))
+        with phase("render"):
+            st.plotly_chart(fig, use_container_width=True)
 
     else:  # Heatmap
         heatmap_data_type = st.radio("Heatmap Data Type", options=["Numerical", "Categorical"])
@@ -83,18 +134,23 @@ def run():
                 st.info("Not enough numerical features to plot correlation heatmap.")
                 return
             
-            corr_matrix = df[features].corr()
-
-            fig = ff.create_annotated_heatmap(
-                z=corr_matrix.values.round(2),
-                x=list(corr_matrix.columns),
-                y=list(corr_matrix.index),
-                colorscale='Viridis',
-                showscale=True,
-                annotation_text=corr_matrix.values.round(2)
-            )
-            fig.update_layout(title="Numerical Correlation Heatmap with Severity")
-            st.plotly_chart(fig, use_container_width=True)
+            with phase("compute"):
+                corr_matrix = df[features].corr()
+                record_rows(len(df))
+
+            import plotly.figure_factory as ff
+            with phase("figure build"):
+                fig = ff.create_annotated_heatmap(
+                    z=corr_matrix.values.round(2),
+                    x=list(corr_matrix.columns),
+                    y=list(corr_matrix.index),
+                    colorscale='Viridis',
+                    showscale=True,
+                    annotation_text=corr_matrix.values.round(2)
+                )
+                fig.update_layout(title="Numerical Correlation Heatmap with Severity")
+            with phase("render"):
+                st.plotly_chart(fig, use_container_width=True)
 
         else:  # Categorical heatmap based on Cramér's V including Severity even if numerical
             features = cat_features.copy()
@@ -106,24 +162,19 @@ def run():
                 st.info("Not enough categorical features to plot Cramér's V heatmap.")
                 return
 
-            n = len(features)
-            cramers_matrix = np.zeros((n, n))
-
-            for i in range(n):
-                for j in range(n):
-                    if i == j:
-                        cramers_matrix[i, j] = 1.0
-                    else:
-                        val = cramers_v(df[features[i]], df[features[j]])
-                        cramers_matrix[i, j] = val if val is not np.nan else 0
-
-            fig = ff.create_annotated_heatmap(
-                z=cramers_matrix.round(2),
-                x=features,
-                y=features,
-                colorscale='Viridis',
-                showscale=True,
-                annotation_text=cramers_matrix.round(2)
-            )
-            fig.update_layout(title="Categorical Correlation Heatmap with Severity (Cramér's V)")
-            st.plotly_chart(fig, use_container_width=True)
+            with phase("compute"):
+                cramers_matrix = cramers_v_matrix(PREPROCESSED_PATH, features, ctx)
+
+            import plotly.figure_factory as ff
+            with phase("figure build"):
+                fig = ff.create_annotated_heatmap(
+                    z=cramers_matrix.round(2),
+                    x=features,
+                    y=features,
+                    colorscale='Viridis',
+                    showscale=True,
+                    annotation_text=cramers_matrix.round(2)
+                )
+                fig.update_layout(title="Categorical Correlation Heatmap with Severity (Cramér's V)")
+            with phase("render"):
+                st.plotly_chart(fig, use_container_width=True)
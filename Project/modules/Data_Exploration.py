@@ -1,25 +1,50 @@
 import streamlit as st
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+import plotly.express as px
+from preview import preview_rows
+from missingness import load_missingness
+from filter_context import is_active
+from instrumentation import phase, record_rows
 
-def run():
+RAW_PATH = "data/US_Accidents_March23.csv"
+
+def run(ctx=None):
     st.header("Dataset Exploration")
-    df = pd.read_csv("data/US_Accidents_March23.csv")
-    
+    if is_active(ctx):
+        st.caption("Global filters apply to the preprocessed-data pages; this page shows the raw dataset.")
+
+    # Preview reads only the first rows of the file
     st.write("Preview of dataset")
-    st.dataframe(df.head())
+    st.dataframe(preview_rows(RAW_PATH, 5))
+
+    with st.spinner("Profiling missing values..."), phase("load"):
+        profile = load_missingness(RAW_PATH)
+        record_rows(profile["rows"])
 
     st.write("Missing Values Heatmap")
-    plt.figure(figsize=(14, 8))  # Larger figure size for better visibility
-    sns.heatmap(df.isnull(),
-                cbar=False,
-                cmap="viridis",  # Better contrast colormap
-                yticklabels=False,
-                xticklabels=True,
-                linewidths=0.5,  # Adds grid lines for clarity
-                linecolor='gray')
-    plt.xticks(rotation=45, ha='right')  # Rotate x labels for readability
-    plt.title("Missing Values Heatmap")
-    st.pyplot(plt.gcf())
-    
\ No newline at end of file
+    # One row per block of consecutive records; color is the share of missing values in that block
+    fractions = profile["block_null_fraction"]
+    with phase("figure build"):
+        fig = px.imshow(fractions.T,
+                        x=profile["block_start_row"],
+                        color_continuous_scale="viridis",
+                        zmin=0, zmax=1,
+                        aspect="auto",
+                        labels={"x": "First row of block", "y": "Column", "color": "Missing share"},
+                        title="Missing Values Heatmap")
+        fig.update_layout(height=max(400, 18 * len(fractions.columns)))
+    with phase("render"):
+        st.plotly_chart(fig, use_container_width=True)
+
+    null_counts = profile["null_counts"]
+    missing_cols = null_counts[null_counts > 0].sort_values(ascending=False).index.tolist()
+    st.write("Missing Values per Column")
+    st.dataframe((null_counts[missing_cols] / max(profile["rows"], 1) * 100).round(2)
+                 .rename("Missing %").to_frame(), use_container_width=True)
+
+    if len(missing_cols) > 1:
+        st.write("Co-missingness")
+        co_missing = profile["co_missing"].loc[missing_cols, missing_cols]
+        fig_co = px.imshow(co_missing, color_continuous_scale="viridis", aspect="auto",
+                           labels={"color": "Rows missing both"},
+                           title="Rows Missing Both Columns")
+        st.plotly_chart(fig_co, use_container_width=True)
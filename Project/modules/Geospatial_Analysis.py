@@ -1,8 +1,8 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-from sklearn.cluster import DBSCAN
-import numpy as np
+from analytics import hotspot_clusters
+from dataset_registry import query_dataset
+from instrumentation import phase, record_rows
 
 # State abbreviation to full name mapping for UI clarity
 us_state_abbrev = {
@@ -59,12 +59,15 @@ us_state_abbrev = {
     "DC": "District of Columbia"
 }
 
-def run():
+def run(ctx=None):
     st.header("Geospatial Accident Analysis with Hotspot Counts")
 
-    df = pd.read_csv("data/US_Accidents_preprocessed.csv")
-    df = df.dropna(subset=['Latitude', 'Longitude'])
-    df = df.rename(columns={"Latitude": "latitude", "Longitude": "longitude"})
+    with phase("load"):
+        df = query_dataset("data/US_Accidents_preprocessed.csv", ctx,
+                           ["Latitude", "Longitude", "Severity", "State", "City"])
+        df = df.dropna(subset=['Latitude', 'Longitude'])
+        df = df.rename(columns={"Latitude": "latitude", "Longitude": "longitude"})
+        record_rows(len(df))
 
     geog_level = st.radio(
         "Select geography level",
@@ -90,14 +93,16 @@ def run():
         return
 
     selected_severity_value = int(selected_severity)
-    filtered_df = df.copy()
+    filtered_df = df
     region_label = None
     zoom = 3
     center = dict(lat=39, lon=-98)  # default USA center
 
     if geog_level == "Country":
         region_label = "Country" if "Country" in df.columns else None
-        filtered_df = filtered_df[filtered_df["Severity"] == selected_severity_value]
+        with phase("filter"):
+            filtered_df = filtered_df[filtered_df["Severity"] == selected_severity_value]
+            record_rows(len(filtered_df))
 
     elif geog_level == "State":
         region_label = "State"
@@ -112,8 +117,10 @@ def run():
             return
         selected_state_abbr = state_name_to_abbrev[selected_state_name]
 
-        filtered_df = filtered_df[filtered_df["State"] == selected_state_abbr]
-        filtered_df = filtered_df[filtered_df["Severity"] == selected_severity_value]
+        with phase("filter"):
+            filtered_df = filtered_df[filtered_df["State"] == selected_state_abbr]
+            filtered_df = filtered_df[filtered_df["Severity"] == selected_severity_value]
+            record_rows(len(filtered_df))
 
         center_lat = filtered_df['latitude'].mean()
         center_lon = filtered_df['longitude'].mean()
@@ -129,8 +136,10 @@ def run():
             st.info("Please select a city to display data.")
             return
 
-        filtered_df = filtered_df[filtered_df["City"] == selected_city]
-        filtered_df = filtered_df[filtered_df["Severity"] == selected_severity_value]
+        with phase("filter"):
+            filtered_df = filtered_df[filtered_df["City"] == selected_city]
+            filtered_df = filtered_df[filtered_df["Severity"] == selected_severity_value]
+            record_rows(len(filtered_df))
 
         center_lat = filtered_df['latitude'].mean()
         center_lon = filtered_df['longitude'].mean()
@@ -150,60 +159,55 @@ def run():
 
     if vis_type == "Point Map":
         hover_data = {region_label: True} if region_label else {}
-        fig = px.scatter_mapbox(
-            filtered_df,
-            lat='latitude',
-            lon='longitude',
-            color=filtered_df["Severity"].astype(str),
-            color_discrete_map={str(k): v for k, v in severity_color_map.items()},
-            zoom=zoom,
-            center=center,
-            mapbox_style="carto-positron",
-            hover_data=hover_data
-        )
-        fig.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 0})
-        st.plotly_chart(fig, use_container_width=True)
+        with phase("figure build"):
+            fig = px.scatter_mapbox(
+                filtered_df,
+                lat='latitude',
+                lon='longitude',
+                color=filtered_df["Severity"].astype(str),
+                color_discrete_map={str(k): v for k, v in severity_color_map.items()},
+                zoom=zoom,
+                center=center,
+                mapbox_style="carto-positron",
+                hover_data=hover_data
+            )
+            fig.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 0})
+            record_rows(len(filtered_df))
+        with phase("render"):
+            st.plotly_chart(fig, use_container_width=True)
 
     else:
-        coords = filtered_df[['latitude', 'longitude']].to_numpy()
-        radians_coords = np.radians(coords)
-        kms_per_radian = 6371.0088
-        epsilon = 1.0 / kms_per_radian  # 1 km radius for clustering
-        db = DBSCAN(eps=epsilon, min_samples=5, algorithm='ball_tree', metric='haversine')
-        cluster_labels = db.fit_predict(radians_coords)
-        filtered_df = filtered_df.assign(cluster=cluster_labels)
-
-        clusters = filtered_df[filtered_df['cluster'] != -1]
-        if clusters.empty:
+        with phase("compute"):
+            cluster_agg = hotspot_clusters(filtered_df, eps_km=1.0)  # 1 km radius for clustering
+            record_rows(len(filtered_df))
+
+        if cluster_agg.empty:
             st.info("No hotspots detected for the selected criteria.")
             return
 
-        cluster_agg = clusters.groupby('cluster').agg(
-            accident_count=('cluster', 'count'),
-            latitude=('latitude', 'mean'),
-            longitude=('longitude', 'mean')
-        ).reset_index()
         cluster_agg['Severity'] = selected_severity_value
 
-        fig = px.scatter_mapbox(
-            cluster_agg,
-            lat='latitude',
-            lon='longitude',
-            size='accident_count',
-            color=cluster_agg["Severity"].astype(str),
-            color_discrete_map={str(k): v for k, v in severity_color_map.items()},
-            size_max=30,
-            zoom=zoom,
-            center=center,
-            mapbox_style="carto-positron",
-            hover_name='Severity',
-            hover_data={
-                "accident_count": True,
-                "latitude": ':.4f',
-                "longitude": ':.4f'
-            },
-            title="Accident Hotspots with Clustered Counts"
-        )
-        fig.update_layout(margin={"r": 0, "t": 40, "l": 0, "b": 0})
-        st.plotly_chart(fig, use_container_width=True)
+        with phase("figure build"):
+            fig = px.scatter_mapbox(
+                cluster_agg,
+                lat='latitude',
+                lon='longitude',
+                size='accident_count',
+                color=cluster_agg["Severity"].astype(str),
+                color_discrete_map={str(k): v for k, v in severity_color_map.items()},
+                size_max=30,
+                zoom=zoom,
+                center=center,
+                mapbox_style="carto-positron",
+                hover_name='Severity',
+                hover_data={
+                    "accident_count": True,
+                    "latitude": ':.4f',
+                    "longitude": ':.4f'
+                },
+                title="Accident Hotspots with Clustered Counts"
+            )
+            fig.update_layout(margin={"r": 0, "t": 40, "l": 0, "b": 0})
+        with phase("render"):
+            st.plotly_chart(fig, use_container_width=True)
         st.caption("Point size corresponds to accident count at each hotspot cluster.")
@@ -1,43 +1,61 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+from analytics import severity_summary
+from dataset_metadata import load_metadata, severity_counts
+from preview import preview_rows
+from filter_context import is_active
+from instrumentation import phase, record_rows
 
-def run():
+RAW_PATH = "data/US_Accidents_March23.csv"
+
+
+def run(ctx=None):
     st.title("US RoadSafe Analytics")
     st.write("Analyze and visualize U.S. road accident trends to improve road safety awareness.")
-    
-    # Load full dataset directly
-    df = pd.read_csv("data/US_Accidents_March23.csv")
-    st.info("Loaded full dataset. This may take longer.")
-    
+    if is_active(ctx):
+        st.caption("Global filters apply to the preprocessed-data pages; this page shows the raw dataset.")
+
+    # Key figures come from the metadata sidecar instead of parsing the raw CSV
+    with st.spinner("Reading dataset metadata..."), phase("load"):
+        meta = load_metadata(RAW_PATH)
+        record_rows(meta["row_count"])
+    severity = severity_counts(meta)
+    summary = severity_summary(severity)
+    date_range = meta["date_range"]
+    st.caption(f"Dataset metadata from {meta['created']}: {len(meta['columns'])} columns, "
+               f"records from {date_range['min']} to {date_range['max']}.")
+
     # Display key metrics
-    total_accidents = len(df)
-    avg_severity = round(df['Severity'].mean(), 2)
+    total_accidents = meta["row_count"]
     st.metric("Total Accidents", total_accidents)
-    st.metric("Average Severity", avg_severity)
+    st.metric("Average Severity", summary["average"])
 
     # Show severity distribution histogram using Plotly for interactivity
-    fig = px.histogram(df, 
-                       x="Severity", 
-                       nbins=4, 
-                       title="Severity Distribution",
-                       labels={"Severity": "Accident Severity"},
-                       color_discrete_sequence=["#EF553B"])
-    fig.update_layout(
-        xaxis=dict(dtick=1),
-        yaxis_title="Count",
-        template="plotly_white"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    with phase("figure build"):
+        fig = px.bar(x=severity.index,
+                     y=severity.values,
+                     title="Severity Distribution",
+                     labels={"x": "Accident Severity", "y": "Count"},
+                     color_discrete_sequence=["#EF553B"])
+        fig.update_layout(
+            xaxis=dict(dtick=1),
+            yaxis_title="Count",
+            template="plotly_white",
+            bargap=0
+        )
+    with phase("render"):
+        st.plotly_chart(fig, use_container_width=True)
 
     # Additional analysis: severity counts
-    severity_counts = df['Severity'].value_counts().sort_index()
     st.write("### Severity Counts")
-    st.bar_chart(severity_counts)
+    st.bar_chart(severity.rename("count"))
 
     # Allow user to select severity threshold to filter data
     min_severity = st.slider("Filter accidents with minimum severity:", min_value=1, max_value=4, value=1)
-    filtered_df = df[df['Severity'] >= min_severity]
-    st.write(f"Showing {len(filtered_df):,} accidents with severity >= {min_severity}")
+    # Counts at or above each severity level, precomputed from the distribution
+    matching = int(summary["at_least"][min_severity])
+    st.write(f"Showing {matching:,} accidents with severity >= {min_severity}")
 
-    st.dataframe(filtered_df.head(10), use_container_width=True)
+    with phase("filter"):
+        preview = preview_rows(RAW_PATH, 10, [("Severity", ">=", min_severity)])
+    st.dataframe(preview, use_container_width=True)
@@ -1,21 +1,104 @@
+import os
 import streamlit as st
-import pandas as pd
-from scipy.stats import ttest_ind, chi2_contingency, pearsonr
+from analytics import RESAMPLING_CHECKS, insight_results, resampling_validation
+from hypothesis_stats import compute_insight_stats, sample_rows, INSIGHT_STATS_PARAMS
+from result_store import dataset_fingerprint, get_or_compute, load_result
+from dataset_registry import query_dataset
+from filter_context import describe, is_active
+from instrumentation import phase, record_rows
+from query_engine import configured_engine, decoded, insight_stats
 
-def run():
+PREPROCESSED_PATH = "data/US_Accidents_preprocessed.csv"
+
+
+@st.cache_data(show_spinner="Computing statistics for the filtered data...", max_entries=16)
+def filtered_insight_stats(path, fingerprint, ctx, engine):
+    return insight_stats(path, ctx, engine)
+
+
+def load_insight_stats(path, ctx=None):
+    """Sufficient statistics for all insights, from the persisted result store when up to date.
+
+    With active global filters the statistics are computed from the matching rows only.
+    """
+    if is_active(ctx):
+        return filtered_insight_stats(path, dataset_fingerprint(path), ctx, configured_engine())
+    stats = load_result("insight_stats", path, INSIGHT_STATS_PARAMS)
+    if stats is None:
+        with st.spinner("Computing full-dataset statistics..."):
+            compute = compute_insight_stats if configured_engine() == "pandas" else insight_stats
+            stats = get_or_compute("insight_stats", path, compute, INSIGHT_STATS_PARAMS)
+    return stats
+
+
+@st.cache_data(show_spinner="Sampling rows for resampling tests...")
+def load_row_sample(path, modified, columns, fraction, ctx=None):
+    if is_active(ctx):
+        rows = decoded(query_dataset(path, ctx, columns))
+        return rows.sample(frac=fraction, random_state=0, ignore_index=True)
+    return sample_rows(path, columns, fraction)
+
+
+def resampling_section(stats, ctx=None):
+    """Permutation p-values and bootstrap intervals for a selected insight on a random row sample."""
+    st.subheader("Resampling Validation")
+    st.markdown("Permutation tests and bootstrap intervals do not assume normally distributed Severity.")
+    check = st.selectbox("Insight to validate", options=[''] + list(RESAMPLING_CHECKS))
+    if check == '':
+        return
+
+    kind, columns, _ = RESAMPLING_CHECKS[check]
+    col1, col2 = st.columns(2)
+    sample_size = col1.slider("Random sample size (rows)", 10_000, 200_000, 50_000, step=10_000)
+    budget = col2.slider("Time budget (seconds)", 5, 60, 20)
+    if not st.button("Run resampling tests"):
+        return
+
+    fraction = min(1.0, sample_size / max(stats["rows"], 1))
+    with phase("load"):
+        sample = load_row_sample(PREPROCESSED_PATH, os.path.getmtime(PREPROCESSED_PATH), tuple(columns), fraction, ctx)
+        record_rows(len(sample))
+    with phase("compute"):
+        result = resampling_validation(sample, check, time_budget=budget)
+        if result is not None:
+            record_rows(result["rows"])
+    if result is None:
+        st.info("Not enough sampled data for this check.")
+        return
+
+    perm, boot = result["permutation"], result["bootstrap"]
+    label = "Mean difference" if kind == "two_sample" else "Correlation"
+    st.write(f"{label}: {perm['statistic']:.4f}, 95% bootstrap CI [{boot['ci_low']:.4f}, {boot['ci_high']:.4f}] "
+             f"({boot['n_resamples']:,} resamples)")
+    st.write(f"Permutation p-value: {perm['p_value']:.4f} from {perm['n_resamples']:,} permutations "
+             f"(stopped: {perm['stopped']}, {perm['elapsed']:.1f}s)")
+    if perm["p_value"] < 0.05:
+        st.success("Theory Proven TRUE under the permutation test.")
+    else:
+        st.warning("Theory Proven FALSE under the permutation test.")
+
+
+def run(ctx=None):
     st.header("Insight Extraction & Hypothesis Testing with Statistical Validation")
 
-    df = pd.read_csv("data/US_Accidents_preprocessed.csv", nrows=40000)
+    with phase("load"):
+        stats = load_insight_stats(PREPROCESSED_PATH, ctx)
+        record_rows(stats["rows"])
+    if is_active(ctx):
+        st.caption(f"{describe(ctx)}: tests use the {stats['rows']:,} matching accidents.")
+    else:
+        st.caption(f"All tests use the full preprocessed dataset ({stats['rows']:,} accidents).")
+
+    # Tests run on precomputed moments, so the rest of the run is mostly chart rendering
+    with phase("compute"):
+        results = insight_results(stats)
 
     ## Insight 1
     st.subheader("Insight 1: Effect of Weather Conditions on Accident Severity")
-    weather_groups = df.groupby("Weather_Condition")["Severity"].mean().sort_values(ascending=False).head(10)
-    st.bar_chart(weather_groups)
+    st.bar_chart(results["weather_severity"])
     st.markdown("**Hypothesis:** Different weather conditions lead to different average accident severities.")
-    if "Clear" in df["Weather_Condition"].unique() and "Rain" in df["Weather_Condition"].unique():
-        clear = df[df["Weather_Condition"] == "Clear"]["Severity"]
-        rain = df[df["Weather_Condition"] == "Rain"]["Severity"]
-        _, p = ttest_ind(clear, rain, nan_policy='omit')
+    p = results["clear_vs_rain_p"]
+    if p is not None:
         if p < 0.05:
             st.success(f"Theory Proven TRUE: Significant difference found (p={p:.4f}). Weather impacts severity.")
         else:
@@ -25,11 +108,9 @@ def run():
 
     ## Insight 2
     st.subheader("Insight 2: Accident Frequency by Hour of Day")
-    hourly_counts = df['Hour'].value_counts().sort_index()
-    st.line_chart(hourly_counts)
+    st.line_chart(results["hourly"])
     st.markdown("**Hypothesis:** Accident frequency differs between morning rush hours (7-9am) and late night (12-3am).")
-    rush_hours = df[df['Hour'].between(7,9)].shape[0]
-    night_hours = df[df['Hour'].between(0,3)].shape[0]
+    rush_hours, night_hours = results["rush_hour_count"], results["night_count"]
     st.write(f"Accidents 7-9am: {rush_hours}, 12-3am: {night_hours}")
     if rush_hours > night_hours:
         st.success("Theory Proven TRUE: More accidents during morning rush hours.")
@@ -38,27 +119,17 @@ def run():
 
     ## Insight 3
     st.subheader("Insight 3: Correlation Between Temperature and Accident Severity")
-    temp_bins = pd.cut(df["Temperature(F)"], bins=[-50, 0, 32, 50, 70, 90, 110, 150], right=False)
-    temp_severity = df.groupby(temp_bins)["Severity"].mean().sort_index()
-    temp_severity = temp_severity.reset_index()
-    temp_severity[temp_severity.columns[0]] = temp_severity[temp_severity.columns[0]].astype(str)
-    temp_severity = temp_severity.set_index(temp_severity.columns[0])
-    st.bar_chart(temp_severity)
-    corr, corr_p = pearsonr(df["Temperature(F)"].dropna(), df["Severity"].dropna())
+    temp_severity = results["temperature_severity"]
+    st.bar_chart(temp_severity.set_axis(temp_severity.index.astype(str)))
+    corr, corr_p = results["correlations"]["Temperature(F)"]
     st.success(f"Pearson correlation: {corr:.3f} (p={corr_p:.4e}) - {'Weak' if abs(corr)<0.3 else 'Moderate/Strong'} relationship.")
     st.markdown("**Theory:** Higher temperature extremes influence accident severity. Correlation shows the strength of this relationship.")
 
     ## Insight 4
     st.subheader("Insight 4: Accident Counts by Visibility Range")
-    visibility_bins = [0, 1, 2, 5, 10, 20, df["Visibility(mi)"].max()]
-    visibility_labels = ["<1mi", "1-2mi", "2-5mi", "5-10mi", "10-20mi", ">20mi"]
-    df['Visibility_Range'] = pd.cut(df["Visibility(mi)"], bins=visibility_bins, labels=visibility_labels, include_lowest=True)
-    visibility_counts = df['Visibility_Range'].value_counts().reindex(visibility_labels)
-    st.bar_chart(visibility_counts)
+    st.bar_chart(results["visibility"])
     st.markdown("**Hypothesis:** Low visibility (<2mi) leads to higher accident frequency.")
-    df['Low_Visibility'] = df['Visibility_Range'].isin(["<1mi", "1-2mi"])
-    contingency_table = pd.crosstab(df['Low_Visibility'], df['Severity'])
-    _, p_vis, _, _ = chi2_contingency(contingency_table)
+    p_vis = results["low_visibility_p"]
     if p_vis < 0.05:
         st.success(f"Theory Proven TRUE: Significant association between low visibility and accident severity (p={p_vis:.4f}).")
     else:
@@ -66,12 +137,9 @@ def run():
 
     ## Insight 5
     st.subheader("Insight 5: Accident Counts: Rain vs No Rain")
-    df['Is_Rain'] = df['Weather_Condition'].str.lower().str.contains('rain', na=False)
-    rain_counts = df['Is_Rain'].value_counts()
-    st.bar_chart(rain_counts)
+    st.bar_chart(results["rain_counts"])
     st.markdown("**Hypothesis:** Rain increases accident frequency.")
-    contingency_rain = pd.crosstab(df['Is_Rain'], df['Severity'])
-    _, p_rain, _, _ = chi2_contingency(contingency_rain)
+    p_rain = results["rain_p"]
     if p_rain < 0.05:
         st.success(f"Theory Proven TRUE: Rain significantly affects accident severity/frequency (p={p_rain:.4f}).")
     else:
@@ -79,8 +147,7 @@ def run():
 
     ## Insight 6
     st.subheader("Insight 6: Correlation between Humidity and Accident Severity")
-    df_clean = df.dropna(subset=["Humidity(%)", "Severity"])
-    corr_hum, p_hum = pearsonr(df_clean["Humidity(%)"], df_clean["Severity"])
+    corr_hum, p_hum = results["correlations"]["Humidity(%)"]
     st.write(f"Pearson correlation (Humidity vs Severity): {corr_hum:.3f} (p={p_hum:.4e})")
     if p_hum < 0.05:
         st.success("Theory Proven TRUE: Significant correlation between humidity and severity.")
@@ -89,8 +156,7 @@ def run():
 
     # Insight 7: Does Pressure Affect Accident Severity?
     st.subheader("Insight 7: Does Pressure Affect Accident Severity?")
-    df_clean_pressure = df.dropna(subset=["Pressure(in)", "Severity"])
-    corr_pressure, p_pressure = pearsonr(df_clean_pressure["Pressure(in)"], df_clean_pressure["Severity"])
+    corr_pressure, p_pressure = results["correlations"]["Pressure(in)"]
     st.write(f"Pearson correlation (Pressure vs Severity): {corr_pressure:.3f} (p={p_pressure:.4e})")
     st.markdown("**Hypothesis:** Atmospheric pressure correlates with accident severity.")
     if p_pressure < 0.05:
@@ -101,33 +167,18 @@ def run():
     # Insight 8: Effect of Road Features on Accident Severity
     st.subheader("Insight 8: Effect of Road Features on Accident Severity")
 
-    road_features = ['Bump', 'Crossing', 'Give_Way', 'Junction', 'No_Exit',
-                    'Railway', 'Roundabout', 'Station', 'Stop',
-                    'Traffic_Calming', 'Traffic_Signal', 'Turning_Loop']
-
-    existing_features = [feat for feat in road_features if feat in df.columns]
-
-    if existing_features:
-        results = []
-        for feat in existing_features:
-            # Filter rows where feature is True / 1 vs False / 0
-            with_feat = df[df[feat] == 1]["Severity"].dropna()
-            without_feat = df[df[feat] == 0]["Severity"].dropna()
-            
-            # Perform t-test if both groups have data
-            if len(with_feat) > 10 and len(without_feat) > 10:
-                stat, p = ttest_ind(with_feat, without_feat, nan_policy='omit')
-                theory = "TRUE" if p < 0.05 else "FALSE"
-                results.append((feat, len(with_feat), len(without_feat), p, theory))
-            else:
-                results.append((feat, len(with_feat), len(without_feat), None, "Insufficient data"))
+    road_features = results["road_features"]
+
+    if not road_features.empty:
+        st.dataframe(road_features, use_container_width=True)
 
         # Display Results
-        for feat, n_with, n_without, p, theory in results:
+        for feat, row in road_features.iterrows():
+            p = row["p_value"]
             st.write(f"Feature: **{feat}**")
-            st.write(f"  Cases with feature: {n_with}, without feature: {n_without}")
-            if p is not None:
-                if theory == "TRUE":
+            st.write(f"  Cases with feature: {row['n_with']}, without feature: {row['n_without']}")
+            if row["theory"] != "Insufficient data":
+                if row["theory"] == "TRUE":
                     st.success(f"  p-value={p:.4f} → Theory Proven TRUE: Road feature significantly affects severity.")
                 else:
                     st.warning(f"  p-value={p:.4f} → Theory Proven FALSE: No significant impact on severity.")
@@ -135,3 +186,5 @@ def run():
                 st.info("  Not enough data to test hypothesis.")
     else:
         st.info("No road feature columns found in data for this insight.")
+
+    resampling_section(stats, ctx)
@@ -1,93 +1,108 @@
-import streamlit as st
-import pandas as pd
 import plotly.express as px
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from aggregate_cube import cube_cells, load_cube
+from analytics import PANELS, context_cube
+from heavy_hitters import load_sketches
+from filter_context import describe, is_active
+from instrumentation import phase, record_rows
+from result_store import dataset_fingerprint
 
-def run():
-    st.header("Key Findings & Summary Dashboard")
+PREPROCESSED_PATH = "data/US_Accidents_preprocessed.csv"
 
-    df = pd.read_csv("data/US_Accidents_preprocessed.csv")
 
-    # --- Basic Metrics ---
-    st.subheader("Summary Metrics")
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Total Accidents Analyzed", f"{len(df):,}")
-    # if 'Hour' in df.columns:
-    #     peak_hour = df['Hour'].mode()[0]
-    #     col2.metric("Peak Accident Hour", peak_hour)
+@st.cache_data(show_spinner="Aggregating the filtered data...", max_entries=16)
+def filtered_cube(path, fingerprint, ctx):
+    return context_cube(path, ctx)
 
-    from datetime import datetime
-    if 'Hour' in df.columns:
-        peak_hour = df['Hour'].mode()[0]
-        peak_hour_am_pm = datetime.strptime(str(peak_hour), "%H").strftime("%I %p").lstrip('0') 
-        col2.metric("Peak Accident Hour", peak_hour_am_pm)
 
+# -----------------------------------------------------------
+# Rendering (main script thread only)
+# -----------------------------------------------------------
+def bar_chart(counts, label, title, colorscale, y_label="Number of Accidents"):
+    fig = px.bar(counts, x=counts.index, y=counts.values,
+                 labels={"x": label, "y": y_label},
+                 title=title, color=counts.values, color_continuous_scale=colorscale)
+    fig.update_layout(coloraxis_showscale=False)
+    return fig
+
+
+def weather_chart(counts):
+    return px.pie(names=counts.index, values=counts.values,
+                  title="Top 5 Weather Conditions During Accidents",
+                  color_discrete_sequence=px.colors.sequential.RdBu)
+
+
+# Figure for each panel of `PANELS` that returns counts, by panel title
+FIGURES = {
+    "Top 5 Accident-Prone States":
+        lambda counts: bar_chart(counts, "State", "Top 5 States by Accident Counts", 'Viridis'),
+    "Top 5 Accident-Prone Cities":
+        lambda counts: bar_chart(counts, "City", "Top 5 Cities by Accident Counts", 'Plasma'),
+    "Top 5 Weather Conditions During Accidents": weather_chart,
+    "Top 5 Road Surface / Feature Conditions in Accidents":
+        lambda counts: bar_chart(counts, "Road Feature", "Top 5 Road Surface / Feature Conditions", 'Turbo',
+                                 y_label="Accident Count"),
+}
+
+
+def render_panel(slot, title, result):
+    with slot.container():
+        if result["kind"] == "summary":
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Total Accidents Analyzed", f"{result['total']:,}")
+            if result["peak_hour"] is not None:
+                col2.metric("Peak Accident Hour", result["peak_hour"])
+            else:
+                col2.warning("Hour column missing")
+            if result["high_severity"] is not None:
+                col3.metric("High Severity Accidents (Severity≥3)", f"{result['high_severity']:,}")
+            else:
+                col3.warning("Severity column missing")
+            if result["shares"] is not None:
+                labels = {"IsWeekend": "on weekends", "IsDay": "in daylight"}
+                st.caption(" · ".join(f"{share:.1f}% of accidents {labels[flag]}"
+                                      for flag, share in result["shares"].items()))
+        elif result["kind"] == "counts":
+            st.plotly_chart(FIGURES[title](result["counts"]), use_container_width=True)
+        elif result["kind"] == "warning":
+            st.warning(result["message"])
+        else:
+            st.info(result["message"])
+
+
+def run(ctx=None):
+    st.header("Key Findings & Summary Dashboard")
+
+    # Unfiltered views are answered from the stored per-dimension marginals. Marginals cannot be
+    # filtered on other dimensions, so filtered views aggregate the matching rows instead (and
+    # count top values directly, since the sketches only describe the whole dataset)
+    if is_active(ctx):
+        with phase("filter"):
+            cube = filtered_cube(PREPROCESSED_PATH, dataset_fingerprint(PREPROCESSED_PATH), ctx)
+            record_rows(cube_cells(cube))
+        sketches = {}
+        st.caption(describe(ctx))
     else:
-        col2.warning("Hour column missing")
-    if 'Severity' in df.columns:
-        high_severity_count = df[df["Severity"] >= 3].shape[0]
-        col3.metric("High Severity Accidents (Severity≥3)", f"{high_severity_count:,}")
-    else:
-        col3.warning("Severity column missing")
-
-    # --- Top 5 States ---
-    st.subheader("Top 5 Accident-Prone States")
-    if 'State' in df.columns:
-        top_states = df['State'].value_counts().nlargest(5)
-        fig_states = px.bar(top_states, x=top_states.index, y=top_states.values,
-                            labels={"x":"State", "y":"Number of Accidents"},
-                            title="Top 5 States by Accident Counts",
-                            color=top_states.values, color_continuous_scale='Viridis')
-        fig_states.update_layout(coloraxis_showscale=False)
-        st.plotly_chart(fig_states, use_container_width=True)
-    else:
-        st.warning("State column missing")
-
-    # --- Top 5 Cities ---
-    st.subheader("Top 5 Accident-Prone Cities")
-    if 'City' in df.columns:
-        top_cities = df['City'].value_counts().nlargest(5)
-        fig_cities = px.bar(top_cities, x=top_cities.index, y=top_cities.values,
-                            labels={"x":"City", "y":"Number of Accidents"},
-                            title="Top 5 Cities by Accident Counts",
-                            color=top_cities.values, color_continuous_scale='Plasma')
-        fig_cities.update_layout(coloraxis_showscale=False)
-        st.plotly_chart(fig_cities, use_container_width=True)
-    else:
-        st.warning("City column missing")
-
-    # --- Top 5 Weather Conditions ---
-    st.subheader("Top 5 Weather Conditions During Accidents")
-    if 'Weather_Condition' in df.columns:
-        weather_counts = df['Weather_Condition'].value_counts().nlargest(5)
-        fig_weather = px.pie(names=weather_counts.index, values=weather_counts.values,
-                             title="Top 5 Weather Conditions During Accidents",
-                             color_discrete_sequence=px.colors.sequential.RdBu)
-        st.plotly_chart(fig_weather, use_container_width=True)
-    else:
-        st.warning("Weather_Condition column missing")
-
-    # --- Road Surface / Feature Conditions ---
-    st.subheader("Top 5 Road Surface / Feature Conditions in Accidents")
-    road_features = ['Bump', 'Crossing', 'Give_Way', 'Junction', 'No_Exit',
-                     'Railway', 'Roundabout', 'Station', 'Stop', 'Traffic_Calming',
-                     'Traffic_Signal', 'Turning_Loop']
-    existing_features = [feat for feat in road_features if feat in df.columns]
-
-    if existing_features:
-        feature_counts = {}
-        for feat in existing_features:
-            count = df[df[feat] == 1].shape[0] if df[feat].dtype != 'bool' else df[df[feat]].shape[0]
-            feature_counts[feat] = count
-        feature_series = pd.Series(feature_counts).sort_values(ascending=False).nlargest(5)
-
-        fig_features = px.bar(feature_series, x=feature_series.index, y=feature_series.values,
-                              labels={"x":"Road Feature", "y":"Accident Count"},
-                              title="Top 5 Road Surface / Feature Conditions",
-                              color=feature_series.values,
-                              color_continuous_scale='Turbo')
-        fig_features.update_layout(coloraxis_showscale=False)
-        st.plotly_chart(fig_features, use_container_width=True)
-    else:
-        st.info("Road surface / feature condition data not available in dataset.")
+        with st.spinner("Loading aggregate cube..."), phase("load"):
+            cube = load_cube(PREPROCESSED_PATH)
+            sketches = load_sketches(PREPROCESSED_PATH)
+            record_rows(cube_cells(cube))
+
+    # One placeholder per panel keeps the page order fixed while results arrive in any order
+    slots = []
+    for title, _, _ in PANELS:
+        st.subheader(title)
+        slots.append(st.empty())
+
+    # Panels are computed on worker threads and rendered (figure build included) as they finish,
+    # so "compute" spans the whole pool and each "render" is nested inside it
+    with phase("compute"), ThreadPoolExecutor(max_workers=len(PANELS)) as pool:
+        futures = {pool.submit(compute, cube, sketches, *args): (title, slot)
+                   for (title, compute, args), slot in zip(PANELS, slots)}
+        for future in as_completed(futures):
+            title, slot = futures[future]
+            with phase("render"):
+                render_panel(slot, title, future.result())
 
     st.caption("Patterns are from DV RoadSafe dataset's exploratory and spatial analyses.")
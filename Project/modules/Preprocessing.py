@@ -1,9 +1,22 @@
 import pandas as pd
 import streamlit as st
-from sklearn.linear_model import LinearRegression
+import os
 import time
+from hypothesis_stats import compute_insight_stats, INSIGHT_STATS_PARAMS
+from result_store import compute_in_background, save_result
+from aggregate_cube import build_cube, CUBE_PARAMS
+from heavy_hitters import update_sketches, SKETCH_PARAMS
+from column_profile import build_profiles, PROFILE_PARAMS
+from dataset_metadata import metadata_from_frame, write_metadata
+from data_quality import load_quality_report, projected_outcome
+from dataset_registry import write_column_store
+from filter_context import is_active
+from instrumentation import phase, record_rows
+from preprocessing_steps import (ENGINEERED_FEATURES, HIGH_MISSING_THRESHOLD, LOW_MISSING_THRESHOLD,
+                                 NON_ANALYTICAL_COLUMNS, REDUNDANT_COLUMNS, TRANSFORM_STEPS)
 
-def run():
+
+def run(ctx=None):
     """Preprocessing page - main entry point"""
     
     # =====================================================================
@@ -11,6 +24,8 @@ def run():
     # =====================================================================
     st.title("🧹 Data Preprocessing Pipeline")
     st.markdown("### Automated Data Cleaning & Feature Engineering")
+    if is_active(ctx):
+        st.caption("Global filters do not apply here; the pipeline always processes the full raw dataset.")
     st.markdown("---")
 
     # Configuration inputs
@@ -57,10 +72,47 @@ def run():
         | 15 | Save Data | Export preprocessed dataset |
         """
         st.markdown(overview_text)
-        
+
+        data_quality_section(DATA_PATH)
+
         st.info("👆 Click the **Start Preprocessing** button above to begin the pipeline")
 
 
+def data_quality_section(DATA_PATH):
+    """Data-quality report and projected pipeline outcome for the input file"""
+    st.markdown("### 🔎 Data Quality Report")
+    if not os.path.exists(DATA_PATH):
+        st.warning(f"Input file not found: {DATA_PATH}")
+        return
+    if not st.toggle("Profile input data", value=False,
+                     help="One parallel pass over the file; the report is stored until the file changes"):
+        return
+
+    with st.spinner("Profiling data quality..."):
+        report = load_quality_report(DATA_PATH)
+    outcome = projected_outcome(report, NON_ANALYTICAL_COLUMNS, REDUNDANT_COLUMNS, ENGINEERED_FEATURES,
+                                HIGH_MISSING_THRESHOLD, LOW_MISSING_THRESHOLD)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Rows", f"{report['rows']:,}")
+    col2.metric("Duplicate IDs", f"{report['duplicate_ids']:,}")
+    col3.metric("Invalid Severity", f"{report['invalid_severity']:,}")
+    col4.metric("Bad Coordinates", f"{int(report['out_of_range_coordinates'].sum()):,}")
+
+    unparseable = report["unparseable_timestamps"]
+    if unparseable.sum():
+        st.warning("Unparseable timestamps: " + ", ".join(f"{col} ({int(n):,})" for col, n in unparseable.items() if n))
+
+    st.dataframe(report["columns"], use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    col1.metric("Projected Rows", f"{outcome['rows']:,}", delta=f"{outcome['rows'] - report['rows']:,}")
+    col2.metric("Projected Columns", outcome["columns"],
+                delta=outcome["columns"] - len(report["columns"]))
+    if outcome["dropped_high_missing"]:
+        st.caption(f"Columns over {HIGH_MISSING_THRESHOLD}% missing: {', '.join(outcome['dropped_high_missing'])}")
+
+
 def run_preprocessing_pipeline(DATA_PATH, OUTPUT_PATH):
     """Main preprocessing pipeline function with animated step-by-step tracking"""
     
@@ -111,170 +163,40 @@ def run_preprocessing_pipeline(DATA_PATH, OUTPUT_PATH):
     try:
         # STEP 1: LOAD DATA
         update_progress(1, 15, "Loading data...", None)
-        df = pd.read_csv(DATA_PATH)
+        with phase("load"):
+            df = pd.read_csv(DATA_PATH)
+            record_rows(len(df))
         initial_shape = df.shape
+        write_metadata(DATA_PATH, metadata_from_frame(DATA_PATH, df))
         update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 1)
         update_progress(1, 15, "Data loaded successfully", df.shape)
 
-        # STEP 2: REMOVE DUPLICATES
-        update_progress(2, 15, "Removing duplicates...", None)
-        df = df.drop_duplicates(subset="ID")
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 2)
-        update_progress(2, 15, "Duplicates removed", df.shape)
-
-        # STEP 3: DROP HIGH MISSINGNESS COLUMNS (>30%)
-        update_progress(3, 15, "Analyzing missing values...", None)
-        missing_percent = round((df.isnull().sum() / df.shape[0]) * 100, 2)
-        remove_cols = missing_percent[missing_percent > 30].index.tolist()
-        df.drop(columns=remove_cols, inplace=True)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 3)
-        update_progress(3, 15, f"Dropped {len(remove_cols)} high-missingness columns", df.shape)
-
-        # STEP 4: DROP NON-ANALYTICAL COLUMNS
-        update_progress(4, 15, "Removing non-analytical columns...", None)
-        drop_cols = ["ID", "Source", "Description", "Street", "Country", 
-                     "Zipcode", "Timezone", "Airport_Code", "Amenity"]
-        drop_cols_existing = [col for col in drop_cols if col in df.columns]
-        df = df.drop(columns=drop_cols_existing)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 4)
-        update_progress(4, 15, f"Dropped {len(drop_cols_existing)} non-analytical columns", df.shape)
-
-        # STEP 5: PARSE AND VALIDATE TEMPORAL DATA
-        update_progress(5, 15, "Parsing temporal data...", None)
-        df["Start_Time"] = pd.to_datetime(df["Start_Time"], errors="coerce")
-        df["End_Time"] = pd.to_datetime(df["End_Time"], errors="coerce")
-        rows_before = len(df)
-        df = df.dropna(subset=["Start_Time", "End_Time"])
-        rows_dropped = rows_before - len(df)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 5)
-        update_progress(5, 15, f"Temporal data validated ({rows_dropped} invalid rows removed)", df.shape)
-
-        # STEP 6: VALIDATE GEOGRAPHIC DATA
-        update_progress(6, 15, "Validating geographic coordinates...", None)
-        df['Start_Lat'] = pd.to_numeric(df['Start_Lat'], errors='coerce')
-        df['Start_Lng'] = pd.to_numeric(df['Start_Lng'], errors='coerce')
-        rows_before = len(df)
-        df = df.dropna(subset=["Start_Lat", "Start_Lng"])
-        rows_dropped = rows_before - len(df)
-        df.rename(columns={'Start_Lat': 'Latitude', 'Start_Lng': 'Longitude'}, inplace=True)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 6)
-        update_progress(6, 15, f"Geographic data validated ({rows_dropped} invalid rows removed)", df.shape)
-
-        # STEP 7: FILTER SEVERITY CLASSES
-        update_progress(7, 15, "Filtering severity classes...", None)
-        rows_before = len(df)
-        df = df[df["Severity"].isin([1, 2, 3, 4])]
-        rows_dropped = rows_before - len(df)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 7)
-        update_progress(7, 15, f"Severity classes filtered ({rows_dropped} outliers removed)", df.shape)
-
-        # STEP 8: DROP ROWS WITH LOW MISSINGNESS (<3%)
-        update_progress(8, 15, "Handling low-missingness rows...", None)
-        missing_percent = (df.isnull().sum() / df.shape[0]) * 100
-        low_missing_cols = missing_percent[(missing_percent > 0) & (missing_percent <= 3)].index.tolist()
-        rows_before = len(df)
-        if low_missing_cols:
-            df.dropna(subset=low_missing_cols, inplace=True)
-        rows_dropped = rows_before - len(df)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 8)
-        update_progress(8, 15, f"Low-missingness rows dropped ({rows_dropped} rows removed)", df.shape)
-
-        # STEP 9: TARGETED WEATHER IMPUTATION
-        update_progress(9, 15, "Performing targeted weather imputation...", None)
-        imputation_count = 0
-        
-        if 'Wind_Speed(mph)' in df.columns and df['Wind_Speed(mph)'].isnull().any():
-            wind_median = df['Wind_Speed(mph)'].median()
-            count = df['Wind_Speed(mph)'].isnull().sum()
-            df['Wind_Speed(mph)'] = df['Wind_Speed(mph)'].fillna(wind_median)
-            imputation_count += count
-        
-        if 'Precipitation(in)' in df.columns and df['Precipitation(in)'].isnull().any():
-            count = df['Precipitation(in)'].isnull().sum()
-            df['Precipitation(in)'] = df['Precipitation(in)'].fillna(0.0)
-            imputation_count += count
-        
-        if 'Wind_Chill(F)' in df.columns and df['Wind_Chill(F)'].isnull().any():
-            reg_features = ['Wind_Speed(mph)', 'Temperature(F)', 'Humidity(%)']
-            if all(col in df.columns for col in reg_features):
-                known_wc = df[df['Wind_Chill(F)'].notna()]
-                unknown_wc = df[df['Wind_Chill(F)'].isna()]
-                if len(unknown_wc) > 0:
-                    X_train = known_wc[reg_features]
-                    y_train = known_wc['Wind_Chill(F)']
-                    reg = LinearRegression()
-                    reg.fit(X_train, y_train)
-                    X_pred = unknown_wc[reg_features]
-                    predicted_wc = reg.predict(X_pred)
-                    df.loc[df['Wind_Chill(F)'].isna(), 'Wind_Chill(F)'] = predicted_wc
-                    imputation_count += len(unknown_wc)
-        
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 9)
-        update_progress(9, 15, f"Weather imputation complete ({imputation_count:,} values imputed)", df.shape)
-
-        # STEP 10: GENERAL NUMERIC IMPUTATION
-        update_progress(10, 15, "General numeric imputation...", None)
-        num_cols = df.select_dtypes(include="number").columns.tolist()
-        imputed_cols = []
-        for col in num_cols:
-            if df[col].isnull().any():
-                df[col] = df[col].fillna(df[col].median())
-                imputed_cols.append(col)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 10)
-        update_progress(10, 15, f"General imputation complete ({len(imputed_cols)} columns)", df.shape)
-
-        # STEP 11: FEATURE ENGINEERING - TEMPORAL
-        update_progress(11, 15, "Creating temporal features...", None)
-        df["Duration_Minutes"] = (df["End_Time"] - df["Start_Time"]).dt.total_seconds() / 60
-        df['Year'] = df["Start_Time"].dt.year
-        df["Hour"] = df["Start_Time"].dt.hour
-        df["DayOfWeek"] = df["Start_Time"].dt.weekday
-        df["Month"] = df["Start_Time"].dt.month
-        df["IsWeekend"] = df["DayOfWeek"].isin([5, 6]).astype(int)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 11)
-        update_progress(11, 15, "Temporal features created (6 new features)", df.shape)
-
-        # STEP 12: FEATURE ENCODING - CATEGORICAL
-        update_progress(12, 15, "Encoding categorical features...", None)
-        bool_cols = ["Roundabout", "Station", "Stop", "Traffic_Calming", 
-                     "Traffic_Signal", "Turning_Loop"]
-        encoded_count = 0
-        for col in bool_cols:
-            if col in df.columns:
-                df[col] = df[col].astype(int)
-                encoded_count += 1
-        
-        if "Sunrise_Sunset" in df.columns:
-            df["IsDay"] = (df["Sunrise_Sunset"] == "Day").astype(int)
-            encoded_count += 1
-        
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 12)
-        update_progress(12, 15, f"Categorical encoding complete ({encoded_count} features)", df.shape)
-
-        # STEP 13: DROP REDUNDANT FEATURES
-        update_progress(13, 15, "Removing redundant features...", None)
-        redundant_cols = ["Start_Time", "End_Time", "Weather_Timestamp", 
-                          "Civil_Twilight", "Nautical_Twilight", 
-                          "Astronomical_Twilight", "Sunrise_Sunset"]
-        redundant_cols_existing = [col for col in redundant_cols if col in df.columns]
-        df = df.drop(columns=redundant_cols_existing)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 13)
-        update_progress(13, 15, f"Redundant features removed ({len(redundant_cols_existing)} columns)", df.shape)
-
-        # STEP 14: FINAL CLEANUP
-        update_progress(14, 15, "Final cleanup...", None)
-        rows_before = len(df)
-        df = df.dropna()
-        rows_dropped = rows_before - len(df)
-        update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 14)
-        update_progress(14, 15, f"Final cleanup complete ({rows_dropped} rows removed)", df.shape)
+        # STEPS 2-14: CLEANING, IMPUTATION AND FEATURE ENGINEERING
+        for step, (running_message, transform) in TRANSFORM_STEPS.items():
+            update_progress(step, 15, running_message, None)
+            df, message = transform(df)
+            update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), step)
+            update_progress(step, 15, message, df.shape)
 
         # STEP 15: SAVE PREPROCESSED DATA
         update_progress(15, 15, "Saving preprocessed data...", None)
-        df.to_csv(OUTPUT_PATH, index=False)
+        with phase("save"):
+            df.to_csv(OUTPUT_PATH, index=False)
+            record_rows(len(df))
         update_metrics(df.shape[0], df.shape[1], df.isnull().sum().sum(), 15)
         update_progress(15, 15, f"Data saved to {OUTPUT_PATH}", df.shape)
 
+        write_metadata(OUTPUT_PATH, metadata_from_frame(OUTPUT_PATH, df))
+        write_column_store(OUTPUT_PATH, df)
+
+        # Materialize the aggregate cube used by the summary pages
+        save_result("cube", OUTPUT_PATH, build_cube(df), CUBE_PARAMS)
+        save_result("sketches", OUTPUT_PATH, update_sketches({}, df), SKETCH_PARAMS)
+        save_result("profiles", OUTPUT_PATH, build_profiles(df), PROFILE_PARAMS)
+
+        # Refresh the stored insight statistics for the new dataset version without blocking the page
+        compute_in_background("insight_stats", OUTPUT_PATH, compute_insight_stats, INSIGHT_STATS_PARAMS)
+
         # FINAL SUMMARY
         progress_bar.progress(1.0)
         status_text.markdown("### ✅ Preprocessing Complete!")
@@ -2,43 +2,84 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from scipy.stats import gaussian_kde
+from column_profile import build_profiles, load_profiles
+from fast_kde import kde_from_grid
+from dataset_registry import query_dataset
+from filter_context import describe, is_active
+from instrumentation import phase, record_rows
+from result_store import dataset_fingerprint
 
-def run():
+PREPROCESSED_PATH = "data/US_Accidents_preprocessed.csv"
+
+
+@st.cache_data(show_spinner="Profiling the filtered data...", max_entries=16)
+def filtered_profiles(path, fingerprint, ctx):
+    return build_profiles(query_dataset(path, ctx))
+
+
+def profiled_rows(profiles):
+    """Rows the profiles describe (every column profile counts each row once, as value or null)."""
+    profile = next(iter(profiles.values()), None)
+    return profile["count"] + profile["null_count"] if profile else 0
+
+
+def run(ctx=None):
     st.header("Univariate Analysis")
-    df = pd.read_csv("data/US_Accidents_preprocessed.csv")
+    # Per-column profiles are computed once after preprocessing; only bins and counts reach the browser
+    if is_active(ctx):
+        with phase("filter"):
+            profiles = filtered_profiles(PREPROCESSED_PATH, dataset_fingerprint(PREPROCESSED_PATH), ctx)
+            record_rows(profiled_rows(profiles))
+        st.caption(describe(ctx))
+    else:
+        with st.spinner("Loading column profiles..."), phase("load"):
+            profiles = load_profiles(PREPROCESSED_PATH)
+            record_rows(profiled_rows(profiles))
 
     # Select column without default selection
-    col = st.selectbox("Select Column", options=["--Choose a column--"] + list(df.columns))
+    col = st.selectbox("Select Column", options=["--Choose a column--"] + list(profiles))
     if col == "--Choose a column--":
         st.info("Please select a column to analyze.")
         return
 
-    is_numeric = pd.api.types.is_numeric_dtype(df[col])
+    profile = profiles[col]
+    is_numeric = profile["numeric"] and "bin_counts" in profile
 
     if is_numeric:
         # Numerical column: plot histogram with optional KDE
         show_kde = st.checkbox("Include KDE plot in histogram", value=False)
 
-        fig = px.histogram(df, x=col, nbins=30, title=f"Histogram of {col}")
+        with phase("figure build"):
+            edges = profile["bin_edges"]
+            centers = (edges[:-1] + edges[1:]) / 2
+            bin_width = edges[1] - edges[0]
+            fig = px.bar(x=centers, y=profile["bin_counts"], title=f"Histogram of {col}",
+                         labels={"x": col, "y": "count"})
+            fig.update_traces(width=bin_width)
+            fig.update_layout(bargap=0)
+
+            if show_kde and "kde_grid" in profile:
+                # KDE from the profile's binned grid (same bandwidth rule as scipy's gaussian_kde)
+                grid = profile["kde_grid"]
+                x_vals = np.linspace(profile["min"], profile["max"], 200)
+                y_vals = kde_from_grid(grid["counts"], grid["lo"], grid["dx"], grid["bandwidth"], x_vals)
+                y_vals_scaled = y_vals * profile["count"] * bin_width
+                # Add KDE line trace on histogram
+                fig.add_scatter(x=x_vals, y=y_vals_scaled, mode='lines', name='KDE', line=dict(color='red'))
 
-        if show_kde:
-            # Calculate KDE values manually
-            data_series = df[col].dropna()
-            kde = gaussian_kde(data_series)
-            x_min, x_max = data_series.min(), data_series.max()
-            x_vals = np.linspace(x_min, x_max, 200)
-            y_vals = kde(x_vals)
-            bin_width = (x_max - x_min) / 30
-            y_vals_scaled = y_vals * len(data_series) * bin_width
-            # Add KDE line trace on histogram
-            fig.add_scatter(x=x_vals, y=y_vals_scaled, mode='lines', name='KDE', line=dict(color='red'))
+        with phase("render"):
+            st.plotly_chart(fig, use_container_width=True)
 
-        st.plotly_chart(fig, use_container_width=True)
+        stats = pd.Series({"min": profile["min"], "max": profile["max"], "mean": profile["mean"],
+                           "std": profile["std"], "nulls": profile["null_count"]})
+        quantiles = profile["quantiles"].rename(lambda q: f"p{int(q * 100)}")
+        st.dataframe(pd.concat([stats, quantiles]).to_frame(col).T, use_container_width=True)
 
     else:
         # Categorical column: plot top 10 counts bar chart
-        counts = df[col].value_counts().nlargest(10)
-        fig = px.bar(counts, x=counts.index.astype(str), y=counts.values,
-                     title=f"Top 10 counts of {col}", labels={col: col, "y": "Count"})
-        st.plotly_chart(fig, use_container_width=True)
+        with phase("figure build"):
+            counts = profile["top_values"].nlargest(10)
+            fig = px.bar(counts, x=counts.index.astype(str), y=counts.values,
+                         title=f"Top 10 counts of {col}", labels={col: col, "y": "Count"})
+        with phase("render"):
+            st.plotly_chart(fig, use_container_width=True)
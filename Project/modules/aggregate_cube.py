@@ -0,0 +1,109 @@
+import pandas as pd
+from indicators import INDICATOR_COLUMNS, existing_indicators, indicator_block, indicator_counts
+from result_store import get_or_compute
+
+# Marginal tables of the cube: name -> dimensions it is grouped by ("Total" is the single all-rows cell)
+CUBE_MARGINALS = {
+    "Total": [],
+    "State": ["State"],
+    "City": ["City"],
+    "Hour": ["Hour"],
+    "Weather_Condition": ["Weather_Condition"],
+    "Severity": ["Severity"],
+    "Period": ["Year", "Month"],
+}
+CUBE_DIMENSIONS = ["State", "City", "Year", "Month", "Hour", "Weather_Condition", "Severity"]
+
+# Parameters that define the stored cube; changing them invalidates stored cubes
+CUBE_PARAMS = {"version": 3, "marginals": CUBE_MARGINALS, "indicators": INDICATOR_COLUMNS}
+
+
+def cube_columns(columns):
+    """Columns of `columns` the cube is built from (dimensions and indicator columns)."""
+    return [c for c in CUBE_DIMENSIONS if c in columns] + existing_indicators(columns)
+
+
+def _marginal(data, dims, measures):
+    if not dims:
+        return data[measures].sum().to_frame().T.reset_index(drop=True)
+    return data.groupby(dims, observed=True, dropna=False, sort=False)[measures].sum().reset_index()
+
+
+def build_cube(df):
+    """Per-dimension marginal tables of accident counts: a dict of small DataFrames keyed as `CUBE_MARGINALS`.
+
+    Each table holds one row per value of its dimensions with the accident count and the
+    number of those accidents flagged by each indicator column (road features, IsWeekend,
+    IsDay). Marginals whose dimensions `df` lacks are left out. The tables only answer
+    unfiltered questions; filtered views rebuild the cube from the matching rows.
+    """
+    features = existing_indicators(df.columns)
+    data = df[[c for c in CUBE_DIMENSIONS if c in df.columns]].copy()
+    data[features] = indicator_block(df, features).astype("int32")
+    data["count"] = 1
+    measures = ["count"] + features
+    cube = {}
+    for name, dims in CUBE_MARGINALS.items():
+        if not dims:
+            # The all-rows cell: indicator totals from one column-sum over the block
+            table = pd.Series({"count": len(data), **indicator_counts(data, features)}).to_frame().T
+        elif set(dims) <= set(data.columns):
+            table = _marginal(data, dims, measures)
+        else:
+            continue
+        cube[name] = _compact(table)
+    return cube
+
+
+def _compact(table):
+    """Store string dimensions as categoricals, integer dimensions downcast and counts as 32-bit integers."""
+    for col in table.columns:
+        if col not in CUBE_DIMENSIONS:
+            table[col] = table[col].astype("int32")
+        elif table[col].dtype == object or pd.api.types.is_string_dtype(table[col]):
+            table[col] = table[col].astype("category")
+        elif pd.api.types.is_integer_dtype(table[col]):
+            table[col] = pd.to_numeric(table[col], downcast="integer")
+    return table
+
+
+def _merge_cubes(parts):
+    """Sum the marginal tables of cubes built from disjoint row sets."""
+    merged = {}
+    for name in parts[0]:
+        dims = CUBE_MARGINALS[name]
+        tables = [part[name].astype({col: object for col in dims
+                                     if isinstance(part[name][col].dtype, pd.CategoricalDtype)})
+                  for part in parts]
+        table = pd.concat(tables, ignore_index=True)
+        measures = [c for c in table.columns if c not in dims]
+        merged[name] = _compact(_marginal(table, dims, measures))
+    return merged
+
+
+def build_cube_from_csv(path, chunksize=1_000_000):
+    """Build the cube from a preprocessed CSV in chunks, reading only the cube columns."""
+    header = pd.read_csv(path, nrows=0).columns
+    parts = [build_cube(chunk)
+             for chunk in pd.read_csv(path, usecols=cube_columns(header), chunksize=chunksize)]
+    if not parts:
+        return build_cube(pd.DataFrame(columns=cube_columns(header)))
+    return _merge_cubes(parts)
+
+
+def load_cube(path):
+    """The stored cube for the current version of `path`, building it from the CSV if missing."""
+    return get_or_compute("cube", path, build_cube_from_csv, CUBE_PARAMS)
+
+
+def cube_total(cube, dimension, values=None):
+    """Accident counts per value of one cube dimension, optionally only for the given `values`."""
+    table = cube[dimension]
+    if values is not None:
+        table = table[table[dimension].isin(values)]
+    return table.groupby(dimension, observed=True)["count"].sum()
+
+
+def cube_cells(cube):
+    """Total number of rows over all marginal tables of `cube`."""
+    return sum(len(table) for table in cube.values())
@@ -0,0 +1,281 @@
+import numpy as np
+from datetime import datetime
+from aggregate_cube import build_cube, cube_columns, cube_total
+from dataset_registry import query_dataset
+from heavy_hitters import top_n
+from hypothesis_stats import (VISIBILITY_LABELS, group_mean, pearson_from_moments, road_feature_tests,
+                              ttest_from_moments)
+from indicators import ROAD_FEATURES, existing_indicators, indicator_block
+from query_engine import crosstabs, decoded
+from resampling import bootstrap_ci, permutation_test
+
+# Headless analytics behind the pages: no Streamlit or Plotly calls, results are frames,
+# arrays and dicts. Pages add caching, build the figures and render them; benchmarks and
+# batch jobs call them directly.
+
+KMS_PER_RADIAN = 6371.0088
+
+# Numeric features offered in the Comparative Analysis scatter matrix view
+SPLOM_FEATURES = ["Temperature(F)", "Humidity(%)", "Pressure(in)",
+                  "Visibility(mi)", "Wind_Speed(mph)", "Duration_Minutes"]
+
+
+# -----------------------------------------------------------
+# Geospatial hotspots
+# -----------------------------------------------------------
+def hotspot_clusters(points, eps_km=1.0, min_samples=5):
+    """DBSCAN hotspots of accident `points` (latitude/longitude columns) under haversine distance.
+
+    Returns one row per cluster with its accident count and mean position; empty when
+    every point is noise.
+    """
+    # scikit-learn is only needed for hotspot clustering
+    from sklearn.cluster import DBSCAN
+    radians_coords = np.radians(points[['latitude', 'longitude']].to_numpy())
+    db = DBSCAN(eps=eps_km / KMS_PER_RADIAN, min_samples=min_samples, algorithm='ball_tree', metric='haversine')
+    clustered = points.assign(cluster=db.fit_predict(radians_coords))
+    clusters = clustered[clustered['cluster'] != -1]
+    return clusters.groupby('cluster').agg(
+        accident_count=('cluster', 'count'),
+        latitude=('latitude', 'mean'),
+        longitude=('longitude', 'mean')
+    ).reset_index()
+
+
+# -----------------------------------------------------------
+# Associations between features
+# -----------------------------------------------------------
+def cramers_v(confusion_matrix):
+    """Calculate Cramér's V statistic for categorical-categorical association from a contingency table."""
+    from scipy.stats import chi2_contingency
+    chi2 = chi2_contingency(confusion_matrix)[0]
+    n = confusion_matrix.sum().sum()
+    phi2 = chi2 / n
+    r, k = confusion_matrix.shape
+    phi2corr = max(0, phi2 - ((k - 1)*(r - 1)) / (n - 1))
+    rcorr = r - ((r - 1)**2) / (n - 1)
+    kcorr = k - ((k - 1)**2) / (n - 1)
+    if rcorr == 0 or kcorr == 0:
+        return np.nan
+    return np.sqrt(phi2corr / min((kcorr -1), (rcorr -1)))
+
+
+def cramers_v_matrix(path, features, ctx=None):
+    """Cramér's V for every pair of `features` over the rows of `path` matching `ctx`.
+
+    The statistic is symmetric, so each pair's contingency table is computed once, all from
+    one read of the needed columns (by the configured aggregation engine); undefined values
+    are reported as 0.
+    """
+    n = len(features)
+    pair_i, pair_j = np.triu_indices(n, 1)
+    tables = crosstabs(path, [(features[i], features[j]) for i, j in zip(pair_i, pair_j)], ctx)
+    matrix = np.eye(n)
+    for i, j in zip(pair_i, pair_j):
+        val = cramers_v(tables[features[i], features[j]])
+        matrix[i, j] = matrix[j, i] = 0 if np.isnan(val) else val
+    return matrix
+
+
+def pairwise_histograms(path, features, ctx=None, bins=40, chunk_rows=1_000_000):
+    """Compute 1D and pairwise 2D histograms for `features` with one shared set of bin edges per feature.
+
+    Edges span the 0.5-99.5 percentile range of each feature (outliers fall into the
+    edge bins), so every pair that involves a feature uses the same bins. All pairs are
+    counted together with a single `np.bincount` over combined pair/bin codes per chunk.
+    """
+    features = list(features)
+    data = query_dataset(path, ctx, features).to_numpy(dtype=np.float32)
+    k = len(features)
+
+    lo = np.nanpercentile(data, 0.5, axis=0)
+    hi = np.nanpercentile(data, 99.5, axis=0)
+    hi = np.where(hi > lo, hi, lo + 1.0)
+    edges = [np.linspace(lo[f], hi[f], bins + 1) for f in range(k)]
+
+    pair_i, pair_j = np.triu_indices(k, 1)
+    n_pairs = len(pair_i)
+    hist1d = np.zeros((k, bins), dtype=np.int64)
+    hist2d = np.zeros(n_pairs * bins * bins, dtype=np.int64)
+
+    for start in range(0, len(data), chunk_rows):
+        block = data[start:start + chunk_rows]
+        idx = np.floor((block - lo) / (hi - lo) * bins)
+        valid = ~np.isnan(idx)
+        idx = np.clip(np.nan_to_num(idx), 0, bins - 1).astype(np.int64)
+
+        for f in range(k):
+            hist1d[f] += np.bincount(idx[valid[:, f], f], minlength=bins)
+
+        codes = (np.arange(n_pairs) * bins * bins
+                 + idx[:, pair_i] * bins + idx[:, pair_j])
+        pair_valid = valid[:, pair_i] & valid[:, pair_j]
+        hist2d += np.bincount(codes[pair_valid], minlength=n_pairs * bins * bins)
+
+    matrix = np.zeros((k, k, bins, bins), dtype=np.int64)
+    hist2d = hist2d.reshape(n_pairs, bins, bins)
+    matrix[pair_i, pair_j] = hist2d
+    matrix[pair_j, pair_i] = hist2d.transpose(0, 2, 1)
+
+    return {"features": features, "edges": edges, "hist1d": hist1d, "hist2d": matrix}
+
+
+# -----------------------------------------------------------
+# Insight tests
+# -----------------------------------------------------------
+def insight_results(stats):
+    """Results of insights 1-8 from the sufficient statistics of `compute_insight_stats`.
+
+    p-values are None where a test lacks data; `road_features` is the table of
+    `road_feature_tests`.
+    """
+    from scipy.stats import chi2_contingency
+    weather = stats["weather"]
+    hourly = stats["hourly"]
+    hours = hourly.index.to_series()
+    has_clear_and_rain = "Clear" in weather.index and "Rain" in weather.index
+    return {
+        "weather_severity": group_mean(weather).rename("Severity").sort_values(ascending=False).head(10),
+        "clear_vs_rain_p": (ttest_from_moments(weather.loc["Clear"], weather.loc["Rain"])[1]
+                            if has_clear_and_rain else None),
+        "hourly": hourly,
+        "rush_hour_count": int(hourly[hours.between(7, 9)].sum()),
+        "night_count": int(hourly[hours.between(0, 3)].sum()),
+        "temperature_severity": group_mean(stats["temp_bins"]).rename("Severity").sort_index(),
+        # Feature -> (Pearson r, p-value) against Severity
+        "correlations": {col: pearson_from_moments(acc) for col, acc in stats["pearson"].items()},
+        "visibility": stats["visibility"].reindex(VISIBILITY_LABELS),
+        "low_visibility_p": chi2_contingency(stats["low_visibility"])[1],
+        "rain_counts": stats["rain"].sum(axis=1).rename("count"),
+        "rain_p": chi2_contingency(stats["rain"])[1],
+        "road_features": road_feature_tests(stats),
+    }
+
+
+def _split(d, mask):
+    return d.loc[mask, "Severity"], d.loc[~mask, "Severity"]
+
+
+def _paired(d, col):
+    d = d.dropna(subset=[col, "Severity"])
+    return d[col], d["Severity"]
+
+
+# Resampling checks: label -> (kind, columns needed, function building the two samples from a row sample)
+RESAMPLING_CHECKS = {
+    "Insight 1: Clear vs Rain severity": (
+        "two_sample", ["Weather_Condition", "Severity"],
+        lambda d: (d.loc[d["Weather_Condition"] == "Clear", "Severity"],
+                   d.loc[d["Weather_Condition"] == "Rain", "Severity"])),
+    "Insight 3: Temperature vs Severity": (
+        "correlation", ["Temperature(F)", "Severity"], lambda d: _paired(d, "Temperature(F)")),
+    "Insight 4: Low visibility (<2mi) vs other severity": (
+        "two_sample", ["Visibility(mi)", "Severity"], lambda d: _split(d, d["Visibility(mi)"] <= 2)),
+    "Insight 5: Rain vs no rain severity": (
+        "two_sample", ["Weather_Condition", "Severity"],
+        lambda d: _split(d, d["Weather_Condition"].str.lower().str.contains("rain", na=False))),
+    "Insight 6: Humidity vs Severity": (
+        "correlation", ["Humidity(%)", "Severity"], lambda d: _paired(d, "Humidity(%)")),
+    "Insight 7: Pressure vs Severity": (
+        "correlation", ["Pressure(in)", "Severity"], lambda d: _paired(d, "Pressure(in)")),
+}
+for _feat in ROAD_FEATURES:
+    RESAMPLING_CHECKS[f"Insight 8: {_feat} vs no {_feat}"] = (
+        "two_sample", [_feat, "Severity"], lambda d, f=_feat: _split(d, indicator_block(d, [f])[:, 0]))
+
+
+def resampling_validation(sample, check, time_budget=20, min_count=10):
+    """Permutation test and bootstrap interval of a RESAMPLING_CHECKS entry on a row sample.
+
+    The time budget is split evenly between the two; returns None when either group has
+    fewer than `min_count` sampled rows.
+    """
+    kind, _, build_samples = RESAMPLING_CHECKS[check]
+    a, b = build_samples(sample)
+    if len(a) < min_count or len(b) < min_count:
+        return None
+    return {"kind": kind, "rows": len(a) + len(b),
+            "permutation": permutation_test(a, b, kind=kind, time_budget=time_budget / 2),
+            "bootstrap": bootstrap_ci(a, b, kind=kind, time_budget=time_budget / 2)}
+
+
+# -----------------------------------------------------------
+# Summaries
+# -----------------------------------------------------------
+def severity_summary(counts):
+    """Average severity and the number of accidents at or above each level 1-4, from per-level counts."""
+    total = counts.sum()
+    return {"average": round((counts.index * counts).sum() / total, 2) if total else 0,
+            "at_least": counts.reindex(range(1, 5), fill_value=0)[::-1].cumsum()[::-1]}
+
+
+def context_cube(path, ctx):
+    """Aggregate cube (see `build_cube`) of the rows of `path` matching `ctx`, read from the column store."""
+    columns = cube_columns(query_dataset(path).columns)
+    return build_cube(decoded(query_dataset(path, ctx, columns)))
+
+
+def top_values(cube, sketches, column, n=5):
+    """Exact top-`n` values of a cube dimension, recounting only the sketch's candidates when available."""
+    if column not in sketches:
+        return cube_total(cube, column).nlargest(n)
+    return top_n(sketches[column], n, lambda keys: cube_total(cube, column, keys))
+
+
+def dashboard_summary(cube):
+    """Total accidents, peak hour, high-severity count and weekend/daylight shares of an aggregate cube.
+
+    Entries are None when the cube lacks the columns they need.
+    """
+    totals = cube['Total'].iloc[0]
+    total = int(totals['count'])
+    result = {"total": total, "peak_hour": None, "high_severity": None, "shares": None}
+    if 'Hour' in cube:
+        peak_hour = cube_total(cube, 'Hour').idxmax()
+        result["peak_hour"] = datetime.strptime(str(peak_hour), "%H").strftime("%I %p").lstrip('0')
+    if 'Severity' in cube:
+        severity = cube['Severity']
+        result["high_severity"] = int(severity.loc[severity["Severity"] >= 3, "count"].sum())
+    time_flags = existing_indicators(totals.index, ["IsWeekend", "IsDay"])
+    if time_flags:
+        result["shares"] = totals[time_flags].astype(float) / max(total, 1) * 100
+    return result
+
+
+def road_feature_counts(cube, n=5):
+    """Accident counts of the `n` road features present in most accidents (empty without feature columns)."""
+    totals = cube['Total'].iloc[0]
+    existing_features = existing_indicators(totals.index, ROAD_FEATURES)
+    return totals[existing_features].astype(int).sort_values(ascending=False).nlargest(n)
+
+
+# -----------------------------------------------------------
+# Key Findings dashboard panels (safe to run on worker threads)
+# -----------------------------------------------------------
+def summary_panel(cube, sketches):
+    """Total accidents, peak hour, high-severity count and weekend/daylight shares."""
+    return {"kind": "summary", **dashboard_summary(cube)}
+
+
+def top_values_panel(cube, sketches, column):
+    """Counts of the five most frequent values of a cube dimension."""
+    if column not in cube:
+        return {"kind": "warning", "message": f"{column} column missing"}
+    return {"kind": "counts", "counts": top_values(cube, sketches, column)}
+
+
+def road_feature_panel(cube, sketches):
+    """Accident counts of the five road features present in most accidents."""
+    feature_series = road_feature_counts(cube)
+    if feature_series.empty:
+        return {"kind": "info", "message": "Road surface / feature condition data not available in dataset."}
+    return {"kind": "counts", "counts": feature_series}
+
+
+PANELS = [
+    ("Summary Metrics", summary_panel, ()),
+    ("Top 5 Accident-Prone States", top_values_panel, ('State',)),
+    ("Top 5 Accident-Prone Cities", top_values_panel, ('City',)),
+    ("Top 5 Weather Conditions During Accidents", top_values_panel, ('Weather_Condition',)),
+    ("Top 5 Road Surface / Feature Conditions in Accidents", road_feature_panel, ()),
+]
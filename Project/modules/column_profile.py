@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from fast_kde import scott_bandwidth, grid_spacing, linear_bin
+from result_store import get_or_compute
+
+HISTOGRAM_BINS = 30
+TOP_VALUES = 100
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+# Parameters that define stored profiles; changing them invalidates stored profiles
+PROFILE_PARAMS = {"version": 1, "bins": HISTOGRAM_BINS, "top_values": TOP_VALUES, "quantiles": QUANTILES}
+
+
+def profile_column(series, bins=HISTOGRAM_BINS, top=TOP_VALUES):
+    """Summary of one column: null count, top value counts and, for numeric columns,
+    range/mean/quantiles, histogram bins and a fine KDE grid."""
+    profile = {
+        "dtype": str(series.dtype),
+        "numeric": pd.api.types.is_numeric_dtype(series),
+        "count": int(series.notna().sum()),
+        "null_count": int(series.isna().sum()),
+        "n_unique": int(series.nunique()),
+        "top_values": series.value_counts().head(top),
+    }
+    if not profile["numeric"] or profile["count"] == 0:
+        return profile
+
+    values = series.dropna().to_numpy(dtype=float)
+    counts, edges = np.histogram(values, bins=bins)
+    std = values.std(ddof=1) if len(values) > 1 else 0.0
+    profile.update({
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": float(values.mean()),
+        "std": float(std),
+        "quantiles": pd.Series(np.quantile(values, QUANTILES), index=QUANTILES),
+        "bin_edges": edges,
+        "bin_counts": counts,
+    })
+
+    # Linear-binned fine grid, enough to draw the KDE later without touching row data
+    bandwidth = scott_bandwidth(len(values), std)
+    if bandwidth > 0:
+        lo, hi = profile["min"], profile["max"]
+        dx = grid_spacing(lo, hi, bandwidth)
+        size = int(np.floor((hi - lo) / dx)) + 2
+        profile["kde_grid"] = {"counts": linear_bin(values, lo, dx, size).astype(np.float32),
+                               "lo": lo, "dx": dx, "bandwidth": bandwidth}
+    return profile
+
+
+def build_profiles(df):
+    """Profiles of every column of a DataFrame, in column order."""
+    return {col: profile_column(df[col]) for col in df.columns}
+
+
+def build_profiles_from_csv(path):
+    """Profiles of every column of a CSV file."""
+    return build_profiles(pd.read_csv(path))
+
+
+def load_profiles(path):
+    """The stored profiles for the current version of `path`, building them from the CSV if missing."""
+    return get_or_compute("profiles", path, build_profiles_from_csv, PROFILE_PARAMS)
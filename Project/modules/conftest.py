@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def accident_csv(tmp_path, monkeypatch):
+    """Small preprocessed-style dataset at data/accidents.csv, with a temporary directory as working directory.
+
+    Returns the path and the frame as read back from the CSV.
+    """
+    rng = np.random.default_rng(42)
+    n = 5_000
+    df = pd.DataFrame({
+        "ID": np.arange(n),
+        "Severity": rng.choice([1, 2, 3, 4], n, p=[0.05, 0.7, 0.2, 0.05]),
+        "State": rng.choice(["CA", "TX", "FL", "NY", "OH", "WA"], n),
+        "City": rng.choice(["Springfield", "Riverside", "Fairview", "Madison", "Georgetown"], n),
+        "Year": rng.integers(2016, 2024, n),
+        "Month": rng.integers(1, 13, n),
+        "Hour": rng.integers(0, 24, n),
+        "Weather_Condition": rng.choice(["Clear", "Rain", "Fog", "Snow", None], n),
+        "Temperature(F)": rng.normal(60, 20, n).round(1),
+        "Visibility(mi)": rng.exponential(6, n).round(1),
+        "Crossing": rng.random(n) < 0.2,
+        "Traffic_Signal": rng.random(n) < 0.3,
+        "IsWeekend": rng.random(n) < 0.28,
+    })
+    df.loc[rng.random(n) < 0.05, "Temperature(F)"] = np.nan
+
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data")
+    path = "data/accidents.csv"
+    df.to_csv(path, index=False)
+    return path, pd.read_csv(path)
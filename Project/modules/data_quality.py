@@ -0,0 +1,264 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from preprocessing_steps import parse_timestamps, timestamp_format
+from result_store import get_or_compute
+
+COORDINATE_RANGES = {"Start_Lat": (-90, 90), "End_Lat": (-90, 90),
+                     "Start_Lng": (-180, 180), "End_Lng": (-180, 180)}
+VALID_SEVERITIES = [1, 2, 3, 4]
+TIMESTAMP_COLUMNS = ["Start_Time", "End_Time", "Weather_Timestamp"]
+# Exact distinct counts are tracked up to this many values per column
+CARDINALITY_CAP = 100_000
+# Bits per word when encoding each row's null pattern as integers
+_PATTERN_BITS = 62
+
+
+class _RangeReader(io.RawIOBase):
+    """Read-only view of the byte range [start, end) of a file."""
+
+    def __init__(self, path, start, end):
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._file.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _byte_ranges(path, parts):
+    """Split the data lines of a CSV into about `parts` byte ranges that start at line boundaries.
+
+    Assumes records do not contain embedded newlines (true for the US Accidents export).
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()
+        data_start = f.tell()
+        bounds = [data_start]
+        for i in range(1, parts):
+            f.seek(max(data_start + (size - data_start) * i // parts, bounds[-1]))
+            f.readline()
+            if f.tell() >= size:
+                break
+            if f.tell() > bounds[-1]:
+                bounds.append(f.tell())
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _null_patterns(nulls):
+    """Counts of distinct per-row null patterns, each encoded as a tuple of integer words."""
+    k = nulls.shape[1]
+    words = []
+    for start in range(0, k, _PATTERN_BITS):
+        block = nulls[:, start:start + _PATTERN_BITS].astype(np.int64)
+        words.append(block @ (np.int64(1) << np.arange(block.shape[1], dtype=np.int64)))
+    if not words:
+        return pd.Series(dtype="int64")
+    return pd.DataFrame(np.column_stack(words)).value_counts()
+
+
+def _timestamp_formats(path, names, chunksize):
+    """Timestamp format of each timestamp column, inferred from its first non-null value in the file."""
+    columns = [c for c in TIMESTAMP_COLUMNS if c in names]
+    formats = {}
+    if columns:
+        for chunk in pd.read_csv(path, usecols=columns, dtype=str, chunksize=chunksize):
+            for col in columns:
+                if col not in formats and chunk[col].notna().any():
+                    formats[col] = timestamp_format(chunk[col])
+            if len(formats) == len(columns):
+                break
+    return formats
+
+
+def _profile_range(path, start, end, names, chunksize, formats):
+    """Partial profile of one byte range; partial results are merged by `_merge`.
+
+    Timestamps are parsed as the pipeline parses them, with the `formats` of the whole file.
+    """
+    part = {"rows": 0, "nulls": pd.Series(0, index=names, dtype="int64"), "dtypes": {c: set() for c in names},
+            "ids": [], "invalid_severity": 0, "unparseable_timestamps": pd.Series(dtype="int64"),
+            "out_of_range": pd.Series(dtype="int64"), "numeric": {}, "distinct": {}, "patterns": None}
+    reader = io.BufferedReader(_RangeReader(path, start, end), buffer_size=1 << 20)
+    with reader:
+        for chunk in pd.read_csv(reader, header=None, names=names, chunksize=chunksize, low_memory=False):
+            part["rows"] += len(chunk)
+            nulls = chunk.isna()
+            part["nulls"] += nulls.sum()
+            patterns = _null_patterns(nulls.to_numpy())
+            part["patterns"] = patterns if part["patterns"] is None else part["patterns"].add(patterns, fill_value=0)
+
+            if "ID" in chunk:
+                part["ids"].append(pd.util.hash_pandas_object(chunk["ID"].dropna(), index=False).to_numpy())
+            if "Severity" in chunk:
+                severity = pd.to_numeric(chunk["Severity"], errors="coerce")
+                part["invalid_severity"] += int((~severity.isin(VALID_SEVERITIES)).sum())
+            for col in TIMESTAMP_COLUMNS:
+                if col in chunk:
+                    raw = chunk[col].dropna().astype(str)
+                    parsed = parse_timestamps(raw, formats.get(col))
+                    part["unparseable_timestamps"] = part["unparseable_timestamps"].add(
+                        pd.Series({col: int(parsed.isna().sum())}), fill_value=0)
+            for col, (low, high) in COORDINATE_RANGES.items():
+                if col in chunk:
+                    values = pd.to_numeric(chunk[col], errors="coerce")
+                    bad = int((values.isna() & chunk[col].notna()).sum() + ((values < low) | (values > high)).sum())
+                    part["out_of_range"] = part["out_of_range"].add(pd.Series({col: bad}), fill_value=0)
+
+            for col in names:
+                series = chunk[col]
+                part["dtypes"][col].add(str(series.dtype))
+                if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                    values = series.dropna()
+                    if len(values):
+                        acc = part["numeric"].setdefault(col, {"min": np.inf, "max": -np.inf, "sum": 0.0, "count": 0})
+                        acc["min"] = min(acc["min"], float(values.min()))
+                        acc["max"] = max(acc["max"], float(values.max()))
+                        acc["sum"] += float(values.sum())
+                        acc["count"] += len(values)
+                distinct = part["distinct"].get(col)
+                if distinct is None or len(distinct) <= CARDINALITY_CAP:
+                    hashes = np.unique(pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy())
+                    part["distinct"][col] = hashes if distinct is None else np.union1d(distinct, hashes)
+    part["ids"] = np.concatenate(part["ids"]) if part["ids"] else np.array([], dtype=np.uint64)
+    return part
+
+
+def _combined_dtype(dtypes):
+    if not dtypes:
+        return "empty"
+    if len(dtypes) == 1:
+        return next(iter(dtypes))
+    if all(d.startswith(("int", "float")) for d in dtypes):
+        return "float64"
+    return "object"
+
+
+def _sum_series(series):
+    total = pd.Series(dtype="int64")
+    for s in series:
+        total = total.add(s, fill_value=0)
+    return total.astype("int64")
+
+
+def _merge(parts, names):
+    rows = sum(p["rows"] for p in parts)
+    nulls = sum((p["nulls"] for p in parts), pd.Series(0, index=names, dtype="int64"))
+    ids = np.concatenate([p["ids"] for p in parts]) if parts else np.array([], dtype=np.uint64)
+    patterns = None
+    for p in parts:
+        if p["patterns"] is not None:
+            patterns = p["patterns"] if patterns is None else patterns.add(p["patterns"], fill_value=0)
+
+    columns = []
+    for col in names:
+        dtype = _combined_dtype(set().union(*(p["dtypes"][col] for p in parts)))
+        distinct = [p["distinct"][col] for p in parts if col in p["distinct"]]
+        merged = np.unique(np.concatenate(distinct)) if distinct else np.array([])
+        numeric = [p["numeric"][col] for p in parts if col in p["numeric"]]
+        count = sum(n["count"] for n in numeric)
+        columns.append({
+            "column": col,
+            "dtype": dtype,
+            "nulls": int(nulls[col]),
+            "null_pct": round(nulls[col] / rows * 100, 2) if rows else 0.0,
+            "cardinality": min(len(merged), CARDINALITY_CAP),
+            "cardinality_capped": len(merged) > CARDINALITY_CAP,
+            "min": min(n["min"] for n in numeric) if numeric else None,
+            "max": max(n["max"] for n in numeric) if numeric else None,
+            "mean": sum(n["sum"] for n in numeric) / count if count else None,
+        })
+
+    return {
+        "rows": rows,
+        "columns": pd.DataFrame(columns).set_index("column"),
+        "duplicate_ids": int(len(ids) - len(np.unique(ids))),
+        "invalid_severity": sum(p["invalid_severity"] for p in parts),
+        "unparseable_timestamps": _sum_series(p["unparseable_timestamps"] for p in parts),
+        "out_of_range_coordinates": _sum_series(p["out_of_range"] for p in parts),
+        "null_patterns": patterns if patterns is not None else pd.Series(dtype="int64"),
+    }
+
+
+def profile_dataset(path, n_jobs=None, chunksize=200_000):
+    """Data-quality report for a CSV from one chunked pass split across parallel workers.
+
+    Covers null counts, duplicate IDs, out-of-range coordinates, invalid severities,
+    unparseable timestamps, and per-column dtype, cardinality and value range. Each worker
+    parses its own byte range of the file; the partial results are merged at the end.
+    """
+    names = list(pd.read_csv(path, nrows=0).columns)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    ranges = _byte_ranges(path, n_jobs)
+    formats = _timestamp_formats(path, names, chunksize)
+    if n_jobs == 1 or len(ranges) == 1:
+        parts = [_profile_range(path, start, end, names, chunksize, formats) for start, end in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            parts = list(pool.map(_profile_range, [path] * len(ranges), *zip(*ranges),
+                                  [names] * len(ranges), [chunksize] * len(ranges), [formats] * len(ranges)))
+    return _merge(parts, names)
+
+
+def load_quality_report(path):
+    """Stored report for the current version of `path`, profiling the file if missing."""
+    return get_or_compute("data_quality", path, profile_dataset, {"version": 2, "cap": CARDINALITY_CAP})
+
+
+def projected_outcome(report, non_analytical, redundant, new_features,
+                      high_missing_pct=30, low_missing_pct=3):
+    """Projected rows and columns after the preprocessing pipeline, from the report alone.
+
+    `new_features` maps each engineered feature to the raw column it is derived from.
+
+    Row removals from nulls are exact (via per-row null patterns); removals for duplicates,
+    invalid severities and unparseable start/end times are subtracted as if they do not
+    overlap, so the projected row count is a lower bound.
+    """
+    cols = report["columns"]
+    names = list(cols.index)
+    dropped_missing = cols.index[cols["null_pct"] > high_missing_pct].tolist()
+    kept = [c for c in names if c not in dropped_missing and c not in non_analytical]
+    numeric = [c for c in kept if cols.loc[c, "dtype"].startswith(("int", "float"))]
+    low_missing = [c for c in kept if 0 < cols.loc[c, "null_pct"] <= low_missing_pct]
+
+    # Rows with nulls in these columns are dropped (steps 5, 6, 8 and the final cleanup)
+    must_exist = set(low_missing) | ({"Start_Time", "End_Time", "Start_Lat", "Start_Lng"} & set(kept))
+    must_exist |= {c for c in kept if c not in numeric and c not in redundant and cols.loc[c, "nulls"] > 0}
+    positions = [names.index(c) for c in must_exist]
+
+    complete_rows = 0
+    for pattern, count in report["null_patterns"].items():
+        pattern = pattern if isinstance(pattern, tuple) else (pattern,)
+        missing = [(int(pattern[p // _PATTERN_BITS]) >> (p % _PATTERN_BITS)) & 1 for p in positions]
+        if not any(missing):
+            complete_rows += int(count)
+
+    unparseable = report["unparseable_timestamps"].reindex(["Start_Time", "End_Time"], fill_value=0)
+    removed = report["duplicate_ids"] + report["invalid_severity"] + int(unparseable.sum())
+    final_columns = [c for c in kept if c not in redundant]
+    added = [f for f, source in new_features.items() if source in kept and f not in final_columns]
+    return {
+        "rows": max(complete_rows - removed, 0),
+        "columns": len(final_columns) + len(added),
+        "dropped_high_missing": dropped_missing,
+        "low_missing_columns": low_missing,
+    }
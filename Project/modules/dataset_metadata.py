@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+from datetime import datetime
+import pandas as pd
+from preprocessing_steps import parse_timestamps
+from result_store import dataset_fingerprint
+
+
+def metadata_path(path):
+    """Sidecar file stored next to the dataset, e.g. data/US_Accidents_March23.meta.json."""
+    return f"{os.path.splitext(path)[0]}.meta.json"
+
+
+def _date_range(df):
+    """(min, max) ISO timestamps from Start_Time, or year-month bounds from Year/Month."""
+    if "Start_Time" in df.columns:
+        # Parsed as the pipeline parses them; malformed stamps are ignored rather than compared as strings
+        times = parse_timestamps(df["Start_Time"]).dropna()
+        if not len(times):
+            return None, None
+        return times.min().strftime("%Y-%m-%d %H:%M:%S"), times.max().strftime("%Y-%m-%d %H:%M:%S")
+    if {"Year", "Month"} <= set(df.columns) and len(df):
+        months = df["Year"].astype(int) * 100 + df["Month"].astype(int)
+        return f"{months.min() // 100}-{months.min() % 100:02d}", f"{months.max() // 100}-{months.max() % 100:02d}"
+    return None, None
+
+
+def _merge_range(a, b):
+    lows = [x for x in (a[0], b[0]) if x is not None]
+    highs = [x for x in (a[1], b[1]) if x is not None]
+    return (min(lows) if lows else None, max(highs) if highs else None)
+
+
+def _metadata(path, row_count, severity_counts, schema, date_range):
+    return {
+        "path": path,
+        "fingerprint": dataset_fingerprint(path),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "row_count": int(row_count),
+        "severity_counts": {str(int(k)): int(v) for k, v in severity_counts.sort_index().items()},
+        "columns": [{"name": str(name), "dtype": str(dtype)} for name, dtype in schema.items()],
+        "date_range": {"min": date_range[0], "max": date_range[1]},
+    }
+
+
+def metadata_from_frame(path, df):
+    """Metadata for `path` from its already loaded DataFrame (used right after ingestion or saving)."""
+    severity = df["Severity"].value_counts() if "Severity" in df.columns else pd.Series(dtype="int64")
+    return _metadata(path, len(df), severity, df.dtypes, _date_range(df))
+
+
+def build_metadata(path, chunksize=1_000_000):
+    """Metadata for `path` from one chunked pass that parses only Severity and the date columns."""
+    header = pd.read_csv(path, nrows=1000)
+    usecols = [c for c in ["Severity", "Start_Time", "Year", "Month"] if c in header.columns]
+    rows, severity, date_range = 0, pd.Series(dtype="int64"), (None, None)
+    for chunk in pd.read_csv(path, usecols=usecols or [0], chunksize=chunksize):
+        rows += len(chunk)
+        if "Severity" in chunk.columns:
+            severity = severity.add(chunk["Severity"].value_counts(), fill_value=0)
+        date_range = _merge_range(date_range, _date_range(chunk))
+    return _metadata(path, rows, severity, header.dtypes, date_range)
+
+
+def write_metadata(path, metadata):
+    """Write the sidecar atomically so readers never see a half-written file."""
+    sidecar = metadata_path(path)
+    tmp_path = f"{sidecar}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_path, sidecar)
+
+
+def stored_metadata(path):
+    """Sidecar metadata for `path` if it exists and matches the current file, else None (never rebuilds)."""
+    sidecar = metadata_path(path)
+    if os.path.exists(sidecar):
+        with open(sidecar) as f:
+            metadata = json.load(f)
+        if metadata.get("fingerprint") == dataset_fingerprint(path):
+            return metadata
+    return None
+
+
+def load_metadata(path):
+    """Sidecar metadata for `path`, rebuilt (and rewritten) when missing or stale."""
+    metadata = stored_metadata(path)
+    if metadata is not None:
+        return metadata
+    metadata = build_metadata(path)
+    write_metadata(path, metadata)
+    return metadata
+
+
+def severity_counts(metadata):
+    """Severity distribution from metadata as an integer-indexed Series."""
+    counts = pd.Series(metadata["severity_counts"], dtype="int64")
+    counts.index = counts.index.astype(int)
+    return counts.sort_index()
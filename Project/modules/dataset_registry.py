@@ -0,0 +1,221 @@
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from filter_context import FILTER_COLUMNS, column_conditions, filter_columns, filter_mask, is_active
+from result_store import STORE_DIR, dataset_fingerprint, stale_versions
+
+# Columnar copies of datasets: one .npy file per column plus a manifest
+COLUMN_STORE_DIR = os.path.join(STORE_DIR, "columns")
+COLUMN_STORE_VERSION = 3
+# Rows are clustered on these columns so filters on them touch few row groups
+SORT_COLUMNS = ["Year", "Month", "State"]
+ROW_GROUP_ROWS = 65_536
+
+_BUILD_LOCK = threading.Lock()
+
+
+def column_store_path(path, fingerprint=None):
+    """Directory holding the columnar copy of the current version of `path`."""
+    base = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(COLUMN_STORE_DIR, f"{base}-{fingerprint or dataset_fingerprint(path)}")
+
+
+def _column_file(store, index):
+    return os.path.join(store, f"{index:03d}.npy")
+
+
+def _group_stats(values, categorical):
+    """Statistics of one column within one row group, used to skip groups that cannot match."""
+    if categorical:
+        return np.unique(values[values >= 0]).tolist()
+    if values.dtype.kind not in "biuf":
+        return None
+    values = values[~np.isnan(values)] if values.dtype.kind == "f" else values
+    return [values.min().item(), values.max().item()] if len(values) else None
+
+
+def write_column_store(path, df=None):
+    """Write `df` (or the CSV at `path`) as memory-mappable column files for the current version of `path`.
+
+    Numeric columns are stored as int64/float64, the dtypes reading the CSV gives them, so
+    pages see the same dtypes either way; boolean and datetime columns are stored as-is and
+    other columns as category codes (-1 for missing) with their categories in the manifest. Rows are
+    sorted by `SORT_COLUMNS` and split into row groups whose per-column statistics for
+    the filterable columns are kept in the manifest.
+    """
+    fingerprint = dataset_fingerprint(path)
+    store = column_store_path(path, fingerprint)
+    if df is None:
+        df = pd.read_csv(path)
+    sort_by = [c for c in SORT_COLUMNS if c in df.columns]
+    if sort_by:
+        df = df.sort_values(sort_by, kind="stable", ignore_index=True)
+    bounds = list(range(0, len(df), ROW_GROUP_ROWS)) + [len(df)]
+    row_groups = [{"start": start, "stop": stop, "stats": {}} for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    tmp_store = f"{store}.{os.getpid()}.{threading.get_ident()}.tmp"
+    os.makedirs(tmp_store, exist_ok=True)
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {"name": col}
+        if series.dtype.kind in "iu" and not isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.to_numpy(dtype="int64")
+        elif series.dtype.kind == "f":
+            values = series.to_numpy(dtype="float64")
+        elif series.dtype.kind in "bM" and not isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.to_numpy()
+        else:
+            codes, categories = pd.factorize(series, sort=True)
+            # Codes are stored in the dtype pandas uses for them so they map without a copy
+            values = pd.Categorical.from_codes(codes, categories=categories).codes
+            entry["categories"] = [c.item() if hasattr(c, "item") else c for c in categories]
+        entry["dtype"] = str(values.dtype)
+        np.save(_column_file(tmp_store, i), values, allow_pickle=False)
+        columns.append(entry)
+        if col in FILTER_COLUMNS:
+            for group in row_groups:
+                group["stats"][col] = _group_stats(values[group["start"]:group["stop"]], "categories" in entry)
+
+    manifest = {"version": COLUMN_STORE_VERSION, "source": os.path.abspath(path),
+                "fingerprint": fingerprint, "rows": len(df), "columns": columns, "row_groups": row_groups}
+    with open(os.path.join(tmp_store, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+    if os.path.isdir(store):
+        shutil.rmtree(tmp_store)
+    else:
+        os.replace(tmp_store, store)
+    # Stores of earlier versions of the file are never read again
+    for old_store in stale_versions(COLUMN_STORE_DIR, path, fingerprint):
+        shutil.rmtree(old_store, ignore_errors=True)
+    return store
+
+
+def _read_manifest(store):
+    manifest_path = os.path.join(store, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    return manifest if manifest.get("version") == COLUMN_STORE_VERSION else None
+
+
+def _open_manifest(path, fingerprint=None):
+    """Store directory and manifest for the current version of `path`, building the store if missing."""
+    store = column_store_path(path, fingerprint)
+    manifest = _read_manifest(store)
+    if manifest is None:
+        with _BUILD_LOCK:
+            manifest = _read_manifest(store)
+            if manifest is None:
+                shutil.rmtree(store, ignore_errors=True)
+                write_column_store(path)
+                manifest = _read_manifest(store)
+    return store, manifest
+
+
+def open_column_store(path, columns=None, fingerprint=None):
+    """Read-only DataFrame over the memory-mapped column files of `path`, building them if missing.
+
+    Column data is not copied into the process: pages come from the OS page cache, so
+    every session and server worker reading the same dataset version shares them.
+    """
+    store, manifest = _open_manifest(path, fingerprint)
+    data = {}
+    for i, entry in enumerate(manifest["columns"]):
+        if columns is not None and entry["name"] not in columns:
+            continue
+        values = np.load(_column_file(store, i), mmap_mode="r")
+        if "categories" in entry:
+            values = pd.Categorical.from_codes(values, categories=entry["categories"], validate=False)
+        data[entry["name"]] = values
+    df = pd.DataFrame(data, copy=False)
+    return df[list(columns)] if columns is not None else df
+
+
+@st.cache_resource(show_spinner="Loading dataset...", max_entries=8)
+def _shared_dataset(path, fingerprint, columns):
+    return open_column_store(path, None if columns is None else list(columns), fingerprint)
+
+
+def load_dataset(path, columns=None):
+    """Process-wide shared, read-only DataFrame for the current version of `path`.
+
+    Each dataset version (and column selection) is opened once per server process and the
+    same object is returned to every session, so callers must not modify it in place.
+    """
+    return _shared_dataset(path, dataset_fingerprint(path), None if columns is None else tuple(columns))
+
+
+def _may_match(stats, op, value, categories):
+    if stats is None:
+        return False
+    if categories is not None:
+        lookup = {c: code for code, c in enumerate(categories)}
+        codes = {lookup[v] for v in value if v in lookup}
+        return not codes.isdisjoint(stats)
+    low, high = stats
+    if op == "between":
+        return value[1] >= low and value[0] <= high
+    return any(low <= v <= high for v in value)
+
+
+def matching_row_groups(manifest, ctx):
+    """Row groups whose column statistics allow rows matching `ctx`."""
+    entries = {entry["name"]: entry for entry in manifest["columns"]}
+    groups = []
+    for group in manifest["row_groups"]:
+        if all(col not in group["stats"]
+               or _may_match(group["stats"][col], op, value, entries[col].get("categories"))
+               for col, op, value in column_conditions(ctx)):
+            groups.append(group)
+    return groups
+
+
+def query_plan(path, ctx):
+    """(row groups to read, total row groups) for `ctx` on the current version of `path`."""
+    _, manifest = _open_manifest(path)
+    return len(matching_row_groups(manifest, ctx)), len(manifest["row_groups"])
+
+
+def _query(path, fingerprint, ctx, columns):
+    store, manifest = _open_manifest(path, fingerprint)
+    groups = matching_row_groups(manifest, ctx)
+    names = [entry["name"] for entry in manifest["columns"]]
+    columns = names if columns is None else list(columns)
+    needed = columns + [c for c in filter_columns(ctx) if c in names and c not in columns]
+
+    # Only the needed columns of the surviving row groups are read from the memory-mapped files
+    data = {}
+    for col in needed:
+        i = names.index(col)
+        entry = manifest["columns"][i]
+        values = np.load(_column_file(store, i), mmap_mode="r")
+        values = np.concatenate([values[g["start"]:g["stop"]] for g in groups]) if groups else values[:0]
+        if "categories" in entry:
+            values = pd.Categorical.from_codes(values, categories=entry["categories"], validate=False)
+        data[col] = values
+    df = pd.DataFrame(data, copy=False)
+    return df.loc[filter_mask(df, ctx).to_numpy(), columns].reset_index(drop=True)
+
+
+@st.cache_resource(show_spinner="Filtering dataset...", max_entries=16)
+def _shared_query(path, fingerprint, ctx, columns):
+    return _query(path, fingerprint, ctx, columns)
+
+
+def query_dataset(path, ctx=None, columns=None):
+    """Shared, read-only rows of `path` matching the global filter context `ctx`.
+
+    Filters are pushed down to the column store: row groups whose statistics rule out a
+    match are skipped and only the requested (plus filter) columns are read. Without
+    active filters this is `load_dataset`.
+    """
+    if not is_active(ctx):
+        return load_dataset(path, columns)
+    return _shared_query(path, dataset_fingerprint(path), ctx, None if columns is None else tuple(columns))
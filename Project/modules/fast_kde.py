@@ -0,0 +1,72 @@
+import numpy as np
+
+# Cap on the fine grid; keeps binning and FFT memory bounded for columns with extreme outliers
+MAX_GRID_SIZE = 2 ** 20
+
+
+def scott_bandwidth(n, std):
+    """Kernel standard deviation used by `scipy.stats.gaussian_kde` with its default (Scott's) rule."""
+    return std * n ** (-1.0 / 5)
+
+
+def grid_spacing(lo, hi, bandwidth, min_size=4096, cells_per_bandwidth=4):
+    """Spacing of a fine grid over [lo, hi] with several cells per bandwidth (bounded by MAX_GRID_SIZE)."""
+    span = max(hi - lo, bandwidth)
+    size = int(np.clip(span / bandwidth * cells_per_bandwidth, min_size, MAX_GRID_SIZE))
+    return span / (size - 1)
+
+
+def linear_bin(values, lo, dx, size):
+    """Linear binning: each value splits its unit weight between the two nearest grid points."""
+    pos = (values - lo) / dx
+    left = np.clip(np.floor(pos).astype(np.int64), 0, size - 2)
+    frac = np.clip(pos - left, 0.0, 1.0)
+    return (np.bincount(left, weights=1.0 - frac, minlength=size)
+            + np.bincount(left + 1, weights=frac, minlength=size))
+
+
+def kde_from_grid(grid_counts, lo, dx, bandwidth, x_eval):
+    """Gaussian KDE evaluated at `x_eval` from counts binned on the grid lo + i * dx.
+
+    The counts are convolved with the sampled Gaussian kernel by FFT (zero padded, so
+    there is no wrap-around) and the density is linearly interpolated at `x_eval`.
+    """
+    grid_counts = np.asarray(grid_counts, dtype=float)
+    n = grid_counts.sum()
+    if n == 0 or bandwidth <= 0:
+        return np.zeros_like(np.asarray(x_eval, dtype=float))
+
+    half_width = int(np.ceil(5 * bandwidth / dx))
+    offsets = np.arange(-half_width, half_width + 1) * dx
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+
+    size = len(grid_counts) + 2 * half_width
+    fft_size = 1 << int(np.ceil(np.log2(size + len(kernel))))
+    padded = np.zeros(fft_size)
+    padded[half_width:half_width + len(grid_counts)] = grid_counts
+    smoothed = np.fft.irfft(np.fft.rfft(padded) * np.fft.rfft(kernel, fft_size), fft_size)
+    # Full convolution is shifted by the kernel half-width; keep the part aligned with the padded grid
+    density = smoothed[half_width:half_width + size] / n
+
+    grid = lo + (np.arange(size) - half_width) * dx
+    return np.interp(x_eval, grid, density, left=0.0, right=0.0)
+
+
+def binned_kde(values, x_eval):
+    """Fast approximation of `scipy.stats.gaussian_kde(values)(x_eval)` (same Scott bandwidth).
+
+    Runs in O(n + G log G) for a grid of G points instead of O(n * len(x_eval)).
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    x_eval = np.asarray(x_eval, dtype=float)
+    if len(values) < 2:
+        return np.zeros_like(x_eval)
+    bandwidth = scott_bandwidth(len(values), values.std(ddof=1))
+    if bandwidth == 0:
+        return np.zeros_like(x_eval)
+
+    lo, hi = values.min(), values.max()
+    dx = grid_spacing(lo, hi, bandwidth)
+    size = int(np.floor((hi - lo) / dx)) + 2
+    return kde_from_grid(linear_bin(values, lo, dx, size), lo, dx, bandwidth, x_eval)
@@ -0,0 +1,105 @@
+import pandas as pd
+
+# Columns the global filters act on
+FILTER_COLUMNS = ["Year", "Month", "State", "Severity", "Weather_Condition"]
+
+EMPTY_CONTEXT = {"period": None, "states": None, "severity": None, "weather": None}
+
+
+def make_context(period=None, states=None, severity=None, weather=None):
+    """Global filter context shared by the analysis pages.
+
+    `period` is an inclusive ((year, month), (year, month)) range; `states`, `severity`
+    and `weather` are collections of allowed values. None or empty means no filter.
+    """
+    return {
+        "period": (tuple(period[0]), tuple(period[1])) if period else None,
+        "states": tuple(sorted(states)) if states else None,
+        "severity": tuple(sorted(severity)) if severity else None,
+        "weather": tuple(sorted(weather)) if weather else None,
+    }
+
+
+def is_active(ctx):
+    return ctx is not None and any(v is not None for v in ctx.values())
+
+
+def filter_columns(ctx):
+    """Columns needed to evaluate the active filters of `ctx`."""
+    if not is_active(ctx):
+        return []
+    needed = {"period": ["Year", "Month"], "states": ["State"],
+              "severity": ["Severity"], "weather": ["Weather_Condition"]}
+    return [col for key, cols in needed.items() if ctx[key] is not None for col in cols]
+
+
+def column_conditions(ctx):
+    """Per-column conditions implied by `ctx`, as (column, "between"|"in", value).
+
+    Every row matching `ctx` satisfies all of them, so they can be checked against
+    per-block column statistics to skip blocks; the exact row test is `filter_mask`.
+    """
+    if not is_active(ctx):
+        return []
+    conditions = []
+    if ctx["period"] is not None:
+        (y0, _), (y1, _) = ctx["period"]
+        conditions.append(("Year", "between", (y0, y1)))
+    if ctx["states"] is not None:
+        conditions.append(("State", "in", ctx["states"]))
+    if ctx["severity"] is not None:
+        conditions.append(("Severity", "in", ctx["severity"]))
+    if ctx["weather"] is not None:
+        conditions.append(("Weather_Condition", "in", ctx["weather"]))
+    return conditions
+
+
+def filter_mask(df, ctx):
+    """Boolean mask of the rows of `df` matching `ctx`; filters on columns `df` lacks are ignored."""
+    mask = pd.Series(True, index=df.index)
+    if not is_active(ctx):
+        return mask
+    if ctx["period"] is not None and {"Year", "Month"} <= set(df.columns):
+        (y0, m0), (y1, m1) = ctx["period"]
+        period = df["Year"].astype("int64") * 12 + df["Month"].astype("int64")
+        mask &= period.between(y0 * 12 + m0, y1 * 12 + m1)
+    for key, col in [("states", "State"), ("severity", "Severity"), ("weather", "Weather_Condition")]:
+        if ctx[key] is not None and col in df.columns:
+            mask &= df[col].isin(ctx[key])
+    return mask
+
+
+def apply_context(df, ctx):
+    """Rows of `df` matching `ctx` (row-level frames and aggregate tables alike)."""
+    if not is_active(ctx):
+        return df
+    return df[filter_mask(df, ctx).to_numpy()]
+
+
+def describe(ctx):
+    """Short human-readable summary of the active filters."""
+    if not is_active(ctx):
+        return "No global filters"
+    parts = []
+    if ctx["period"] is not None:
+        (y0, m0), (y1, m1) = ctx["period"]
+        parts.append(f"{y0}-{m0:02d} to {y1}-{m1:02d}")
+    if ctx["states"] is not None:
+        parts.append("states " + ", ".join(ctx["states"]))
+    if ctx["severity"] is not None:
+        parts.append("severity " + ", ".join(str(s) for s in ctx["severity"]))
+    if ctx["weather"] is not None:
+        parts.append("weather " + ", ".join(ctx["weather"]))
+    return "Filtered to " + "; ".join(parts)
+
+
+def filter_options(cube):
+    """Values offered by the global filter widgets, taken from the aggregate cube's marginal tables."""
+    options = {"periods": [], "states": [], "severity": [], "weather": []}
+    if "Period" in cube:
+        periods = cube["Period"][["Year", "Month"]].dropna().astype("int64").sort_values(["Year", "Month"])
+        options["periods"] = [(int(y), int(m)) for y, m in periods.itertuples(index=False, name=None)]
+    for key, col in [("states", "State"), ("severity", "Severity"), ("weather", "Weather_Condition")]:
+        if col in cube:
+            options[key] = sorted(cube[col][col].dropna().unique().tolist(), key=str)
+    return options
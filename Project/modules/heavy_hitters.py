@@ -0,0 +1,103 @@
+import pandas as pd
+from result_store import get_or_compute
+
+# Columns whose most frequent values are tracked for the top-N panels
+SKETCH_COLUMNS = ["State", "City", "Weather_Condition"]
+SKETCH_CAPACITY = 200
+
+# Parameters that define the stored sketches; changing them invalidates stored sketches
+SKETCH_PARAMS = {"version": 1, "columns": SKETCH_COLUMNS, "capacity": SKETCH_CAPACITY}
+
+
+class SpaceSaving:
+    """Mergeable Space-Saving summary of the most frequent values in a stream.
+
+    Tracks at most `capacity` values. Each tracked value has an estimated count that never
+    underestimates the true count and an `error` bounding the overestimate, so its true
+    count lies in [count - error, count]. Any untracked value occurred at most `floor` times.
+    Summaries of separate batches can be merged (Agarwal et al., "Mergeable Summaries").
+    """
+
+    def __init__(self, capacity=SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.table = pd.DataFrame({"count": pd.Series(dtype="int64"), "error": pd.Series(dtype="int64")})
+        self.floor = 0
+        self.total = 0
+
+    def update(self, values):
+        """Add a batch of values (counted exactly, then merged into the summary)."""
+        counts = pd.Series(values).value_counts(dropna=True)
+        batch = SpaceSaving(self.capacity)
+        batch.total = int(counts.sum())
+        # Values cut from the batch occurred at most as often as the largest one dropped
+        batch.floor = int(counts.iloc[self.capacity]) if len(counts) > self.capacity else 0
+        kept = counts.iloc[:self.capacity].astype("int64")
+        batch.table = pd.DataFrame({"count": kept, "error": 0}, index=kept.index)
+        self.merge(batch)
+        return self
+
+    def merge(self, other):
+        """Merge another summary into this one in place."""
+        keys = self.table.index.union(other.table.index)
+        mine = self.table.reindex(keys)
+        theirs = other.table.reindex(keys)
+        merged = pd.DataFrame({
+            "count": mine["count"].fillna(self.floor) + theirs["count"].fillna(other.floor),
+            "error": mine["error"].fillna(self.floor) + theirs["error"].fillna(other.floor),
+        }).astype("int64").sort_values("count", ascending=False, kind="stable")
+
+        dropped = merged.iloc[self.capacity:]
+        self.floor = max(self.floor + other.floor, int(dropped["count"].max()) if len(dropped) else 0)
+        self.table = merged.iloc[:self.capacity]
+        self.total += other.total
+        return self
+
+    def top(self, n):
+        """Estimated top-`n` values with their count bounds."""
+        top = self.table.head(n)
+        return pd.DataFrame({"count": top["count"], "lower_bound": top["count"] - top["error"]})
+
+    def candidates(self, n):
+        """Values that may belong to the true top `n`, and whether that set is guaranteed complete.
+
+        A value can only be in the top `n` if its upper bound reaches the `n`-th largest lower
+        bound; the set is complete when no untracked value could reach it either.
+        """
+        lower = (self.table["count"] - self.table["error"]).nlargest(n)
+        threshold = int(lower.iloc[-1]) if len(lower) == n else 0
+        keys = self.table.index[self.table["count"] >= threshold].tolist()
+        return keys, self.floor == 0 or self.floor < threshold
+
+
+def update_sketches(sketches, chunk):
+    """Fold a batch of rows (a preprocessing chunk or appended records) into per-column sketches."""
+    for col in SKETCH_COLUMNS:
+        if col in chunk.columns:
+            sketches.setdefault(col, SpaceSaving()).update(chunk[col])
+    return sketches
+
+
+def build_sketches_from_csv(path, chunksize=1_000_000):
+    """Per-column sketches from a streaming pass over the sketch columns of a CSV."""
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in SKETCH_COLUMNS if c in header]
+    sketches = {}
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize):
+        update_sketches(sketches, chunk)
+    return sketches
+
+
+def load_sketches(path):
+    """The stored sketches for the current version of `path`, building them from the CSV if missing."""
+    return get_or_compute("sketches", path, build_sketches_from_csv, SKETCH_PARAMS)
+
+
+def top_n(sketch, n, exact_counts):
+    """Exact top-`n` values: the sketch proposes candidates and only those are recounted.
+
+    `exact_counts(keys)` returns exact counts for the given values (or for all values when
+    `keys` is None, used when the candidate set is not guaranteed complete).
+    """
+    keys, complete = sketch.candidates(n)
+    counts = exact_counts(keys if complete else None)
+    return counts.nlargest(n)
@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+from indicators import ROAD_FEATURES, existing_indicators, indicator_block
+
+# Binning and feature lists shared with the Insights & Hypothesis page
+TEMP_BINS = [-50, 0, 32, 50, 70, 90, 110, 150]
+VISIBILITY_BINS = [0, 1, 2, 5, 10, 20, np.inf]
+VISIBILITY_LABELS = ["<1mi", "1-2mi", "2-5mi", "5-10mi", "10-20mi", ">20mi"]
+LOW_VISIBILITY_LABELS = ["<1mi", "1-2mi"]
+CORRELATION_COLUMNS = ["Temperature(F)", "Humidity(%)", "Pressure(in)"]
+
+INSIGHT_COLUMNS = (["Severity", "Weather_Condition", "Hour", "Visibility(mi)"]
+                   + CORRELATION_COLUMNS + ROAD_FEATURES)
+
+# Parameters that define the stored insight statistics; changing any of them invalidates stored results
+INSIGHT_STATS_PARAMS = {"version": 1, "temp_bins": TEMP_BINS, "visibility_bins": VISIBILITY_BINS,
+                        "columns": INSIGHT_COLUMNS}
+
+
+def _group_moments(severity, keys):
+    """Count, sum and sum of squares of Severity per group key."""
+    frame = pd.DataFrame({"key": keys, "s": severity, "ss": severity ** 2})
+    return frame.groupby("key", observed=False).agg(
+        n=("s", "count"), s=("s", "sum"), ss=("ss", "sum"))
+
+
+def _add(total, part):
+    """Add aggregated chunk results, aligning on the index."""
+    if total is None:
+        return part
+    return total.add(part, fill_value=0)
+
+
+def indicator_moments(indicators, severity):
+    """Per-column (n, sum, sum of squares) of Severity where each indicator is 1 and where it is 0.
+
+    `indicators` is a DataFrame of 0/1 or boolean columns. All columns are handled by one
+    matrix product of the stacked [is 1 | is 0] masks against [1, y, y^2].
+    """
+    columns = list(indicators.columns)
+    y = np.asarray(severity, dtype=float)
+    masks = np.hstack([indicator_block(indicators, columns, 1),
+                       indicator_block(indicators, columns, 0)]).astype(float)
+    totals = masks.T @ np.column_stack([np.ones_like(y), y, y * y])
+    k = len(columns)
+    return pd.DataFrame(np.hstack([totals[:k], totals[k:]]), index=indicators.columns,
+                        columns=["n1", "s1", "ss1", "n0", "s0", "ss0"])
+
+
+def indicator_ttests_from_moments(moments, min_count=10):
+    """Vectorized Student t-test of Severity with vs without each indicator, from `indicator_moments` output."""
+    n1, n0 = moments["n1"], moments["n0"]
+    mean1 = moments["s1"] / n1.where(n1 > 0)
+    mean0 = moments["s0"] / n0.where(n0 > 0)
+    var1 = (moments["ss1"] - n1 * mean1 ** 2) / (n1 - 1).where(n1 > 1)
+    var0 = (moments["ss0"] - n0 * mean0 ** 2) / (n0 - 1).where(n0 > 1)
+    testable = ((n1 > min_count) & (n0 > min_count)).to_numpy()
+    # Only testable rows reach scipy, so empty or single-row groups raise no warnings
+    t_stat = np.full(len(moments), np.nan)
+    p = np.full(len(moments), np.nan)
+    if testable.any():
+        from scipy.stats import ttest_ind_from_stats
+        sd1 = np.sqrt(var1.clip(lower=0)).to_numpy()
+        sd0 = np.sqrt(var0.clip(lower=0)).to_numpy()
+        t_stat[testable], p[testable] = ttest_ind_from_stats(
+            mean1.to_numpy()[testable], sd1[testable], n1.to_numpy()[testable],
+            mean0.to_numpy()[testable], sd0[testable], n0.to_numpy()[testable], equal_var=True)
+
+    table = pd.DataFrame({
+        "n_with": n1.astype(int),
+        "n_without": n0.astype(int),
+        "mean_with": mean1,
+        "mean_without": mean0,
+        "t_stat": t_stat,
+        "p_value": p,
+    }, index=moments.index)
+    table["theory"] = np.where(~testable, "Insufficient data",
+                               np.where(table["p_value"] < 0.05, "TRUE", "FALSE"))
+    table.index.name = "feature"
+    return table
+
+
+def batched_indicator_ttests(df, columns, target="Severity", min_count=10):
+    """Test every indicator column in `columns` against `target` at once; returns one row per column."""
+    data = df[list(columns) + [target]].dropna(subset=[target])
+    return indicator_ttests_from_moments(indicator_moments(data[list(columns)], data[target]), min_count)
+
+
+def compute_insight_stats(path, chunksize=500_000):
+    """Stream the preprocessed CSV once and accumulate every sufficient statistic the insights need.
+
+    Only the columns used by the insights are parsed. The result is a dict of small
+    Series/DataFrames (group moments, counts and contingency tables) from which the
+    t-tests, chi-square tests and Pearson correlations are derived exactly.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in INSIGHT_COLUMNS if c in header]
+    return insight_stats_from_chunks(pd.read_csv(path, usecols=usecols, chunksize=chunksize), header)
+
+
+def insight_stats_from_chunks(chunks, header):
+    """Accumulate the insight statistics (see `compute_insight_stats`) over DataFrame chunks with columns `header`."""
+    road_features = existing_indicators(header, ROAD_FEATURES)
+
+    weather = hourly = temp_bins = visibility = low_vis = rain = None
+    road = None
+    # Pearson moments are accumulated on shifted values (x - shift) for numerical stability
+    pearson = {}
+    rows = 0
+
+    for chunk in chunks:
+        chunk = chunk.dropna(subset=["Severity"])
+        sev = chunk["Severity"].astype(float)
+        rows += len(chunk)
+
+        if "Weather_Condition" in chunk:
+            weather = _add(weather, _group_moments(sev, chunk["Weather_Condition"]))
+            is_rain = chunk["Weather_Condition"].str.lower().str.contains("rain", na=False)
+            rain = _add(rain, pd.crosstab(is_rain, chunk["Severity"]))
+
+        if "Hour" in chunk:
+            hourly = _add(hourly, chunk["Hour"].value_counts())
+
+        if "Temperature(F)" in chunk:
+            bins = pd.cut(chunk["Temperature(F)"], bins=TEMP_BINS, right=False)
+            temp_bins = _add(temp_bins, _group_moments(sev, bins))
+
+        if "Visibility(mi)" in chunk:
+            vis_range = pd.cut(chunk["Visibility(mi)"], bins=VISIBILITY_BINS,
+                               labels=VISIBILITY_LABELS, include_lowest=True)
+            visibility = _add(visibility, vis_range.value_counts())
+            is_low = vis_range.isin(LOW_VISIBILITY_LABELS)
+            low_vis = _add(low_vis, pd.crosstab(is_low, chunk["Severity"]))
+
+        for col in CORRELATION_COLUMNS:
+            if col not in chunk:
+                continue
+            pair = pd.DataFrame({"x": chunk[col], "y": sev}).dropna()
+            if pair.empty:
+                continue
+            acc = pearson.setdefault(col, {"shift_x": pair["x"].mean(), "shift_y": pair["y"].mean(),
+                                           "n": 0, "sx": 0.0, "sy": 0.0,
+                                           "sxx": 0.0, "syy": 0.0, "sxy": 0.0})
+            x = pair["x"].to_numpy() - acc["shift_x"]
+            y = pair["y"].to_numpy() - acc["shift_y"]
+            acc["n"] += len(pair)
+            acc["sx"] += x.sum()
+            acc["sy"] += y.sum()
+            acc["sxx"] += (x * x).sum()
+            acc["syy"] += (y * y).sum()
+            acc["sxy"] += (x * y).sum()
+
+        if road_features:
+            road = _add(road, indicator_moments(chunk[road_features], sev))
+
+    return {
+        "rows": rows,
+        "weather": weather,
+        "hourly": hourly.sort_index() if hourly is not None else None,
+        "temp_bins": temp_bins,
+        "visibility": visibility.reindex(VISIBILITY_LABELS, fill_value=0) if visibility is not None else None,
+        "low_visibility": low_vis,
+        "rain": rain,
+        "pearson": pearson,
+        "road": road,
+    }
+
+
+def sample_rows(path, columns, fraction, seed=0, chunksize=500_000):
+    """Uniform random sample of `columns` drawn chunk by chunk (not a head-of-file slice)."""
+    parts = [chunk.sample(frac=fraction, random_state=seed + i)
+             for i, chunk in enumerate(pd.read_csv(path, usecols=list(columns), chunksize=chunksize))]
+    return pd.concat(parts, ignore_index=True)
+
+
+def group_mean(moments):
+    """Mean Severity per group from accumulated moments."""
+    return moments["s"] / moments["n"].where(moments["n"] > 0)
+
+
+def ttest_from_moments(a, b):
+    """Two-sample Student t-test (as `scipy.stats.ttest_ind`) from (n, sum, sum of squares) rows."""
+    means, stds = [], []
+    for g in (a, b):
+        n = g["n"]
+        mean = g["s"] / n
+        var = (g["ss"] - n * mean ** 2) / (n - 1)
+        means.append(mean)
+        stds.append(np.sqrt(max(var, 0.0)))
+    from scipy.stats import ttest_ind_from_stats
+    return ttest_ind_from_stats(means[0], stds[0], a["n"], means[1], stds[1], b["n"], equal_var=True)
+
+
+def pearson_from_moments(acc):
+    """Pearson r and two-sided p-value (as `scipy.stats.pearsonr`) from accumulated moments."""
+    n = acc["n"]
+    cov = acc["sxy"] - acc["sx"] * acc["sy"] / n
+    var_x = acc["sxx"] - acc["sx"] ** 2 / n
+    var_y = acc["syy"] - acc["sy"] ** 2 / n
+    if n < 3 or var_x <= 0 or var_y <= 0:
+        return np.nan, np.nan
+    r = float(np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0))
+    if abs(r) == 1.0:
+        return r, 0.0
+    t = r * np.sqrt((n - 2) / (1 - r ** 2))
+    from scipy.stats import t as t_dist
+    return r, float(2 * t_dist.sf(abs(t), n - 2))
+
+
+def road_feature_tests(insight_stats, min_count=10):
+    """Results table of the with/without t-test for every road feature present in the data."""
+    if insight_stats["road"] is None:
+        return pd.DataFrame()
+    return indicator_ttests_from_moments(insight_stats["road"], min_count)
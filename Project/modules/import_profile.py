@@ -0,0 +1,66 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from importlib import import_module
+
+import pandas as pd
+
+_MARKER = "--page-import--"
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# First-import time of each page module in this server process (seconds)
+IMPORT_TIMES = {}
+
+
+def timed_import(name):
+    """Import a page module, recording how long its first import took in this process."""
+    first = name not in sys.modules
+    start = time.perf_counter()
+    module = import_module(name)
+    if first:
+        IMPORT_TIMES[name] = time.perf_counter() - start
+    return module
+
+
+def cold_import_report(name, modules_dir, preload=("streamlit",)):
+    """Per-module import cost of `name` in a fresh interpreter, via `python -X importtime`.
+
+    Modules in `preload` are imported first and excluded, since the app has them loaded
+    before any page. Returns one row per module with self and cumulative time in
+    milliseconds and its nesting depth under the page import (0 = the page itself).
+    """
+    code = "; ".join([f"import {m}" for m in preload]
+                     + [f"import sys; sys.stderr.write({_MARKER!r} + '\\n')", f"import {name}"])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [modules_dir, os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, env=env, check=True)
+
+    rows = []
+    lines = proc.stderr.splitlines()
+    for line in lines[lines.index(_MARKER) + 1:]:
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append({"module": module, "self_ms": int(self_us) / 1000,
+                         "cumulative_ms": int(cumulative_us) / 1000, "depth": len(indent) // 2})
+    report = pd.DataFrame(rows, columns=["module", "self_ms", "cumulative_ms", "depth"])
+    if len(report):
+        report["depth"] -= report["depth"].min()
+    return report
+
+
+def cold_start_summary(names, modules_dir):
+    """Total cold import time of each page module and its heaviest direct dependency."""
+    rows = []
+    for name in names:
+        report = cold_import_report(name, modules_dir)
+        page = report[report["module"] == name]
+        direct = report[report["depth"] == 1].sort_values("cumulative_ms", ascending=False)
+        rows.append({"page": name,
+                     "cumulative_ms": float(page["cumulative_ms"].iloc[0]) if len(page) else 0.0,
+                     "modules_loaded": len(report),
+                     "heaviest_import": direct["module"].iloc[0] if len(direct) else None,
+                     "heaviest_ms": float(direct["cumulative_ms"].iloc[0]) if len(direct) else 0.0})
+    return pd.DataFrame(rows).set_index("page")
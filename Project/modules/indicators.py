@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+# 0/1 or boolean columns in the preprocessed dataset
+ROAD_FEATURES = ['Bump', 'Crossing', 'Give_Way', 'Junction', 'No_Exit',
+                 'Railway', 'Roundabout', 'Station', 'Stop',
+                 'Traffic_Calming', 'Traffic_Signal', 'Turning_Loop']
+TIME_INDICATORS = ['IsWeekend', 'IsDay']
+INDICATOR_COLUMNS = ROAD_FEATURES + TIME_INDICATORS
+
+
+def existing_indicators(columns, candidates=INDICATOR_COLUMNS):
+    """Indicator columns from `candidates` that are present in `columns`, in canonical order."""
+    return [c for c in candidates if c in columns]
+
+
+def indicator_block(df, columns, value=1):
+    """Compact boolean block (rows × columns) that is True where each indicator equals `value`.
+
+    Works for int 0/1, bool and nullable columns alike (missing values are never a match).
+    """
+    if not columns:
+        return np.zeros((len(df), 0), dtype=bool)
+    return df[list(columns)].to_numpy(dtype="float32", na_value=np.nan) == value
+
+
+def indicator_counts(df, columns=None):
+    """Number of rows flagged by each indicator column, from one column-sum over the boolean block."""
+    columns = existing_indicators(df.columns) if columns is None else list(columns)
+    return pd.Series(indicator_block(df, columns).sum(axis=0), index=columns, dtype="int64")
@@ -0,0 +1,178 @@
+import contextvars
+import cProfile
+import json
+import marshal
+import pickle
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+import pandas as pd
+
+PROFILE_TOP = 40
+LOG_COLUMNS = ["run_id", "started", "page", "phase", "depth", "wall_ms", "cpu_ms", "process_peak_mb", "rows"]
+
+# The instrumented page run of the current script thread; None when instrumentation is off
+_CURRENT = contextvars.ContextVar("instrumented_run", default=None)
+_DISABLED = nullcontext()
+
+# tracemalloc is process-wide: it runs while any instrumented run or profile needs it
+_TRACING_LOCK = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+# Its single peak counter is reset by one instrumented run at a time; concurrent runs record no peak
+_PEAK_LOCK = threading.Lock()
+
+
+@contextmanager
+def _tracing():
+    """Keep tracemalloc tracing inside the block; stops it after the last user if it was started here."""
+    global _tracing_users, _started_tracing
+    with _TRACING_LOCK:
+        if _tracing_users == 0:
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+        _tracing_users += 1
+    try:
+        yield
+    finally:
+        with _TRACING_LOCK:
+            _tracing_users -= 1
+            if _tracing_users == 0 and _started_tracing:
+                tracemalloc.stop()
+                _started_tracing = False
+
+
+@contextmanager
+def _timed(run, name):
+    stack = run["stack"]
+    record = {"run_id": run["id"], "started": datetime.now().isoformat(timespec="milliseconds"),
+              "page": run["page"], "phase": name, "depth": len(stack), "process_peak_mb": None, "rows": None}
+    run["records"].append(record)
+    # The peak covers every allocation in the process while the phase runs (other sessions and
+    # threads included). tracemalloc keeps a single peak, so each phase resets it and hands
+    # its own peak up to the parent.
+    measure = run["owns_peak"]
+    base = tracemalloc.get_traced_memory()[0] if measure else 0
+    if measure:
+        tracemalloc.reset_peak()
+    frame = {"record": record, "base": base, "child_peak": 0}
+    stack.append(frame)
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield record
+    finally:
+        record["wall_ms"] = (time.perf_counter() - wall) * 1000
+        record["cpu_ms"] = (time.process_time() - cpu) * 1000
+        stack.pop()
+        if measure:
+            peak = max(tracemalloc.get_traced_memory()[1], frame["child_peak"])
+            record["process_peak_mb"] = max(peak - base, 0) / 2 ** 20
+            if stack:
+                stack[-1]["child_peak"] = max(stack[-1]["child_peak"], peak)
+            tracemalloc.reset_peak()
+
+
+def phase(name):
+    """Time a phase of the current page run (wall, CPU, process-wide peak traced memory).
+
+    Returns a no-op context manager when instrumentation is off, so phases can stay in
+    page code permanently.
+    """
+    run = _CURRENT.get()
+    if run is None:
+        return _DISABLED
+    return _timed(run, name)
+
+
+def record_rows(rows):
+    """Attach a row count to the innermost running phase (no-op when instrumentation is off)."""
+    run = _CURRENT.get()
+    if run is not None and run["stack"]:
+        run["stack"][-1]["record"]["rows"] = int(rows)
+
+
+@contextmanager
+def page_run(page, enabled=True):
+    """Instrument one page run; yields the run whose "records" list holds one row per phase.
+
+    Peak memory is only recorded when no other instrumented run is in progress.
+    """
+    if not enabled:
+        yield None
+        return
+    owns_peak = _PEAK_LOCK.acquire(blocking=False)
+    run = {"id": uuid.uuid4().hex[:8], "page": page, "records": [], "stack": [], "owns_peak": owns_peak}
+    token = _CURRENT.set(run)
+    try:
+        with _tracing(), _timed(run, "run"):
+            yield run
+    finally:
+        _CURRENT.reset(token)
+        if owns_peak:
+            _PEAK_LOCK.release()
+
+
+def log_frame(records):
+    """Phase records as a DataFrame with the standard log columns."""
+    frame = pd.DataFrame(list(records), columns=LOG_COLUMNS).astype({"process_peak_mb": "float64", "rows": "Int64"})
+    return frame.round({"wall_ms": 1, "cpu_ms": 1, "process_peak_mb": 2})
+
+
+def log_json(records):
+    return json.dumps(list(records), indent=2, default=str)
+
+
+# -----------------------------------------------------------
+# One-off call profile and allocation snapshot of a page run
+# -----------------------------------------------------------
+def _function_table(stats, top):
+    rows = [{"function": func, "location": f"{file}:{line}", "calls": nc, "primitive_calls": cc,
+             "own_s": tt, "cumulative_s": ct}
+            for (file, line, func), (cc, nc, tt, ct, _) in stats.items()]
+    table = pd.DataFrame(rows).sort_values("cumulative_s", ascending=False, kind="stable").head(top)
+    return table.round({"own_s": 4, "cumulative_s": 4}).reset_index(drop=True)
+
+
+def _allocation_table(snapshot, baseline, top):
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__),
+              tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+    diff = snapshot.filter_traces(ignore).compare_to(baseline.filter_traces(ignore), "lineno")
+    rows = [{"location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             "size_kb": stat.size / 1024, "size_diff_kb": stat.size_diff / 1024,
+             "blocks": stat.count, "blocks_diff": stat.count_diff}
+            for stat in diff[:top]]
+    return pd.DataFrame(rows).round({"size_kb": 1, "size_diff_kb": 1})
+
+
+@contextmanager
+def profile_run(page, top=PROFILE_TOP):
+    """Capture a cProfile call profile and a tracemalloc snapshot of the enclosed code.
+
+    Yields a dict filled in on exit with the top functions by cumulative time, the top
+    allocation sites by memory still held compared with the start, and both captures as
+    bytes: "prof" loads with `pstats.Stats` after writing it to a file, "snapshot" with
+    `tracemalloc.Snapshot.load`. Only the calling thread is profiled.
+    """
+    capture = {"page": page, "started": datetime.now().isoformat(timespec="seconds")}
+    profiler = cProfile.Profile()
+    try:
+        with _tracing():
+            baseline = tracemalloc.take_snapshot()
+            profiler.enable()
+            try:
+                yield capture
+            finally:
+                profiler.disable()
+                snapshot = tracemalloc.take_snapshot()
+    finally:
+        profiler.create_stats()
+        capture["prof"] = marshal.dumps(profiler.stats)
+        capture["snapshot"] = pickle.dumps(snapshot)
+        capture["functions"] = _function_table(pstats.Stats(profiler).stats, top)
+        capture["allocations"] = _allocation_table(snapshot, baseline, top)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from dataset_metadata import stored_metadata
+from result_store import get_or_compute
+
+N_BLOCKS = 1000
+
+
+def _add_to_blocks(block_nulls, block_rows, nulls, offset, total_rows):
+    """Add the null indicators of rows starting at `offset` to their position-based blocks."""
+    n_blocks = len(block_rows)
+    block = np.minimum(np.arange(offset, offset + len(nulls)) * n_blocks // total_rows, n_blocks - 1)
+    # Blocks are contiguous runs of rows, so one reduceat sums every block in the chunk
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(block)) + 1])
+    ids = block[starts]
+    block_nulls[ids] += np.add.reduceat(nulls.astype(np.int64), starts, axis=0)
+    block_rows[ids] += np.diff(np.append(starts, len(nulls)))
+
+
+def compute_missingness(path, n_blocks=N_BLOCKS, chunksize=500_000, total_rows=None):
+    """Per-column null fractions for `n_blocks` consecutive row blocks plus column co-missingness counts.
+
+    Rows are assigned to blocks by position, so the result is a compact (blocks × columns)
+    picture of where values are missing, built in one chunked pass over the file. Without
+    `total_rows` or a valid metadata sidecar the row count is only known after the pass, so
+    each chunk's null indicators are kept bit-packed and assigned to blocks at the end.
+    """
+    if total_rows is None:
+        metadata = stored_metadata(path)
+        total_rows = metadata["row_count"] if metadata is not None else None
+    columns = pd.read_csv(path, nrows=0).columns
+    k = len(columns)
+
+    block_nulls = np.zeros((n_blocks, k), dtype=np.int64)
+    block_rows = np.zeros(n_blocks, dtype=np.int64)
+    co_missing = np.zeros((k, k), dtype=np.int64)
+    pending = []
+    offset = 0
+
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        nulls = chunk.isna().to_numpy()
+        if total_rows is None:
+            pending.append((offset, np.packbits(nulls, axis=1)))
+        else:
+            _add_to_blocks(block_nulls, block_rows, nulls, offset, max(total_rows, 1))
+
+        as_float = nulls.astype(np.float32)
+        co_missing += np.rint(as_float.T @ as_float).astype(np.int64)
+        offset += len(chunk)
+
+    for start, packed in pending:
+        nulls = np.unpackbits(packed, axis=1, count=k).astype(bool)
+        _add_to_blocks(block_nulls, block_rows, nulls, start, max(offset, 1))
+
+    used = block_rows > 0
+    return {
+        "rows": offset,
+        "columns": list(columns),
+        "block_null_fraction": pd.DataFrame(block_nulls[used] / block_rows[used, None], columns=columns),
+        "block_start_row": np.concatenate([[0], np.cumsum(block_rows[used])[:-1]]),
+        "null_counts": pd.Series(np.diag(co_missing), index=columns),
+        "co_missing": pd.DataFrame(co_missing, index=columns, columns=columns),
+    }
+
+
+def load_missingness(path, n_blocks=N_BLOCKS):
+    """Stored missingness profile for the current version of `path`, computed once if missing."""
+    return get_or_compute("missingness", path, lambda p: compute_missingness(p, n_blocks),
+                          {"version": 1, "n_blocks": n_blocks})
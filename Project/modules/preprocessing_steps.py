@@ -0,0 +1,191 @@
+import pandas as pd
+
+# Pipeline settings, shared with the data-quality projection shown before the run
+HIGH_MISSING_THRESHOLD = 30
+LOW_MISSING_THRESHOLD = 3
+NON_ANALYTICAL_COLUMNS = ["ID", "Source", "Description", "Street", "Country",
+                          "Zipcode", "Timezone", "Airport_Code", "Amenity"]
+BOOL_COLUMNS = ["Roundabout", "Station", "Stop", "Traffic_Calming",
+                "Traffic_Signal", "Turning_Loop"]
+REDUNDANT_COLUMNS = ["Start_Time", "End_Time", "Weather_Timestamp",
+                     "Civil_Twilight", "Nautical_Twilight",
+                     "Astronomical_Twilight", "Sunrise_Sunset"]
+# Engineered feature -> raw column it is derived from
+ENGINEERED_FEATURES = {"Duration_Minutes": "End_Time", "Year": "Start_Time", "Hour": "Start_Time",
+                       "DayOfWeek": "Start_Time", "Month": "Start_Time", "IsWeekend": "Start_Time",
+                       "IsDay": "Sunrise_Sunset"}
+
+
+def timestamp_format(values):
+    """Format `pd.to_datetime` infers for a timestamp column: the one guessed from its first non-null value."""
+    from pandas.tseries.api import guess_datetime_format
+    first = values.dropna()
+    return guess_datetime_format(str(first.iloc[0])) if len(first) else None
+
+
+def parse_timestamps(values, fmt=None):
+    """Timestamps as the pipeline parses them (unparseable values become NaT).
+
+    With `fmt` from `timestamp_format` of the whole column, parsing the column in chunks
+    gives the same result as parsing it at once: values in another format are coerced too.
+    """
+    if fmt is None:
+        fmt = timestamp_format(values)
+    return pd.to_datetime(values, format=fmt, errors="coerce")
+
+
+# -----------------------------------------------------------
+# Steps 2-14: each takes the frame and returns (frame, summary message).
+# Like the original inline pipeline, some steps modify the frame they are given.
+# -----------------------------------------------------------
+def remove_duplicates(df):
+    df = df.drop_duplicates(subset="ID")
+    return df, "Duplicates removed"
+
+
+def drop_high_missing(df):
+    missing_percent = round((df.isnull().sum() / df.shape[0]) * 100, 2)
+    remove_cols = missing_percent[missing_percent > HIGH_MISSING_THRESHOLD].index.tolist()
+    df.drop(columns=remove_cols, inplace=True)
+    return df, f"Dropped {len(remove_cols)} high-missingness columns"
+
+
+def drop_non_analytical(df):
+    drop_cols_existing = [col for col in NON_ANALYTICAL_COLUMNS if col in df.columns]
+    df = df.drop(columns=drop_cols_existing)
+    return df, f"Dropped {len(drop_cols_existing)} non-analytical columns"
+
+
+def parse_temporal(df):
+    df["Start_Time"] = parse_timestamps(df["Start_Time"])
+    df["End_Time"] = parse_timestamps(df["End_Time"])
+    rows_before = len(df)
+    df = df.dropna(subset=["Start_Time", "End_Time"])
+    return df, f"Temporal data validated ({rows_before - len(df)} invalid rows removed)"
+
+
+def validate_geographic(df):
+    df['Start_Lat'] = pd.to_numeric(df['Start_Lat'], errors='coerce')
+    df['Start_Lng'] = pd.to_numeric(df['Start_Lng'], errors='coerce')
+    rows_before = len(df)
+    df = df.dropna(subset=["Start_Lat", "Start_Lng"])
+    df.rename(columns={'Start_Lat': 'Latitude', 'Start_Lng': 'Longitude'}, inplace=True)
+    return df, f"Geographic data validated ({rows_before - len(df)} invalid rows removed)"
+
+
+def filter_severity(df):
+    rows_before = len(df)
+    df = df[df["Severity"].isin([1, 2, 3, 4])]
+    return df, f"Severity classes filtered ({rows_before - len(df)} outliers removed)"
+
+
+def drop_low_missing_rows(df):
+    missing_percent = (df.isnull().sum() / df.shape[0]) * 100
+    low_missing_cols = missing_percent[(missing_percent > 0) & (missing_percent <= LOW_MISSING_THRESHOLD)].index.tolist()
+    rows_before = len(df)
+    if low_missing_cols:
+        df.dropna(subset=low_missing_cols, inplace=True)
+    return df, f"Low-missingness rows dropped ({rows_before - len(df)} rows removed)"
+
+
+def impute_weather(df):
+    imputation_count = 0
+
+    if 'Wind_Speed(mph)' in df.columns and df['Wind_Speed(mph)'].isnull().any():
+        wind_median = df['Wind_Speed(mph)'].median()
+        count = df['Wind_Speed(mph)'].isnull().sum()
+        df['Wind_Speed(mph)'] = df['Wind_Speed(mph)'].fillna(wind_median)
+        imputation_count += count
+
+    if 'Precipitation(in)' in df.columns and df['Precipitation(in)'].isnull().any():
+        count = df['Precipitation(in)'].isnull().sum()
+        df['Precipitation(in)'] = df['Precipitation(in)'].fillna(0.0)
+        imputation_count += count
+
+    if 'Wind_Chill(F)' in df.columns and df['Wind_Chill(F)'].isnull().any():
+        reg_features = ['Wind_Speed(mph)', 'Temperature(F)', 'Humidity(%)']
+        if all(col in df.columns for col in reg_features):
+            known_wc = df[df['Wind_Chill(F)'].notna()]
+            unknown_wc = df[df['Wind_Chill(F)'].isna()]
+            if len(unknown_wc) > 0:
+                X_train = known_wc[reg_features]
+                y_train = known_wc['Wind_Chill(F)']
+                from sklearn.linear_model import LinearRegression
+                reg = LinearRegression()
+                reg.fit(X_train, y_train)
+                X_pred = unknown_wc[reg_features]
+                predicted_wc = reg.predict(X_pred)
+                df.loc[df['Wind_Chill(F)'].isna(), 'Wind_Chill(F)'] = predicted_wc
+                imputation_count += len(unknown_wc)
+
+    return df, f"Weather imputation complete ({imputation_count:,} values imputed)"
+
+
+def impute_numeric(df):
+    num_cols = df.select_dtypes(include="number").columns.tolist()
+    imputed_cols = []
+    for col in num_cols:
+        if df[col].isnull().any():
+            df[col] = df[col].fillna(df[col].median())
+            imputed_cols.append(col)
+    return df, f"General imputation complete ({len(imputed_cols)} columns)"
+
+
+def add_temporal_features(df):
+    df["Duration_Minutes"] = (df["End_Time"] - df["Start_Time"]).dt.total_seconds() / 60
+    df['Year'] = df["Start_Time"].dt.year
+    df["Hour"] = df["Start_Time"].dt.hour
+    df["DayOfWeek"] = df["Start_Time"].dt.weekday
+    df["Month"] = df["Start_Time"].dt.month
+    df["IsWeekend"] = df["DayOfWeek"].isin([5, 6]).astype(int)
+    return df, "Temporal features created (6 new features)"
+
+
+def encode_categorical(df):
+    encoded_count = 0
+    for col in BOOL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(int)
+            encoded_count += 1
+
+    if "Sunrise_Sunset" in df.columns:
+        df["IsDay"] = (df["Sunrise_Sunset"] == "Day").astype(int)
+        encoded_count += 1
+    return df, f"Categorical encoding complete ({encoded_count} features)"
+
+
+def drop_redundant(df):
+    redundant_cols_existing = [col for col in REDUNDANT_COLUMNS if col in df.columns]
+    df = df.drop(columns=redundant_cols_existing)
+    return df, f"Redundant features removed ({len(redundant_cols_existing)} columns)"
+
+
+def final_cleanup(df):
+    rows_before = len(df)
+    df = df.dropna()
+    return df, f"Final cleanup complete ({rows_before - len(df)} rows removed)"
+
+
+# Pipeline step number -> (progress message, step function); step 1 loads and step 15 saves
+TRANSFORM_STEPS = {
+    2: ("Removing duplicates...", remove_duplicates),
+    3: ("Analyzing missing values...", drop_high_missing),
+    4: ("Removing non-analytical columns...", drop_non_analytical),
+    5: ("Parsing temporal data...", parse_temporal),
+    6: ("Validating geographic coordinates...", validate_geographic),
+    7: ("Filtering severity classes...", filter_severity),
+    8: ("Handling low-missingness rows...", drop_low_missing_rows),
+    9: ("Performing targeted weather imputation...", impute_weather),
+    10: ("General numeric imputation...", impute_numeric),
+    11: ("Creating temporal features...", add_temporal_features),
+    12: ("Encoding categorical features...", encode_categorical),
+    13: ("Removing redundant features...", drop_redundant),
+    14: ("Final cleanup...", final_cleanup),
+}
+
+
+def preprocess(df):
+    """Apply steps 2-14 to a raw frame (headless, e.g. for batch jobs and benchmarks)."""
+    for _, step in TRANSFORM_STEPS.values():
+        df, _ = step(df)
+    return df
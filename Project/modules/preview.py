@@ -0,0 +1,39 @@
+import operator
+from functools import lru_cache
+import pandas as pd
+from result_store import dataset_fingerprint
+
+# Comparison operators allowed in preview filters, e.g. ("Severity", ">=", 3)
+OPERATORS = {"==": operator.eq, "!=": operator.ne, ">=": operator.ge,
+             ">": operator.gt, "<=": operator.le, "<": operator.lt}
+
+
+@lru_cache(maxsize=64)
+def _cached_preview(path, fingerprint, n, where, chunksize):
+    if not where:
+        return pd.read_csv(path, nrows=n)
+
+    found = []
+    remaining = n
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        mask = pd.Series(True, index=chunk.index)
+        for col, op, value in where:
+            mask &= OPERATORS[op](chunk[col], value)
+        match = chunk[mask].head(remaining)
+        found.append(match)
+        remaining -= len(match)
+        # Stop reading as soon as enough matching rows were found
+        if remaining <= 0:
+            break
+    return pd.concat(found, ignore_index=True) if found else pd.DataFrame()
+
+
+def preview_rows(path, n=10, where=(), chunksize=10_000):
+    """First `n` rows of a CSV, optionally only rows matching all `where` conditions.
+
+    `where` is a sequence of (column, operator, value) conditions. Only the leading part of
+    the file is parsed: `nrows` for plain previews, small chunks with early exit for
+    filtered ones. Results are cached per file version.
+    """
+    where = tuple(tuple(cond) for cond in where)
+    return _cached_preview(path, dataset_fingerprint(path), n, where, chunksize).copy()
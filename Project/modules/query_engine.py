@@ -0,0 +1,257 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from dataset_registry import query_dataset
+from filter_context import is_active
+from hypothesis_stats import (CORRELATION_COLUMNS, INSIGHT_COLUMNS, LOW_VISIBILITY_LABELS, TEMP_BINS,
+                              VISIBILITY_BINS, VISIBILITY_LABELS, insight_stats_from_chunks)
+from indicators import ROAD_FEATURES, existing_indicators
+from result_store import STORE_DIR, dataset_fingerprint, stale_versions
+
+# Aggregation backend: "pandas" (default) or "duckdb" (optional dependency)
+ENGINE_ENV = "ROADSAFE_ENGINE"
+ENGINES = ["pandas", "duckdb"]
+DUCKDB_DIR = os.path.join(STORE_DIR, "duckdb")
+
+_BUILD_LOCK = threading.Lock()
+
+
+def duckdb_available():
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def configured_engine():
+    """Engine selected by the ROADSAFE_ENGINE environment variable, falling back to pandas."""
+    name = os.environ.get(ENGINE_ENV, "pandas").strip().lower()
+    if name == "duckdb" and duckdb_available():
+        return "duckdb"
+    return "pandas"
+
+
+def _resolve(engine):
+    engine = engine or configured_engine()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}")
+    return engine
+
+
+# -----------------------------------------------------------
+# DuckDB backend
+# -----------------------------------------------------------
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def duckdb_database(path):
+    """DuckDB database file holding the current version of `path` as a table, built once from the CSV."""
+    import duckdb
+
+    base = os.path.splitext(os.path.basename(path))[0]
+    fingerprint = dataset_fingerprint(path)
+    database = os.path.join(DUCKDB_DIR, f"{base}-{fingerprint}.duckdb")
+    if os.path.exists(database):
+        return database
+    with _BUILD_LOCK:
+        if not os.path.exists(database):
+            os.makedirs(DUCKDB_DIR, exist_ok=True)
+            tmp_database = f"{database}.{os.getpid()}.tmp"
+            with duckdb.connect(tmp_database) as con:
+                con.execute("CREATE TABLE accidents AS SELECT * FROM read_csv_auto(?)", [os.path.abspath(path)])
+            os.replace(tmp_database, database)
+            # Databases of earlier versions of the file are never read again
+            for old_database in stale_versions(DUCKDB_DIR, path, fingerprint, ".duckdb"):
+                for old_file in [old_database, f"{old_database}.wal"]:
+                    if os.path.exists(old_file):
+                        try:
+                            os.remove(old_file)
+                        except OSError:
+                            pass  # still open elsewhere (Windows); removed on a later rebuild
+    return database
+
+
+def _where(ctx, columns):
+    """SQL WHERE clause and parameters for the filters of `ctx` on existing `columns`."""
+    clauses, params = [], []
+    if is_active(ctx):
+        if ctx["period"] is not None and {"Year", "Month"} <= set(columns):
+            (y0, m0), (y1, m1) = ctx["period"]
+            clauses.append('"Year" * 12 + "Month" BETWEEN ? AND ?')
+            params += [y0 * 12 + m0, y1 * 12 + m1]
+        for key, col in [("states", "State"), ("severity", "Severity"), ("weather", "Weather_Condition")]:
+            if ctx[key] is not None and col in columns:
+                clauses.append(f"{_quote(col)} IN ({', '.join('?' * len(ctx[key]))})")
+                params += [v.item() if hasattr(v, "item") else v for v in ctx[key]]
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _connect(path):
+    import duckdb
+
+    return duckdb.connect(duckdb_database(path), read_only=True)
+
+
+def _columns(con):
+    return [row[0] for row in con.execute("DESCRIBE accidents").fetchall()]
+
+
+def _duckdb_query(con, sql, ctx=None):
+    """Run `sql` against the rows matching `ctx`, exposed to the query as `t`."""
+    where, params = _where(ctx, _columns(con))
+    return con.execute(f"WITH t AS NOT MATERIALIZED (SELECT * FROM accidents{where}) {sql}", params).df()
+
+
+def _bin_case(column, edges, closed="right", include_lowest=False):
+    """SQL CASE expression giving the 0-based `pd.cut` bin of `column` (NULL outside the bins)."""
+    col = _quote(column)
+    cases = []
+    for i, (low, high) in enumerate(zip(edges[:-1], edges[1:])):
+        if closed == "left":
+            cond = f"{col} >= {low}" + ("" if np.isinf(high) else f" AND {col} < {high}")
+        else:
+            low_op = ">=" if include_lowest and i == 0 else ">"
+            cond = f"{col} {low_op} {low}" + ("" if np.isinf(high) else f" AND {col} <= {high}")
+        cases.append(f"WHEN {cond} THEN {i}")
+    return f"CASE {' '.join(cases)} END"
+
+
+def _crosstab_frame(rows, index_name):
+    table = rows.pivot(index="key", columns="Severity", values="n").fillna(0).astype("int64")
+    table.index.name, table.columns.name = index_name, "Severity"
+    return table
+
+
+def _duckdb_insight_stats(con, ctx=None):
+    columns = _columns(con)
+    road_features = existing_indicators(columns, ROAD_FEATURES)
+    sev = 'CAST("Severity" AS DOUBLE)'
+    q = lambda sql: _duckdb_query(con, sql, ctx)
+
+    rows = int(q('SELECT count(*) AS n FROM t WHERE "Severity" IS NOT NULL')["n"].iloc[0])
+    stats = {"rows": rows, "weather": None, "hourly": None, "temp_bins": None, "visibility": None,
+             "low_visibility": None, "rain": None, "pearson": {}, "road": None}
+    valid = 'WHERE "Severity" IS NOT NULL'
+
+    if "Weather_Condition" in columns:
+        weather = q(f'SELECT "Weather_Condition" AS key, count(*) AS n, sum({sev}) AS s, '
+                    f'sum({sev} * {sev}) AS ss FROM t {valid} AND "Weather_Condition" IS NOT NULL GROUP BY 1')
+        stats["weather"] = weather.set_index("key").sort_index().astype({"n": "int64"})
+        rain = q(f'SELECT coalesce(lower("Weather_Condition") LIKE \'%rain%\', false) AS key, "Severity", '
+                 f'count(*) AS n FROM t {valid} GROUP BY 1, 2')
+        stats["rain"] = _crosstab_frame(rain, "Weather_Condition")
+
+    if "Hour" in columns:
+        hourly = q(f'SELECT "Hour", count(*) AS count FROM t {valid} AND "Hour" IS NOT NULL GROUP BY 1 ORDER BY 1')
+        stats["hourly"] = hourly.set_index("Hour")["count"].astype("int64")
+
+    if "Temperature(F)" in columns:
+        temp = q(f'SELECT {_bin_case("Temperature(F)", TEMP_BINS, closed="left")} AS bin, count(*) AS n, '
+                 f'sum({sev}) AS s, sum({sev} * {sev}) AS ss FROM t {valid} GROUP BY 1')
+        temp = temp.dropna(subset=["bin"]).set_index("bin").reindex(range(len(TEMP_BINS) - 1), fill_value=0)
+        temp.index = pd.CategoricalIndex(pd.IntervalIndex.from_breaks(TEMP_BINS, closed="left"),
+                                         ordered=True, name="key")
+        stats["temp_bins"] = temp.astype({"n": "int64", "s": "float64", "ss": "float64"})
+
+    if "Visibility(mi)" in columns:
+        vis_bin = _bin_case("Visibility(mi)", VISIBILITY_BINS, include_lowest=True)
+        vis = q(f'SELECT {vis_bin} AS bin, "Severity", count(*) AS n FROM t {valid} GROUP BY 1, 2')
+        labels = pd.Series(VISIBILITY_LABELS)
+        counts = vis.dropna(subset=["bin"]).groupby("bin")["n"].sum()
+        counts.index = labels[counts.index.astype(int)].to_numpy()
+        stats["visibility"] = counts.reindex(VISIBILITY_LABELS, fill_value=0).astype("int64").rename("count")
+        stats["visibility"].index.name = "Visibility(mi)"
+        low_bins = [VISIBILITY_LABELS.index(label) for label in LOW_VISIBILITY_LABELS]
+        vis["key"] = vis["bin"].isin(low_bins)
+        low = vis.groupby(["key", "Severity"], as_index=False)["n"].sum()
+        stats["low_visibility"] = _crosstab_frame(low, "Visibility(mi)")
+
+    for col in [c for c in CORRELATION_COLUMNS if c in columns]:
+        x = f"({_quote(col)} - m.mx)"
+        y = f"({sev} - m.my)"
+        acc = q(f'SELECT count(*) AS n, any_value(m.mx) AS shift_x, any_value(m.my) AS shift_y, '
+                f'sum({x}) AS sx, sum({y}) AS sy, sum({x} * {x}) AS sxx, sum({y} * {y}) AS syy, '
+                f'sum({x} * {y}) AS sxy FROM t, (SELECT avg({_quote(col)}) AS mx, avg({sev}) AS my FROM t '
+                f'{valid} AND {_quote(col)} IS NOT NULL) AS m {valid} AND {_quote(col)} IS NOT NULL')
+        acc = acc.iloc[0].to_dict()
+        if acc["n"]:
+            stats["pearson"][col] = {k: (int(v) if k == "n" else float(v)) for k, v in acc.items()}
+
+    if road_features:
+        # One small grouped aggregate per feature; NULL indicator values never match 0 or 1
+        moments = q(" UNION ALL ".join(
+            f"SELECT '{f}' AS feature, CAST({_quote(f)} AS DOUBLE) AS v, count(*) AS n, sum({sev}) AS s, "
+            f"sum({sev} * {sev}) AS ss FROM t {valid} AND CAST({_quote(f)} AS DOUBLE) IN (0, 1) GROUP BY 2"
+            for f in road_features))
+        road = moments.pivot(index="feature", columns="v", values=["n", "s", "ss"])
+        road = road.reindex(index=road_features, columns=pd.MultiIndex.from_product([["n", "s", "ss"], [1.0, 0.0]]))
+        road.columns = [f"{m}{int(v)}" for m, v in road.columns]
+        stats["road"] = road[["n1", "s1", "ss1", "n0", "s0", "ss0"]].fillna(0.0).astype("float64")
+    return stats
+
+
+# -----------------------------------------------------------
+# Engine-independent entry points
+# -----------------------------------------------------------
+def decoded(df):
+    """Registry frame with categorical columns as plain values (groups only observed values)."""
+    return df.astype({col: object for col in df.columns if df[col].dtype == "category"})
+
+
+def insight_stats(path, ctx=None, engine=None):
+    """Insight sufficient statistics (see `compute_insight_stats`) for the rows of `path` matching `ctx`."""
+    if _resolve(engine) == "duckdb":
+        with _connect(path) as con:
+            return _duckdb_insight_stats(con, ctx)
+    header = [c for c in INSIGHT_COLUMNS if c in query_dataset(path).columns]
+    return insight_stats_from_chunks([decoded(query_dataset(path, ctx, header))], header)
+
+
+def value_counts(path, column, ctx=None, engine=None):
+    """Number of rows per non-missing value of `column`, largest first."""
+    if _resolve(engine) == "duckdb":
+        with _connect(path) as con:
+            counts = _duckdb_query(con, f"SELECT {_quote(column)} AS value, count(*) AS count FROM t "
+                                        f"WHERE {_quote(column)} IS NOT NULL GROUP BY 1", ctx)
+        counts = counts.set_index("value")["count"].astype("int64")
+    else:
+        counts = query_dataset(path, ctx, [column])[column].value_counts()
+        counts = counts[counts > 0]
+    counts.index.name = column
+    return counts.rename("count").sort_values(ascending=False, kind="stable")
+
+
+def _duckdb_crosstab(con, row, column, ctx):
+    pairs = _duckdb_query(con, f"SELECT {_quote(row)} AS r, {_quote(column)} AS c, count(*) AS n FROM t "
+                               f"WHERE {_quote(row)} IS NOT NULL AND {_quote(column)} IS NOT NULL "
+                               f"GROUP BY 1, 2", ctx)
+    return pairs.pivot(index="r", columns="c", values="n").fillna(0).astype("int64")
+
+
+def crosstabs(path, pairs, ctx=None, engine=None):
+    """Contingency tables (as `crosstab`) for several (row, column) pairs, keyed by pair.
+
+    The pandas engine reads every needed column in one query, so all pairs share a single
+    cached frame; the DuckDB engine runs every pair on one connection.
+    """
+    pairs = list(pairs)
+    if _resolve(engine) == "duckdb":
+        with _connect(path) as con:
+            tables = {(row, column): _duckdb_crosstab(con, row, column, ctx) for row, column in pairs}
+    else:
+        columns = list(dict.fromkeys(col for pair in pairs for col in pair))
+        data = decoded(query_dataset(path, ctx, columns))
+        tables = {(row, column): pd.crosstab(data[row], data[column]) for row, column in pairs}
+    for (row, column), table in tables.items():
+        table.index.name, table.columns.name = row, column
+        tables[row, column] = table.sort_index().sort_index(axis=1)
+    return tables
+
+
+def crosstab(path, row, column, ctx=None, engine=None):
+    """Contingency table of `row` × `column` over rows where both are present (observed values only)."""
+    return crosstabs(path, [(row, column)], ctx, engine)[row, column]
@@ -0,0 +1,180 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+# Worker-side copy of the samples, set once per process by `_init_worker`
+_WORKER_DATA = None
+
+
+def _init_worker(data):
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def _statistic(kind, a, b):
+    """Observed statistic: difference in means (two_sample) or Pearson r (correlation)."""
+    if kind == "two_sample":
+        return a.mean() - b.mean()
+    ac, bc = a - a.mean(), b - b.mean()
+    return (ac @ bc) / np.sqrt((ac @ ac) * (bc @ bc))
+
+
+def _permutation_batch(kind, a, b, size, rng):
+    """`size` statistics under the null hypothesis, computed as one matrix operation."""
+    if kind == "two_sample":
+        pooled = np.concatenate([a, b])
+        labels = np.zeros(len(pooled))
+        labels[:len(a)] = 1.0
+        shuffled = rng.permuted(np.tile(labels, (size, 1)), axis=1)
+        sum_a = shuffled @ pooled
+        return sum_a / len(a) - (pooled.sum() - sum_a) / len(b)
+    ac = a - a.mean()
+    bc = b - b.mean()
+    shuffled = rng.permuted(np.tile(bc, (size, 1)), axis=1)
+    return (shuffled @ ac) / np.sqrt((ac @ ac) * (bc @ bc))
+
+
+def _bootstrap_batch(kind, a, b, size, rng):
+    """`size` bootstrap replicates of the statistic, computed as one matrix operation."""
+    if kind == "two_sample":
+        mean_a = a[rng.integers(0, len(a), (size, len(a)))].mean(axis=1)
+        mean_b = b[rng.integers(0, len(b), (size, len(b)))].mean(axis=1)
+        return mean_a - mean_b
+    idx = rng.integers(0, len(a), (size, len(a)))
+    ra, rb = a[idx], b[idx]
+    ra = ra - ra.mean(axis=1, keepdims=True)
+    rb = rb - rb.mean(axis=1, keepdims=True)
+    return (ra * rb).sum(axis=1) / np.sqrt((ra * ra).sum(axis=1) * (rb * rb).sum(axis=1))
+
+
+_BATCH_FUNCTIONS = {"permutation": _permutation_batch, "bootstrap": _bootstrap_batch}
+
+
+def _run_batch(method, kind, size, seed_seq):
+    a, b = _WORKER_DATA
+    return _BATCH_FUNCTIONS[method](kind, a, b, size, np.random.default_rng(seed_seq))
+
+
+def _wilson_interval(successes, trials, z=2.576):
+    """Wilson score interval for a binomial proportion (99% by default)."""
+    p = successes / trials
+    denom = 1 + z ** 2 / trials
+    center = (p + z ** 2 / (2 * trials)) / denom
+    half = z * np.sqrt(p * (1 - p) / trials + z ** 2 / (4 * trials ** 2)) / denom
+    return center - half, center + half
+
+
+def _resample(method, kind, a, b, n_resamples, batch_size, seed, time_budget, n_jobs, stop_check):
+    """Generate resampled statistics in seeded batches, optionally on a process pool.
+
+    Batch i always uses the i-th child of SeedSequence(seed) and results are consumed in
+    batch order, so the output does not depend on the number of workers. `stop_check` is
+    called with the statistics gathered so far and returns True to stop early.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    if batch_size is None:
+        # Bound each batch to a few million matrix cells regardless of sample size
+        batch_size = int(np.clip(4_000_000 // (len(a) + len(b)), 10, 500))
+    n_batches = int(np.ceil(n_resamples / batch_size))
+    seeds = np.random.SeedSequence(seed).spawn(n_batches)
+    sizes = [min(batch_size, n_resamples - i * batch_size) for i in range(n_batches)]
+    start = time.perf_counter()
+    results = []
+    reason = "complete"
+
+    if n_jobs == 1:
+        _init_worker((a, b))
+        for i in range(n_batches):
+            if time.perf_counter() - start > time_budget:
+                reason = "time budget"
+                break
+            results.append(_run_batch(method, kind, sizes[i], seeds[i]))
+            if stop_check(np.concatenate(results)):
+                reason = "stable"
+                break
+        return np.concatenate(results) if results else np.array([]), reason, time.perf_counter() - start
+
+    pool = ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=((a, b),))
+    try:
+        workers = n_jobs or os.cpu_count() or 1
+        pending, done = {}, {}
+        next_batch = next_result = 0
+        while next_result < n_batches:
+            if time.perf_counter() - start > time_budget:
+                reason = "time budget"
+                break
+            # Keep every worker busy with a small look-ahead window of batches
+            while next_batch < n_batches and len(pending) < 2 * workers:
+                future = pool.submit(_run_batch, method, kind, sizes[next_batch], seeds[next_batch])
+                pending[future] = next_batch
+                next_batch += 1
+            finished, _ = wait(pending, timeout=max(time_budget - (time.perf_counter() - start), 0),
+                               return_when=FIRST_COMPLETED)
+            for future in finished:
+                done[pending.pop(future)] = future.result()
+            stop = False
+            while next_result in done:
+                results.append(done.pop(next_result))
+                next_result += 1
+                if stop_check(np.concatenate(results)):
+                    stop = True
+                    break
+            if stop:
+                reason = "stable"
+                break
+    finally:
+        # Return without waiting: queued batches are cancelled and running ones finish in the background
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return np.concatenate(results) if results else np.array([]), reason, time.perf_counter() - start
+
+
+def permutation_test(a, b, kind="two_sample", n_resamples=20_000, batch_size=None, alpha=0.05,
+                     seed=0, time_budget=10.0, n_jobs=None, min_resamples=2_000):
+    """Two-sided permutation test of a difference in means (two_sample) or a correlation.
+
+    For `kind="two_sample"`, `a` and `b` are the two groups; for `kind="correlation"` they are
+    paired observations. Stops early once a 99% interval for the p-value lies entirely on one
+    side of `alpha`, or when `time_budget` seconds have elapsed.
+    """
+    observed = _statistic(kind, np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+
+    def p_value(null):
+        return (np.sum(np.abs(null) >= abs(observed)) + 1) / (len(null) + 1)
+
+    def decision_stable(null):
+        if len(null) < min_resamples:
+            return False
+        low, high = _wilson_interval(np.sum(np.abs(null) >= abs(observed)), len(null))
+        return high < alpha or low > alpha
+
+    null, reason, elapsed = _resample("permutation", kind, a, b, n_resamples, batch_size,
+                                      seed, time_budget, n_jobs, decision_stable)
+    return {
+        "statistic": float(observed),
+        "p_value": float(p_value(null)) if len(null) else np.nan,
+        "n_resamples": len(null),
+        "stopped": reason,
+        "elapsed": elapsed,
+    }
+
+
+def bootstrap_ci(a, b, kind="two_sample", n_resamples=5_000, batch_size=None, confidence=0.95,
+                 seed=0, time_budget=10.0, n_jobs=None):
+    """Percentile bootstrap confidence interval for the mean difference or the correlation."""
+    estimate = _statistic(kind, np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    replicates, reason, elapsed = _resample("bootstrap", kind, a, b, n_resamples, batch_size,
+                                            seed, time_budget, n_jobs, lambda _: False)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(replicates, [tail, 100 - tail]) if len(replicates) else (np.nan, np.nan)
+    return {
+        "estimate": float(estimate),
+        "ci_low": float(low),
+        "ci_high": float(high),
+        "n_resamples": len(replicates),
+        "stopped": reason,
+        "elapsed": elapsed,
+    }
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+# Persisted results live next to the data so they survive server restarts
+STORE_DIR = "data/.cache"
+
+# Background computations in progress, keyed by result file path
+_RUNNING = {}
+_LOCK = threading.Lock()
+
+
+def dataset_fingerprint(path, sample_bytes=65536):
+    """Fingerprint of a data file: size, modification time and a hash of its first and last bytes."""
+    info = os.stat(path)
+    digest = hashlib.sha1(f"{info.st_size}:{info.st_mtime_ns}".encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(sample_bytes))
+        if info.st_size > sample_bytes:
+            f.seek(max(info.st_size - sample_bytes, sample_bytes))
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def stale_versions(directory, path, fingerprint, suffix=""):
+    """Entries `{base}-{fingerprint}{suffix}` of `directory` built for other versions of `path`.
+
+    Temporary entries still being written (`...{suffix}.<pid>.<thread>.tmp`) never match.
+    """
+    base = os.path.splitext(os.path.basename(path))[0]
+    if not os.path.isdir(directory):
+        return []
+    stale = []
+    for name in os.listdir(directory):
+        if not (name.startswith(f"{base}-") and name.endswith(suffix)):
+            continue
+        other = name[len(base) + 1:len(name) - len(suffix)]
+        if len(other) == len(fingerprint) and other != fingerprint and all(c in "0123456789abcdef" for c in other):
+            stale.append(os.path.join(directory, name))
+    return stale
+
+
+def _result_path(namespace, path, params):
+    key = json.dumps({"data": os.path.abspath(path), "fingerprint": dataset_fingerprint(path),
+                      "params": params}, sort_keys=True, default=str)
+    name = hashlib.sha1(key.encode()).hexdigest()[:20]
+    return os.path.join(STORE_DIR, namespace, f"{name}.pkl")
+
+
+def load_result(namespace, path, params=None):
+    """Stored result for the current version of `path` and `params`, or None."""
+    result_path = _result_path(namespace, path, params)
+    if not os.path.exists(result_path):
+        return None
+    with open(result_path, "rb") as f:
+        return pickle.load(f)
+
+
+def save_result(namespace, path, value, params=None):
+    """Persist `value` for the current version of `path` (written atomically)."""
+    result_path = _result_path(namespace, path, params)
+    os.makedirs(os.path.dirname(result_path), exist_ok=True)
+    tmp_path = f"{result_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, result_path)
+
+
+def get_or_compute(namespace, path, compute, params=None):
+    """Return the stored result, waiting for a background run or computing it (`compute(path)`) if missing."""
+    result_path = _result_path(namespace, path, params)
+    with _LOCK:
+        running = _RUNNING.get(result_path)
+    if running is not None:
+        running.join()
+
+    value = load_result(namespace, path, params)
+    if value is None:
+        value = compute(path)
+        save_result(namespace, path, value, params)
+    return value
+
+
+def compute_in_background(namespace, path, compute, params=None):
+    """Start computing and persisting a result on a daemon thread; returns the thread."""
+    result_path = _result_path(namespace, path, params)
+
+    def work():
+        try:
+            save_result(namespace, path, compute(path), params)
+        finally:
+            with _LOCK:
+                _RUNNING.pop(result_path, None)
+
+    with _LOCK:
+        if result_path in _RUNNING:
+            return _RUNNING[result_path]
+        thread = threading.Thread(target=work, name=f"result-store-{namespace}", daemon=True)
+        _RUNNING[result_path] = thread
+        thread.start()
+    return thread
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from aggregate_cube import CUBE_MARGINALS, build_cube, build_cube_from_csv, cube_cells, cube_total
+from analytics import context_cube
+from filter_context import apply_context, make_context
+
+
+def test_chunked_marginals_match_value_counts(accident_csv):
+    path, df = accident_csv
+    cube = build_cube_from_csv(path, chunksize=700)
+    assert set(cube) == set(CUBE_MARGINALS)
+    assert cube_cells(cube) < len(df) / 10
+
+    for dimension in ["State", "City", "Hour", "Weather_Condition", "Severity"]:
+        assert cube_total(cube, dimension).to_dict() == df[dimension].value_counts().to_dict()
+    periods = cube["Period"].set_index(["Year", "Month"])["count"].sort_index()
+    pd.testing.assert_series_equal(periods, df.groupby(["Year", "Month"]).size(),
+                                   check_names=False, check_dtype=False, check_index_type=False)
+    totals = cube["Total"].iloc[0]
+    assert totals["count"] == len(df)
+    assert totals["Crossing"] == df["Crossing"].sum()
+    assert totals["IsWeekend"] == df["IsWeekend"].sum()
+
+
+def test_context_cube_aggregates_matching_rows(accident_csv):
+    path, df = accident_csv
+    ctx = make_context(period=((2018, 1), (2020, 12)), states=["CA", "TX"], severity=[2, 3])
+    result = context_cube(path, ctx)
+    expected = build_cube(apply_context(df, ctx))
+    for name in CUBE_MARGINALS:
+        dims = CUBE_MARGINALS[name]
+        left = result[name].sort_values(dims, ignore_index=True) if dims else result[name]
+        right = expected[name].sort_values(dims, ignore_index=True) if dims else expected[name]
+        pd.testing.assert_frame_equal(left, right, check_dtype=False, check_categorical=False)
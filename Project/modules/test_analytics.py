@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import cramers_v, cramers_v_matrix, pairwise_histograms
+from filter_context import apply_context, make_context
+
+
+def test_pairwise_histograms_match_numpy(accident_csv):
+    path, df = accident_csv
+    features = ["Temperature(F)", "Visibility(mi)", "Hour"]
+    result = pairwise_histograms(path, features, bins=20, chunk_rows=1_000)
+    edges = result["edges"]
+    data = df[features].astype(np.float32)
+
+    for i, a in enumerate(features):
+        # Outliers are clipped into the edge bins
+        values = data[a].dropna().clip(edges[i][0], edges[i][-1])
+        np.testing.assert_array_equal(result["hist1d"][i], np.histogram(values, edges[i])[0])
+        for j, b in enumerate(features):
+            if i == j:
+                continue
+            pair = data[[a, b]].dropna()
+            expected = np.histogram2d(pair[a].clip(edges[i][0], edges[i][-1]),
+                                      pair[b].clip(edges[j][0], edges[j][-1]), [edges[i], edges[j]])[0]
+            np.testing.assert_array_equal(result["hist2d"][i, j], expected)
+
+
+def test_cramers_v_matrix_matches_pairwise_crosstabs(accident_csv):
+    path, df = accident_csv
+    features = ["State", "City", "Weather_Condition", "Severity"]
+    ctx = make_context(states=["CA", "TX", "OH"])
+    rows = apply_context(df, ctx)
+    matrix = cramers_v_matrix(path, features, ctx)
+    for i, a in enumerate(features):
+        for j, b in enumerate(features):
+            expected = 1.0 if i == j else cramers_v(pd.crosstab(rows[a], rows[b]))
+            assert matrix[i, j] == pytest.approx(np.nan_to_num(expected))
@@ -0,0 +1,97 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_quality import _byte_ranges, _merge, _profile_range, profile_dataset, projected_outcome
+from preprocessing_steps import (ENGINEERED_FEATURES, HIGH_MISSING_THRESHOLD, LOW_MISSING_THRESHOLD,
+                                 NON_ANALYTICAL_COLUMNS, REDUNDANT_COLUMNS, parse_timestamps, preprocess)
+
+# The synthetic raw data generator lives with the benchmarks
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks"))
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    rng = np.random.default_rng(5)
+    n = 3_000
+    df = pd.DataFrame({
+        "ID": [f"A-{i}" for i in rng.integers(0, 2_900, n)],
+        "Severity": rng.choice([1, 2, 3, 4, 7], n, p=[0.1, 0.6, 0.2, 0.09, 0.01]),
+        "Start_Time": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 10**8, n), unit="s"),
+        "Start_Lat": rng.uniform(25, 49, n),
+        "Start_Lng": rng.uniform(-125, -67, n),
+        "City": rng.choice(["Springfield", "Riverside", "Fairview", None], n),
+        "Wind_Speed(mph)": rng.exponential(8, n).round(1),
+    })
+    df["Start_Time"] = df["Start_Time"].astype(str)
+    df.loc[rng.random(n) < 0.01, "Start_Time"] = "not a time"
+    df.loc[rng.random(n) < 0.01, "Start_Lat"] = 123.0
+    df.loc[rng.random(n) < 0.2, "Wind_Speed(mph)"] = np.nan
+    path = tmp_path / "raw.csv"
+    df.to_csv(path, index=False)
+    return str(path), pd.read_csv(path)
+
+
+def test_byte_ranges_cover_every_data_line_once(raw_csv):
+    path, _ = raw_csv
+    with open(path, "rb") as f:
+        content = f.read()
+    ranges = _byte_ranges(path, 7)
+    assert len(ranges) == 7
+    data = b"".join(content[start:end] for start, end in ranges)
+    assert data == content[content.index(b"\n") + 1:]
+    assert all(content[start - 1:start] == b"\n" for start, _ in ranges)
+
+
+def test_merged_byte_ranges_match_single_pass(raw_csv):
+    path, df = raw_csv
+    names = list(df.columns)
+    single = _merge([_profile_range(path, *_byte_ranges(path, 1)[0], names, 10_000, {})], names)
+    merged = _merge([_profile_range(path, start, end, names, 250, {})
+                     for start, end in _byte_ranges(path, 7)], names)
+
+    assert merged["rows"] == single["rows"] == len(df)
+    pd.testing.assert_frame_equal(merged["columns"], single["columns"])
+    for key in ["duplicate_ids", "invalid_severity"]:
+        assert merged[key] == single[key]
+    for key in ["unparseable_timestamps", "out_of_range_coordinates", "null_patterns"]:
+        pd.testing.assert_series_equal(merged[key].sort_index(), single[key].sort_index(), check_dtype=False)
+
+
+def test_profile_matches_pandas(raw_csv):
+    path, df = raw_csv
+    report = profile_dataset(path, n_jobs=2, chunksize=400)
+    columns = report["columns"]
+
+    pd.testing.assert_series_equal(columns["nulls"], df.isna().sum(), check_names=False)
+    pd.testing.assert_series_equal(columns["cardinality"], df.nunique(), check_names=False)
+    numeric = df.select_dtypes("number").columns
+    np.testing.assert_allclose(columns.loc[numeric, "mean"].astype(float), df[numeric].mean())
+    np.testing.assert_allclose(columns.loc[numeric, "max"].astype(float), df[numeric].max())
+    assert report["duplicate_ids"] == df["ID"].duplicated().sum()
+    assert report["invalid_severity"] == (~df["Severity"].isin([1, 2, 3, 4])).sum()
+    assert report["out_of_range_coordinates"]["Start_Lat"] == (df["Start_Lat"] > 90).sum()
+    assert report["unparseable_timestamps"]["Start_Time"] == (df["Start_Time"] == "not a time").sum()
+    assert report["null_patterns"].sum() == len(df)
+
+
+def test_projected_outcome_matches_pipeline_run(tmp_path):
+    from synthetic_accidents import generate
+    path = generate(str(tmp_path / "raw.csv"), 20_000, seed=3, n_jobs=1)
+    raw = pd.read_csv(path)
+    report = profile_dataset(path, n_jobs=2, chunksize=3_000)
+
+    # Timestamps are counted as unparseable exactly when the pipeline cannot parse them
+    for col in ["Start_Time", "End_Time"]:
+        expected = (parse_timestamps(raw[col]).isna() & raw[col].notna()).sum()
+        assert report["unparseable_timestamps"][col] == expected > 0
+
+    outcome = projected_outcome(report, NON_ANALYTICAL_COLUMNS, REDUNDANT_COLUMNS, ENGINEERED_FEATURES,
+                                HIGH_MISSING_THRESHOLD, LOW_MISSING_THRESHOLD)
+    result = preprocess(raw)
+    assert outcome["columns"] == result.shape[1]
+    # Overlapping removals are subtracted twice, so the projection is a close lower bound
+    assert 0.98 * len(result) <= outcome["rows"] <= len(result)
@@ -0,0 +1,31 @@
+import json
+import os
+import sys
+
+import pandas as pd
+
+from dataset_metadata import build_metadata, load_metadata, metadata_path
+from preprocessing_steps import parse_timestamps
+
+# The synthetic raw data generator lives with the benchmarks
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks"))
+
+
+def test_date_range_ignores_malformed_timestamps(tmp_path):
+    from synthetic_accidents import generate
+    path = generate(str(tmp_path / "raw.csv"), 10_000, seed=4, n_jobs=1)
+    times = parse_timestamps(pd.read_csv(path, usecols=["Start_Time"])["Start_Time"]).dropna()
+    metadata = build_metadata(path, chunksize=1_500)
+
+    assert metadata["row_count"] == 10_000
+    assert metadata["date_range"] == {"min": times.min().strftime("%Y-%m-%d %H:%M:%S"),
+                                      "max": times.max().strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def test_sidecar_written_without_temporary_files(accident_csv):
+    path, df = accident_csv
+    metadata = load_metadata(path)
+    with open(metadata_path(path)) as f:
+        assert json.load(f) == metadata
+    assert not [name for name in os.listdir("data") if name.endswith(".tmp")]
+    assert metadata["date_range"]["min"] == f"{df['Year'].min()}-01"
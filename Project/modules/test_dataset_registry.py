@@ -0,0 +1,67 @@
+import os
+
+import pandas as pd
+import pytest
+
+import dataset_registry
+from dataset_registry import open_column_store, query_dataset, query_plan
+from filter_context import apply_context, make_context
+
+CONTEXTS = {
+    "period": make_context(period=((2018, 3), (2019, 6))),
+    "states": make_context(states=["TX", "WA"]),
+    "period_states_severity": make_context(period=((2020, 1), (2020, 12)), states=["CA"], severity=[3, 4]),
+    "weather": make_context(weather=["Rain", "Snow"]),
+    "no_match": make_context(period=((2030, 1), (2030, 12))),
+}
+
+
+@pytest.fixture(autouse=True)
+def small_row_groups(monkeypatch):
+    # Many row groups even for a small file, so pruning has something to skip
+    monkeypatch.setattr(dataset_registry, "ROW_GROUP_ROWS", 250)
+
+
+def _by_id(df):
+    return df.sort_values("ID", ignore_index=True)
+
+
+@pytest.mark.parametrize("name", CONTEXTS)
+def test_pruned_query_matches_pandas_filter(accident_csv, name):
+    path, df = accident_csv
+    ctx = CONTEXTS[name]
+    columns = ["ID", "Severity", "Temperature(F)", "Crossing"]
+    result = query_dataset(path, ctx, columns)
+    expected = apply_context(df, ctx)[columns]
+    pd.testing.assert_frame_equal(_by_id(result), _by_id(expected))
+
+
+def test_filters_on_sort_columns_skip_row_groups(accident_csv):
+    path, _ = accident_csv
+    read, total = query_plan(path, CONTEXTS["period_states_severity"])
+    assert total == 20
+    assert read < total / 4
+    assert query_plan(path, CONTEXTS["no_match"])[0] == 0
+
+
+def test_column_store_keeps_csv_dtypes(accident_csv):
+    path, df = accident_csv
+    store = open_column_store(path)
+    numeric = df.select_dtypes(include=["number", "bool"]).columns
+    pd.testing.assert_series_equal(store.dtypes[numeric], df.dtypes[numeric])
+    pd.testing.assert_frame_equal(_by_id(store[numeric]), _by_id(df[numeric]))
+    assert (_by_id(store)["State"].astype(object) == _by_id(df)["State"]).all()
+
+
+def test_rebuilding_removes_stores_of_earlier_versions(accident_csv):
+    path, df = accident_csv
+    # Another dataset whose name starts with the same base keeps its store
+    df.to_csv("data/accidents-2022.csv", index=False)
+    other = dataset_registry.write_column_store("data/accidents-2022.csv")
+    first = dataset_registry.write_column_store(path)
+    df.iloc[:-1].to_csv(path, index=False)
+    second = dataset_registry.write_column_store(path)
+
+    assert second != first
+    assert sorted(os.listdir(dataset_registry.COLUMN_STORE_DIR)) == sorted([os.path.basename(other),
+                                                                             os.path.basename(second)])
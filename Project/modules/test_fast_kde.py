@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from scipy.stats import gaussian_kde
+
+from fast_kde import binned_kde, linear_bin
+
+_rng = np.random.default_rng(0)
+SAMPLES = {
+    "normal": _rng.normal(50, 10, 5_000),
+    "bimodal": np.concatenate([_rng.normal(0, 1, 3_000), _rng.normal(8, 0.5, 1_000)]),
+    "skewed": _rng.exponential(2, 5_000),
+}
+
+
+@pytest.mark.parametrize("name", SAMPLES)
+def test_binned_kde_matches_gaussian_kde(name):
+    values = SAMPLES[name]
+    x = np.linspace(values.min() - 1, values.max() + 1, 300)
+    expected = gaussian_kde(values)(x)
+    assert np.abs(binned_kde(values, x) - expected).max() < 1e-3 * expected.max()
+
+
+def test_binned_kde_ignores_missing_values():
+    values = np.random.default_rng(4).normal(size=2_000)
+    x = np.linspace(-4, 4, 50)
+    with_nan = np.concatenate([values, [np.nan] * 100])
+    np.testing.assert_allclose(binned_kde(with_nan, x), binned_kde(values, x))
+
+
+def test_linear_bin_keeps_count_and_mean():
+    values = np.random.default_rng(5).uniform(3, 7, 1_000)
+    lo, dx, size = 3.0, 0.01, 402
+    counts = linear_bin(values, lo, dx, size)
+    assert counts.sum() == pytest.approx(len(values))
+    assert (counts * (lo + np.arange(size) * dx)).sum() / len(values) == pytest.approx(values.mean())
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from heavy_hitters import SpaceSaving, top_n
+
+
+@pytest.fixture
+def stream():
+    # Zipf-like values with a long tail, so a small sketch has to evict
+    rng = np.random.default_rng(11)
+    return pd.Series(rng.zipf(1.3, 20_000) % 500).astype(str)
+
+
+def _batches(values, size=2_500):
+    return [values.iloc[i:i + size] for i in range(0, len(values), size)]
+
+
+def _assert_bounds(sketch, values):
+    true = values.value_counts()
+    tracked = sketch.table.index
+    lower = sketch.table["count"] - sketch.table["error"]
+    assert (lower <= true[tracked]).all()
+    assert (true[tracked] <= sketch.table["count"]).all()
+    assert (true.drop(tracked) <= sketch.floor).all()
+    assert sketch.total == len(values)
+
+
+def test_streamed_updates_bound_true_counts(stream):
+    sketch = SpaceSaving(capacity=20)
+    for batch in _batches(stream):
+        sketch.update(batch)
+    assert sketch.floor > 0
+    _assert_bounds(sketch, stream)
+
+
+def test_merged_sketches_bound_true_counts(stream):
+    parts = [SpaceSaving(capacity=20).update(batch) for batch in _batches(stream)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    _assert_bounds(merged, stream)
+
+
+@pytest.mark.parametrize("capacity", [5, 20, 1_000])
+def test_top_n_is_exact(stream, capacity):
+    sketch = SpaceSaving(capacity=capacity)
+    for batch in _batches(stream):
+        sketch.update(batch)
+    true = stream.value_counts()
+
+    def exact_counts(keys):
+        return true if keys is None else true[keys]
+
+    pd.testing.assert_series_equal(top_n(sketch, 5, exact_counts), true.nlargest(5))
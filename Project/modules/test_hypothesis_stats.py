@@ -0,0 +1,77 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from hypothesis_stats import (CORRELATION_COLUMNS, batched_indicator_ttests, insight_stats_from_chunks,
+                              pearson_from_moments, ttest_from_moments)
+
+
+@pytest.fixture
+def accidents():
+    rng = np.random.default_rng(7)
+    n = 3_000
+    df = pd.DataFrame({
+        "Severity": rng.integers(1, 5, n),
+        "Weather_Condition": rng.choice(["Clear", "Rain", "Light Rain", "Fog"], n),
+        "Hour": rng.integers(0, 24, n),
+        "Visibility(mi)": rng.exponential(6, n),
+        "Temperature(F)": rng.normal(60, 20, n),
+        "Humidity(%)": rng.uniform(10, 100, n),
+        "Pressure(in)": rng.normal(29.9, 0.3, n),
+    })
+    df.loc[rng.random(n) < 0.05, "Temperature(F)"] = np.nan
+    return df
+
+
+def _stats(df, chunksize=1_000):
+    chunks = (df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize))
+    return insight_stats_from_chunks(chunks, df.columns)
+
+
+def test_ttest_from_moments_matches_scipy(accidents):
+    weather = _stats(accidents)["weather"]
+    t_stat, p = ttest_from_moments(weather.loc["Clear"], weather.loc["Rain"])
+    sev = accidents.groupby("Weather_Condition")["Severity"]
+    expected = stats.ttest_ind(sev.get_group("Clear"), sev.get_group("Rain"))
+    assert t_stat == pytest.approx(expected.statistic)
+    assert p == pytest.approx(expected.pvalue)
+
+
+@pytest.mark.parametrize("column", CORRELATION_COLUMNS)
+def test_pearson_from_moments_matches_scipy(accidents, column):
+    r, p = pearson_from_moments(_stats(accidents)["pearson"][column])
+    pair = accidents[[column, "Severity"]].dropna()
+    expected = stats.pearsonr(pair[column], pair["Severity"])
+    assert r == pytest.approx(expected.statistic)
+    assert p == pytest.approx(expected.pvalue)
+
+
+def test_chunked_contingency_matches_crosstab(accidents):
+    is_rain = accidents["Weather_Condition"].str.lower().str.contains("rain")
+    expected = pd.crosstab(is_rain, accidents["Severity"])
+    pd.testing.assert_frame_equal(_stats(accidents)["rain"].astype("int64"), expected, check_names=False)
+
+
+def test_batched_indicator_ttests_match_scipy(accidents):
+    rng = np.random.default_rng(3)
+    flags = pd.DataFrame({"Crossing": rng.random(len(accidents)) < 0.3,
+                          "Stop": (rng.random(len(accidents)) < 0.1).astype(int),
+                          "Bump": 0, "Roundabout": 0})
+    flags.loc[:4, "Roundabout"] = 1
+    df = pd.concat([accidents, flags], axis=1)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        table = batched_indicator_ttests(df, flags.columns)
+
+    for col in ["Crossing", "Stop"]:
+        mask = df[col].astype(bool)
+        expected = stats.ttest_ind(df.loc[mask, "Severity"], df.loc[~mask, "Severity"])
+        assert table.loc[col, "t_stat"] == pytest.approx(expected.statistic)
+        assert table.loc[col, "p_value"] == pytest.approx(expected.pvalue)
+    # No or too few flagged rows: no test, and no warnings from scipy
+    assert table.loc[["Bump", "Roundabout"], "p_value"].isna().all()
+    assert (table.loc[["Bump", "Roundabout"], "theory"] == "Insufficient data").all()
@@ -0,0 +1,28 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_metadata import load_metadata, metadata_path
+from missingness import compute_missingness
+
+
+def _reference_fractions(df, n_blocks):
+    block = np.minimum(np.arange(len(df)) * n_blocks // len(df), n_blocks - 1)
+    return df.isna().groupby(block).mean().reset_index(drop=True)
+
+
+@pytest.mark.parametrize("with_sidecar", [False, True])
+def test_block_fractions_match_pandas(accident_csv, with_sidecar):
+    path, df = accident_csv
+    if with_sidecar:
+        load_metadata(path)
+    profile = compute_missingness(path, n_blocks=64, chunksize=700)
+
+    # Without a valid sidecar the row count comes from the same pass; no sidecar is written
+    assert os.path.exists(metadata_path(path)) == with_sidecar
+    assert profile["rows"] == len(df)
+    pd.testing.assert_frame_equal(profile["block_null_fraction"], _reference_fractions(df, 64))
+    nulls = df.isna().astype(int)
+    pd.testing.assert_frame_equal(profile["co_missing"], nulls.T @ nulls, check_dtype=False)
@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from filter_context import apply_context, make_context
+from hypothesis_stats import pearson_from_moments
+from query_engine import DUCKDB_DIR, crosstab, duckdb_available, duckdb_database, insight_stats, value_counts
+
+CONTEXTS = {
+    "none": None,
+    "states": make_context(states=["CA", "NY"]),
+    "period_severity": make_context(period=((2017, 6), (2021, 5)), severity=[2, 3]),
+}
+
+needs_duckdb = pytest.mark.skipif(not duckdb_available(), reason="duckdb is not installed")
+
+
+def _frames_match(result, expected):
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_names=False,
+                                  check_index_type=False, check_column_type=False)
+
+
+def _counts(series):
+    return {str(value): int(count) for value, count in series.items()}
+
+
+@pytest.mark.parametrize("name", CONTEXTS)
+def test_pandas_crosstab_and_counts_match_pandas_reference(accident_csv, name):
+    path, df = accident_csv
+    rows = apply_context(df, CONTEXTS[name])
+    _frames_match(crosstab(path, "State", "Weather_Condition", CONTEXTS[name], engine="pandas"),
+                  pd.crosstab(rows["State"], rows["Weather_Condition"]))
+    assert (_counts(value_counts(path, "Weather_Condition", CONTEXTS[name], engine="pandas"))
+            == _counts(rows["Weather_Condition"].value_counts()))
+
+
+@needs_duckdb
+@pytest.mark.parametrize("name", CONTEXTS)
+def test_duckdb_crosstab_and_counts_match_pandas(accident_csv, name):
+    path, _ = accident_csv
+    ctx = CONTEXTS[name]
+    _frames_match(crosstab(path, "State", "Severity", ctx, engine="duckdb"),
+                  crosstab(path, "State", "Severity", ctx, engine="pandas"))
+    assert (_counts(value_counts(path, "City", ctx, engine="duckdb"))
+            == _counts(value_counts(path, "City", ctx, engine="pandas")))
+
+
+@needs_duckdb
+@pytest.mark.parametrize("name", CONTEXTS)
+def test_duckdb_insight_stats_match_pandas(accident_csv, name):
+    path, _ = accident_csv
+    ctx = CONTEXTS[name]
+    duck = insight_stats(path, ctx, engine="duckdb")
+    pandas = insight_stats(path, ctx, engine="pandas")
+
+    assert duck["rows"] == pandas["rows"]
+    for key in ["weather", "temp_bins", "rain", "low_visibility", "road"]:
+        _frames_match(duck[key].sort_index(), pandas[key].sort_index())
+    for key in ["hourly", "visibility"]:
+        np.testing.assert_array_equal(duck[key].to_numpy(), pandas[key].to_numpy())
+    for col, acc in pandas["pearson"].items():
+        np.testing.assert_allclose(pearson_from_moments(duck["pearson"][col]), pearson_from_moments(acc))
+
+
+@needs_duckdb
+def test_duckdb_rebuild_removes_databases_of_earlier_versions(accident_csv):
+    path, df = accident_csv
+    first = duckdb_database(path)
+    df.iloc[:-1].to_csv(path, index=False)
+    second = duckdb_database(path)
+    assert second != first
+    assert os.listdir(DUCKDB_DIR) == [os.path.basename(second)]
@@ -0,0 +1,40 @@
+import time
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from resampling import bootstrap_ci, permutation_test
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(9)
+    return rng.normal(0, 1, 300), rng.normal(0.3, 1, 250)
+
+
+def test_results_do_not_depend_on_worker_count(samples):
+    a, b = samples
+    serial = permutation_test(a, b, n_resamples=3_000, n_jobs=1, min_resamples=10**9)
+    parallel = permutation_test(a, b, n_resamples=3_000, n_jobs=2, min_resamples=10**9)
+    assert serial["p_value"] == parallel["p_value"]
+    serial = bootstrap_ci(a, b, n_resamples=2_000, n_jobs=1)
+    parallel = bootstrap_ci(a, b, n_resamples=2_000, n_jobs=2)
+    assert (serial["ci_low"], serial["ci_high"]) == (parallel["ci_low"], parallel["ci_high"])
+
+
+def test_permutation_p_value_matches_scipy(samples):
+    a, b = samples
+    result = permutation_test(a, b, n_resamples=20_000, n_jobs=1, min_resamples=10**9)
+    expected = stats.permutation_test((a, b), lambda x, y: x.mean() - y.mean(), n_resamples=20_000,
+                                      random_state=0).pvalue
+    assert result["p_value"] == pytest.approx(expected, abs=0.01)
+
+
+def test_parallel_run_returns_within_time_budget():
+    rng = np.random.default_rng(1)
+    a, b = rng.normal(size=20_000), rng.normal(size=20_000)
+    start = time.perf_counter()
+    result = bootstrap_ci(a, b, n_resamples=10**6, time_budget=0.5, n_jobs=2)
+    assert result["stopped"] == "time budget"
+    assert time.perf_counter() - start < 1.5